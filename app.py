@@ -1,8 +1,21 @@
 import os
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 from config import Config
 from models import db
 from routes.document_routes import doc_bp
+from services.job_queue import job_queue
+from services.analysis_pool import analysis_pool
+from services.analysis_cache import analysis_cache
+from services.nlp_models import NLPModels
+from services.search_index import search_index
+from services.nota_dinas_store import NotaDinasStore
+from services.keyword_matcher import keyword_rules
+from services.corpus_stats import corpus_stats
+from services.near_duplicates import near_duplicates
+from services.file_processor import FileProcessor
+from services.sentence_cache import sentence_cache
+from services.staging_store import staging_store
+from services.document_schema import DocumentSchema
 
 
 def create_app() -> Flask:
@@ -12,14 +25,37 @@ def create_app() -> Flask:
     # Buat folder uploads jika belum ada
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
+    # Muat model NLTK sekali di startup, bukan saat request pertama
+    if app.config.get("NLP_PRELOAD_MODELS", True):
+        status = NLPModels.warm_up()
+        loaded = [name for name, info in status.items() if info["loaded"]]
+        print(f"✅ NLP models loaded: {', '.join(loaded) or '-'}")
+        fallback = [name for name, info in status.items() if info["fallback"]]
+        if fallback:
+            print(f"⚠️ NLP models fallback: {', '.join(fallback)}")
+
     db.init_app(app)
+    job_queue.init_app(app)
+    staging_store.init_app(app)
+    sentence_cache.init_app(app)   # sebelum analysis_pool: ukuran cache diteruskan ke worker
+    analysis_pool.init_app(app)
+    analysis_cache.init_app(app)
+    search_index.init_app(app)
+    keyword_rules.init_app(app)
+    corpus_stats.init_app(app)
+    near_duplicates.init_app(app)
+    FileProcessor.init_app(app)
 
     app.register_blueprint(doc_bp)
 
     # Handle error global
     @app.errorhandler(413)
     def too_large(e):
-        return jsonify({"error": "File terlalu besar. Maksimal 16MB."}), 413
+        # Batas yang berlaku untuk request ini (batch punya batas sendiri)
+        limit = request.max_content_length
+        if not limit:
+            return jsonify({"error": "File terlalu besar."}), 413
+        return jsonify({"error": f"File terlalu besar. Maksimal {limit / (1024 * 1024):g}MB."}), 413
 
     @app.errorhandler(500)
     def server_error(e):
@@ -29,9 +65,36 @@ def create_app() -> Flask:
     def index():
         return render_template("index.html")
 
+    @app.cli.command("backfill-nota-dinas")
+    def backfill_nota_dinas():
+        """Ekstrak struktur Nota Dinas untuk dokumen lama."""
+        count = NotaDinasStore.backfill()
+        print(f"✅ Nota Dinas diekstrak: {count} dokumen")
+
+    @app.cli.command("backfill-corpus-stats")
+    def backfill_corpus_stats():
+        """Masukkan dokumen lama ke statistik DF keyword (corpus_terms)."""
+        count = corpus_stats.backfill()
+        print(f"✅ Statistik korpus diperbarui: {count} dokumen")
+
+    @app.cli.command("backfill-signatures")
+    def backfill_signatures():
+        """Buat signature MinHash/LSH untuk dokumen lama (near-duplicate)."""
+        count = near_duplicates.backfill()
+        print(f"✅ Signature dibuat: {count} dokumen")
+
     with app.app_context():
         db.create_all()
         print("✅ Database tables created/verified")
+        converted = DocumentSchema.upgrade()
+        if converted:
+            print(f"✅ Kolom JSONB: {', '.join(converted)}")
+        search_index.setup()
+        print(f"✅ Search backend: {search_index.backend}")
+        if NotaDinasStore.setup():
+            print("✅ Indeks trigram Nota Dinas")
+        corpus_stats.load()
+        print(f"✅ Corpus stats: {corpus_stats.n_docs} dokumen")
         print(f"✅ Upload folder: {app.config['UPLOAD_FOLDER']}")
 
     return app
@@ -14,4 +14,72 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
-    ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
+    # Upload di atas ukuran ini di-spool ke UPLOAD_FOLDER, di bawahnya diproses di memori
+    UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", str(8 * 1024 * 1024)))
+
+    # Ekstraksi PDF paralel (per rentang halaman, process pool) mulai jumlah halaman ini
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "300"))
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or None
+
+    # Batch upload (/api/upload/batch)
+    BATCH_MAX_CONTENT_LENGTH = int(os.getenv("BATCH_MAX_CONTENT_LENGTH", str(256 * 1024 * 1024)))
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+    BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+    # Batch ekstraksi Nota Dinas: maks item JSON per request & item per task worker
+    NOTA_DINAS_BATCH_MAX_ITEMS = int(os.getenv("NOTA_DINAS_BATCH_MAX_ITEMS", "1000"))
+    NOTA_DINAS_BATCH_CHUNK = int(os.getenv("NOTA_DINAS_BATCH_CHUNK", "16"))
+    # Simpan struktur Nota Dinas (tabel nota_dinas*) saat /api/save & batch ?save=1
+    NOTA_DINAS_EXTRACT_ON_SAVE = os.getenv("NOTA_DINAS_EXTRACT_ON_SAVE", "true").lower() in ("1", "true", "yes")
+
+    # JSON override aturan keyword (action_words, document_types, action_types_*, whole_words)
+    KEYWORD_RULES_FILE = os.getenv("KEYWORD_RULES_FILE") or None
+
+    # Job queue analisis asinkron (/api/upload?async=1)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+    JOB_MAX_JOBS = int(os.getenv("JOB_MAX_JOBS", "1000"))
+
+    # Staging hasil upload untuk /api/save & /api/regenerate (token berumur pendek)
+    STAGING_TTL_SECONDS = int(os.getenv("STAGING_TTL_SECONDS", "3600"))
+    STAGING_MAX_MEMORY_BYTES = int(os.getenv("STAGING_MAX_MEMORY_BYTES", str(64 * 1024 * 1024)))
+    STAGING_MAX_DISK_BYTES = int(os.getenv("STAGING_MAX_DISK_BYTES", str(1024 * 1024 * 1024)))
+    STAGING_FOLDER = os.getenv("STAGING_FOLDER") or os.path.join(UPLOAD_FOLDER, "staging")
+
+    # Backend eksekusi NLP: "inline" (thread request) atau "process" (process pool)
+    ANALYSIS_BACKEND = os.getenv("ANALYSIS_BACKEND", "inline")
+    ANALYSIS_PROCESSES = int(os.getenv("ANALYSIS_PROCESSES", "0")) or None
+    ANALYSIS_NER_PARALLEL_MIN_CHARS = int(os.getenv("ANALYSIS_NER_PARALLEL_MIN_CHARS", "4000"))
+    ANALYSIS_NER_CHUNK_CHARS = int(os.getenv("ANALYSIS_NER_CHUNK_CHARS", "2000"))
+    # Anggaran waktu NER seluruh dokumen (ms, 0 = tanpa batas)
+    NER_TIME_BUDGET_MS = int(os.getenv("NER_TIME_BUDGET_MS", "5000"))
+
+    # Cache hasil analisis (kunci: hash teks + versi analyzer)
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "256"))
+    ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    ANALYSIS_CACHE_PERSIST = os.getenv("ANALYSIS_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+    # Memo POS tag / ne_chunk per kalimat dan lemma per kata (entri LRU per proses, 0 = nonaktif)
+    SENTENCE_CACHE_SIZE = int(os.getenv("SENTENCE_CACHE_SIZE", "20000"))
+    LEMMA_CACHE_SIZE = int(os.getenv("LEMMA_CACHE_SIZE", "50000"))
+    # /api/regenerate dengan doc_id: analisis ulang hanya paragraf yang berubah
+    REGENERATE_INCREMENTAL = os.getenv("REGENERATE_INCREMENTAL", "true").lower() in ("1", "true", "yes")
+
+    # Muat & warm-up model NLTK saat create_app
+    NLP_PRELOAD_MODELS = os.getenv("NLP_PRELOAD_MODELS", "true").lower() in ("1", "true", "yes")
+
+    # Listing /api/documents
+    DOCUMENTS_MAX_PAGE_SIZE = int(os.getenv("DOCUMENTS_MAX_PAGE_SIZE", "200"))
+    DOCUMENT_COUNT_TTL = int(os.getenv("DOCUMENT_COUNT_TTL", "30"))
+
+    # Ranking keyword TF-IDF terhadap statistik korpus (tabel corpus_terms)
+    KEYWORD_TFIDF = os.getenv("KEYWORD_TFIDF", "true").lower() in ("1", "true", "yes")
+
+    # Near-duplicate (MinHash/LSH): ambang kemiripan & pakai ulang analisis tersimpan
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+    NEAR_DUP_REUSE_THRESHOLD = float(os.getenv("NEAR_DUP_REUSE_THRESHOLD", "0.95"))
+    NEAR_DUP_CHECK_ON_UPLOAD = os.getenv("NEAR_DUP_CHECK_ON_UPLOAD", "true").lower() in ("1", "true", "yes")
+
+    # Full-text search PostgreSQL (konfigurasi text search, dipisah koma)
+    SEARCH_TS_CONFIGS = os.getenv("SEARCH_TS_CONFIGS", "indonesian,english")
+    # Batas karakter original_text yang diindeks (tsvector PostgreSQL maks. 1MB)
+    SEARCH_INDEX_MAX_CHARS = int(os.getenv("SEARCH_INDEX_MAX_CHARS", "100000"))
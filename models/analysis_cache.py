@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+from models import db
+
+
+class AnalysisCacheEntry(db.Model):
+    """Tier persisten cache hasil NLPAnalyzer.full_analysis."""
+    __tablename__ = "analysis_cache"
+
+    key = db.Column(db.String(128), primary_key=True)   # versi:params:sha256(teks)
+    result = db.Column(db.Text, nullable=False)         # JSON string
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
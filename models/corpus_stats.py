@@ -0,0 +1,24 @@
+from models import db
+
+
+class CorpusTerm(db.Model):
+    """Document frequency tiap term keyword di seluruh dokumen tersimpan."""
+    __tablename__ = "corpus_terms"
+
+    term = db.Column(db.String(100), primary_key=True)
+    doc_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DocumentTermSet(db.Model):
+    """
+    Himpunan term unik satu dokumen (JSON list) yang pernah ditambahkan ke
+    corpus_terms, agar penghapusan cukup mengurangi term yang sama tanpa
+    menganalisis ulang teks.
+    """
+    __tablename__ = "document_terms"
+
+    document_id = db.Column(
+        db.Integer, db.ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    terms = db.Column(db.Text, nullable=False)   # JSON string
@@ -1,16 +1,33 @@
+import json
 from datetime import datetime, timezone
+
+from sqlalchemy import exists, func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
 from models import db
+from models.nota_dinas import NotaDinasRecord
+from models.corpus_stats import DocumentTermSet
+from models.document_signature import DocumentSignature
+from models.document_paragraphs import DocumentParagraphs
+
+
+# JSONB di PostgreSQL (indeks GIN, operator @>), JSON (teks) di SQLite
+JSON_TYPE = db.JSON().with_variant(JSONB(), "postgresql")
 
 
 class Document(db.Model):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination /api/documents (urut created_at, id)
+        db.Index("ix_documents_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     original_text = db.Column(db.Text, nullable=False)
     summary = db.Column(db.Text, nullable=True)
-    keywords = db.Column(db.Text, nullable=True)       # JSON string
-    entities = db.Column(db.Text, nullable=True)       # JSON string
+    keywords = db.Column(JSON_TYPE, nullable=True)     # list[str]
+    entities = db.Column(JSON_TYPE, nullable=True)     # list[dict]
     sentiment = db.Column(db.String(50), nullable=True)
     enriched_info = db.Column(db.Text, nullable=True)  # generated/enriched
     file_type = db.Column(db.String(10), nullable=True)
@@ -20,20 +37,113 @@ class Document(db.Model):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
+    nota_dinas = db.relationship(
+        NotaDinasRecord, back_populates="document", uselist=False,
+        cascade="all, delete-orphan",
+    )
+    term_set = db.relationship(
+        DocumentTermSet, uselist=False, cascade="all, delete-orphan",
+    )
+    signature = db.relationship(
+        DocumentSignature, uselist=False, cascade="all, delete-orphan",
+    )
+
+    # Teks JSON apa adanya dari database, untuk to_json() tanpa decode/encode
+    keywords_json = db.column_property(db.cast(keywords, db.Text), deferred=True)
+    entities_json = db.column_property(db.cast(entities, db.Text), deferred=True)
+    paragraph_set = db.relationship(
+        DocumentParagraphs, uselist=False, cascade="all, delete-orphan",
+    )
+
+    # Field ringan untuk tampilan daftar (tanpa kolom teks besar)
+    LIST_FIELDS = ("id", "filename", "sentiment", "file_type", "created_at")
+
+    # Field to_dict → kolom yang harus dimuat
+    FIELD_COLUMNS = {
+        "id":            "id",
+        "filename":      "filename",
+        "original_text": "original_text",
+        "full_text":     "original_text",
+        "summary":       "summary",
+        "keywords":      "keywords",
+        "entities":      "entities",
+        "sentiment":     "sentiment",
+        "enriched_info": "enriched_info",
+        "file_type":     "file_type",
+        "created_at":    "created_at",
+        "updated_at":    "updated_at",
+    }
+
+    # Field JSON → atribut teks mentahnya (dipakai to_json)
+    RAW_JSON_FIELDS = {
+        "keywords": "keywords_json",
+        "entities": "entities_json",
+    }
+
+    @classmethod
+    def columns_for(cls, fields, raw_json: bool = False) -> list:
+        """
+        Atribut kolom untuk load_only() sesuai proyeksi field. Dengan
+        `raw_json`, field JSON dimuat sebagai teks (untuk to_json).
+        """
+        columns = dict(cls.FIELD_COLUMNS, **cls.RAW_JSON_FIELDS) if raw_json else cls.FIELD_COLUMNS
+        names = {columns[f] for f in fields if f in columns}
+        names.add("id")
+        return [getattr(cls, name) for name in sorted(names)]
+
+    @classmethod
+    def has_keyword(cls, term: str):
+        """Kondisi WHERE: keywords berisi `term` (GIN @> di PostgreSQL)."""
+        if db.session.get_bind().dialect.name == "postgresql":
+            return type_coerce(cls.keywords, JSONB).contains([term])
+        each = func.json_each(cls.keywords).table_valued("value")
+        return exists().select_from(each).where(each.c.value == term)
+
+    @classmethod
+    def has_entity(cls, text: str, label: str | None = None):
+        """Kondisi WHERE: entities berisi entitas dengan teks (dan label) tsb."""
+        entity = {"text": text, **({"label": label} if label else {})}
+        if db.session.get_bind().dialect.name == "postgresql":
+            return type_coerce(cls.entities, JSONB).contains([entity])
+        each = func.json_each(cls.entities).table_valued("value")
+        return exists().select_from(each).where(*(
+            func.json_extract(each.c.value, f"$.{key}") == value
+            for key, value in entity.items()
+        ))
+
+    def to_dict(self, fields=None):
+        serializers = {
+            "id":            lambda: self.id,
+            "filename":      lambda: self.filename,
+            "original_text": lambda: self.original_text[:500] + "..." if len(self.original_text) > 500 else self.original_text,
+            "full_text":     lambda: self.original_text,
+            "summary":       lambda: self.summary,
+            "keywords":      lambda: self.keywords or [],
+            "entities":      lambda: self.entities or [],
+            "sentiment":     lambda: self.sentiment,
+            "enriched_info": lambda: self.enriched_info,
+            "file_type":     lambda: self.file_type,
+            "created_at":    lambda: self.created_at.isoformat() if self.created_at else None,
+            "updated_at":    lambda: self.updated_at.isoformat() if self.updated_at else None,
+        }
+        if fields is None:
+            fields = serializers.keys()
+        return {f: serializers[f]() for f in fields if f in serializers}
 
-    def to_dict(self):
-        import json
-        return {
-            "id": self.id,
-            "filename": self.filename,
-            "original_text": self.original_text[:500] + "..." if len(self.original_text) > 500 else self.original_text,
-            "full_text": self.original_text,
-            "summary": self.summary,
-            "keywords": json.loads(self.keywords) if self.keywords else [],
-            "entities": json.loads(self.entities) if self.entities else [],
-            "sentiment": self.sentiment,
-            "enriched_info": self.enriched_info,
-            "file_type": self.file_type,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+    def to_json(self, fields=None) -> str:
+        """
+        to_dict() sebagai string JSON. keywords/entities disisipkan dari
+        teks JSON database (muat dengan columns_for(..., raw_json=True))
+        tanpa json.loads lalu json.dumps ulang.
+        """
+        fields = list(self.FIELD_COLUMNS if fields is None else fields)
+        raw = {
+            f: getattr(self, attr) or "[]"
+            for f, attr in self.RAW_JSON_FIELDS.items() if f in fields
+        }
+        body = json.dumps(
+            self.to_dict([f for f in fields if f not in raw]), ensure_ascii=False
+        )
+        items = [body[1:-1]] if body != "{}" else []
+        items += [f"{json.dumps(f)}: {text}" for f, text in raw.items()]
+        return "{" + ", ".join(items) + "}"
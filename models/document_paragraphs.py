@@ -0,0 +1,19 @@
+from models import db
+
+
+class DocumentParagraphs(db.Model):
+    """
+    Hasil analisis per paragraf dari teks terakhir yang dianalisis ulang
+    (/api/regenerate): fingerprint, batas kalimat, POS tag, dan entitas
+    (JSON list, lihat NLPAnalyzer.incremental_analysis). Paragraf dengan
+    fingerprint yang sama dipakai ulang pada regenerate berikutnya.
+    """
+    __tablename__ = "document_paragraphs"
+
+    document_id = db.Column(
+        db.Integer, db.ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Hanya dipakai ulang bila versi analyzer sama (POS tag/NER bisa berubah)
+    analyzer_version = db.Column(db.String(20), nullable=False)
+    paragraphs = db.Column(db.Text, nullable=False)   # JSON string
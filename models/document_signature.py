@@ -0,0 +1,34 @@
+from models import db
+
+
+class DocumentSignature(db.Model):
+    """Signature MinHash teks dokumen (MinHasher.pack), satu baris per dokumen."""
+    __tablename__ = "document_signatures"
+
+    document_id = db.Column(
+        db.Integer, db.ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    signature = db.Column(db.LargeBinary, nullable=False)
+
+    bands = db.relationship("DocumentLshBand", cascade="all, delete-orphan")
+
+
+class DocumentLshBand(db.Model):
+    """
+    Bucket LSH per band signature. Dokumen yang berbagi (band, bucket)
+    menjadi kandidat near-duplicate; dicari lewat indeks komposit.
+    """
+    __tablename__ = "document_lsh_bands"
+    __table_args__ = (
+        db.Index("ix_document_lsh_bands_band_bucket", "band", "bucket"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    document_id = db.Column(
+        db.Integer,
+        db.ForeignKey("document_signatures.document_id", ondelete="CASCADE"),
+        nullable=False, index=True,
+    )
+    band = db.Column(db.SmallInteger, nullable=False)
+    bucket = db.Column(db.BigInteger, nullable=False)
@@ -0,0 +1,150 @@
+from datetime import date, datetime, timezone
+from models import db
+
+
+def _clip(value, length: int):
+    """Potong string agar muat di kolom VARCHAR (PostgreSQL menolak kelebihan)."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value[:length] if value else None
+
+
+class NotaDinasRecord(db.Model):
+    """Struktur Nota Dinas hasil NotaDinasExtractor, satu baris per dokumen."""
+    __tablename__ = "nota_dinas"
+
+    id = db.Column(db.Integer, primary_key=True)
+    document_id = db.Column(
+        db.Integer, db.ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False, unique=True, index=True,
+    )
+    nomor = db.Column(db.String(255), nullable=True, index=True)
+    # Difilter dengan ILIKE '%x%' → indeks trigram di PostgreSQL (NotaDinasStore.setup)
+    dari = db.Column(db.String(500), nullable=True)
+    unit_asal = db.Column(db.String(500), nullable=True)
+    sifat = db.Column(db.String(100), nullable=True)
+    lampiran = db.Column(db.String(255), nullable=True)
+    hal = db.Column(db.Text, nullable=True)
+    tanggal = db.Column(db.Date, nullable=True, index=True)
+    tanggal_raw = db.Column(db.String(100), nullable=True)
+    jenis_dokumen = db.Column(db.String(50), nullable=True, index=True)
+    penandatangan = db.Column(db.String(255), nullable=True)
+    jabatan_penandatangan = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    document = db.relationship("Document", back_populates="nota_dinas")
+    parties = db.relationship(
+        "NotaDinasParty", cascade="all, delete-orphan",
+        order_by="NotaDinasParty.position",
+    )
+    regulations = db.relationship(
+        "NotaDinasRegulation", cascade="all, delete-orphan",
+        order_by="NotaDinasRegulation.position",
+    )
+    deadlines = db.relationship(
+        "NotaDinasDeadline", cascade="all, delete-orphan",
+        order_by="NotaDinasDeadline.position",
+    )
+
+    @classmethod
+    def from_dict(cls, nd: dict, parse_date) -> "NotaDinasRecord":
+        """Bangun record + child rows dari NotaDinasExtractor.to_dict()."""
+        record = cls(
+            nomor=_clip(nd.get("nomor"), 255),
+            dari=_clip(nd.get("dari"), 500),
+            unit_asal=_clip(nd.get("unit_asal"), 500),
+            sifat=_clip(nd.get("sifat"), 100),
+            lampiran=_clip(nd.get("lampiran"), 255),
+            hal=(nd.get("hal") or "").strip() or None,
+            tanggal=parse_date(nd.get("tanggal") or ""),
+            tanggal_raw=_clip(nd.get("tanggal"), 100),
+            jenis_dokumen=_clip(nd.get("jenis_dokumen"), 50),
+            penandatangan=_clip(nd.get("penandatangan"), 255),
+            jabatan_penandatangan=_clip(nd.get("jabatan_penandatangan"), 500),
+        )
+        position = 0
+        for role in ("kepada", "tembusan"):
+            for name in nd.get(role) or []:
+                name = _clip(name, 500)
+                if name:
+                    record.parties.append(NotaDinasParty(role=role, name=name, position=position))
+                    position += 1
+        for i, reference in enumerate(nd.get("referensi_regulasi") or []):
+            reference = _clip(reference, 500)
+            if reference:
+                record.regulations.append(NotaDinasRegulation(reference=reference, position=i))
+        isos = nd.get("deadline_iso") or []
+        for i, raw in enumerate(nd.get("deadline") or []):
+            iso = isos[i] if i < len(isos) else None
+            record.deadlines.append(NotaDinasDeadline(
+                due_date=date.fromisoformat(iso) if iso else parse_date(raw),
+                raw=_clip(raw, 100), position=i,
+            ))
+        return record
+
+    def to_dict(self):
+        return {
+            "nomor":                 self.nomor or "",
+            "kepada":                [p.name for p in self.parties if p.role == "kepada"],
+            "dari":                  self.dari or "",
+            "sifat":                 self.sifat or "",
+            "lampiran":              self.lampiran or "",
+            "hal":                   self.hal or "",
+            "tanggal":               self.tanggal_raw or "",
+            "tanggal_iso":           self.tanggal.isoformat() if self.tanggal else None,
+            "deadline":              [
+                {"tanggal": d.due_date.isoformat() if d.due_date else None, "raw": d.raw}
+                for d in self.deadlines
+            ],
+            "referensi_regulasi":    [r.reference for r in self.regulations],
+            "penandatangan":         self.penandatangan or "",
+            "jabatan_penandatangan": self.jabatan_penandatangan or "",
+            "tembusan":              [p.name for p in self.parties if p.role == "tembusan"],
+            "unit_asal":             self.unit_asal or "",
+            "jenis_dokumen":         self.jenis_dokumen or "",
+        }
+
+
+class NotaDinasParty(db.Model):
+    """Penerima (kepada) dan tembusan Nota Dinas."""
+    __tablename__ = "nota_dinas_parties"
+    __table_args__ = (
+        db.Index("ix_nota_dinas_parties_role_name", "role", "name"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    nota_dinas_id = db.Column(
+        db.Integer, db.ForeignKey("nota_dinas.id", ondelete="CASCADE"),
+        nullable=False, index=True,
+    )
+    role = db.Column(db.String(20), nullable=False)      # kepada | tembusan
+    name = db.Column(db.String(500), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+
+class NotaDinasRegulation(db.Model):
+    """Referensi regulasi yang disebut dalam Nota Dinas."""
+    __tablename__ = "nota_dinas_regulasi"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nota_dinas_id = db.Column(
+        db.Integer, db.ForeignKey("nota_dinas.id", ondelete="CASCADE"),
+        nullable=False, index=True,
+    )
+    reference = db.Column(db.String(500), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+
+class NotaDinasDeadline(db.Model):
+    """Batas waktu dalam Nota Dinas; due_date NULL bila teks tanggal tak terbaca."""
+    __tablename__ = "nota_dinas_deadlines"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nota_dinas_id = db.Column(
+        db.Integer, db.ForeignKey("nota_dinas.id", ondelete="CASCADE"),
+        nullable=False, index=True,
+    )
+    due_date = db.Column(db.Date, nullable=True, index=True)
+    raw = db.Column(db.String(100), nullable=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
@@ -1,18 +1,41 @@
+import base64
 import json
 import os
+import shutil
+import tempfile
+import time
 import traceback
-from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 
 from models import db
 from models.document import Document
-from services.file_processor import FileProcessor
-from services.nlp_analyzer import NLPAnalyzer
+from models.document_paragraphs import DocumentParagraphs
+from services.file_processor import FileProcessor, FileSource
+from services.nlp_analyzer import NLPAnalyzer, ANALYZER_VERSION
 from services.nota_dinas_extractor import NotaDinasExtractor
 from services.balasan_generator import BalasanGenerator
+from services.job_queue import job_queue, JobQueueFull, JOB_DONE
+from services.analysis_pool import analysis_pool
+from services.analysis_cache import analysis_cache
+from services.nlp_models import NLPModels
+from services.search_index import search_index, parse_date
+from services.nota_dinas_store import NotaDinasStore, parse_iso_date
+from services.corpus_stats import corpus_stats
+from services.sentence_cache import sentence_cache
+from services.near_duplicates import near_duplicates
+from services.staging_store import staging_store
+from services.minhash import MinHasher
 
 doc_bp = Blueprint("documents", __name__, url_prefix="/api")
 
+# Header Retry-After saat antrian job penuh (detik)
+JOB_RETRY_AFTER_SECONDS = 30
+
 
 def allowed_file(filename: str) -> bool:
     allowed = current_app.config.get("ALLOWED_EXTENSIONS", {"pdf", "docx"})
@@ -22,8 +45,195 @@ def allowed_file(filename: str) -> bool:
     )
 
 
+def _request_flag(name: str) -> bool:
+    """Baca flag boolean dari query string atau form, mis. ?async=1."""
+    flag = request.args.get(name) or request.form.get(name) or ""
+    return flag.lower() in ("1", "true", "yes")
+
+
+def _analyze(text: str, progress=None, minhash=None) -> dict:
+    """
+    full_analysis lewat cache hash-teks, lalu backend eksekusi. Keyword
+    diurutkan ulang dengan IDF korpus saat ini (tidak ikut di-cache).
+    `minhash` = signature teks yang sudah dihitung (tidak dihitung ulang).
+    """
+    analysis = analysis_cache.get_or_compute(
+        text,
+        lambda t: analysis_pool.full_analysis(t, progress=progress, minhash=minhash),
+        # Hasil NER bergantung pada anggaran waktu
+        params={"ner_budget_ms": analysis_pool.ner_time_budget_ms},
+    )
+    return corpus_stats.rank(text, analysis)
+
+
+def _analyze_incremental(doc: Document, text: str, stats: dict) -> dict:
+    """
+    Re-analisis dokumen tersimpan: paragraf yang tidak berubah sejak
+    save/regenerate sebelumnya dipakai ulang dari document_paragraphs, dan
+    paragraf hasil analisis ini dipasang ke dokumen (di-commit pemanggil).
+    """
+    stored = doc.paragraph_set
+    previous = None
+    if stored is not None and stored.analyzer_version == ANALYZER_VERSION:
+        previous = json.loads(stored.paragraphs)
+
+    analysis, paragraphs, reused = analysis_pool.incremental_analysis(text, previous)
+
+    if stored is None:
+        stored = doc.paragraph_set = DocumentParagraphs()
+    stored.analyzer_version = ANALYZER_VERSION
+    stored.paragraphs = json.dumps(paragraphs)
+    stats.update(paragraphs=len(paragraphs), reused=reused)
+    return analysis
+
+
+def _attach_paragraphs(doc: Document) -> None:
+    """
+    Simpan rekaman paragraf dokumen baru (sebelum commit) agar regenerate
+    pertama sudah memakai ulang paragraf yang tidak diedit. Gagal → dokumen
+    tetap disimpan; regenerate berikutnya menganalisis semua paragraf.
+    """
+    if not current_app.config.get("REGENERATE_INCREMENTAL", True):
+        return
+    try:
+        paragraphs = analysis_pool.paragraph_records(doc.original_text or "")
+    except Exception:
+        current_app.logger.exception("Gagal membuat rekaman paragraf")
+        return
+    doc.paragraph_set = DocumentParagraphs(
+        analyzer_version=ANALYZER_VERSION, paragraphs=json.dumps(paragraphs),
+    )
+
+
+def _build_upload_result(filename: str, file_ext: str, text: str,
+                         analysis: dict) -> dict:
+    # Preview teks (500 char)
+    preview = text[:500] + "..." if len(text) > 500 else text
+
+    return {
+        "status": "analyzed",
+        "filename": filename,
+        "file_type": file_ext,
+        "original_text": preview,
+        "full_text": text,
+        "summary": analysis["summary"],
+        "keywords": analysis["keywords"],
+        "entities": analysis["entities"],
+        "sentiment": analysis["sentiment"],
+        # Tidak ada untuk analisis yang dipakai ulang dari dokumen tersimpan
+        "sentiment_detail": analysis.get("sentiment_detail"),
+        "enriched_info": analysis["enriched_info"],
+    }
+
+
+def _stage_upload_result(result: dict, analysis: dict, include_text: bool) -> dict:
+    """
+    Simpan hasil upload di staging_store agar /api/save dan /api/regenerate
+    cukup menerima token. full_text hanya ikut di respons bila diminta
+    (atau bila hasil terlalu besar untuk di-staging).
+    """
+    staged = staging_store.put({**result, "minhash": analysis.get("minhash")})
+    token, expires_at = staged or (None, None)
+    result["staging_token"] = token
+    result["staging_expires_at"] = expires_at
+    if token and not include_text:
+        result.pop("full_text")
+    return result
+
+
+def _find_near_duplicates(signature: list[int] | None) -> list[dict]:
+    """Near-duplicate tersimpan untuk signature teks upload; gagal → daftar kosong."""
+    if not signature:
+        return []
+    try:
+        return near_duplicates.find(signature, limit=5)
+    except Exception:
+        traceback.print_exc()
+        return []
+
+
+def _analyze_upload(text: str, progress=None) -> tuple[dict, list[dict], Document | None]:
+    """
+    Analisis teks upload. Bila dokumen yang sama (scan/ekspor ulang/terusan)
+    sudah tersimpan, analisisnya dipakai ulang. Return (analysis,
+    near_duplicates, dokumen sumber atau None). Signature dihitung sekali:
+    dipakai pencarian, analisis, dan save.
+    """
+    signature = MinHasher.signature(text) if near_duplicates.check_on_upload else None
+    duplicates = _find_near_duplicates(signature)
+    reuse = duplicates and duplicates[0]["similarity"] >= near_duplicates.reuse_threshold
+    source_doc = db.session.get(Document, duplicates[0]["id"]) if reuse else None
+
+    if source_doc is not None:
+        current_app.logger.info(f"Reusing analysis of document {source_doc.id}")
+        return near_duplicates.stored_analysis(source_doc, signature), duplicates, source_doc
+    return _analyze(text, progress=progress, minhash=signature), duplicates, None
+
+
+def _read_upload(file, filename: str) -> tuple[FileSource, int]:
+    """
+    Ambil isi file upload. Sampai UPLOAD_SPOOL_THRESHOLD byte isi dibaca
+    ke memori; di atasnya di-spool ke file temp bernama unik.
+    """
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+
+    if size <= current_app.config.get("UPLOAD_SPOOL_THRESHOLD", 0):
+        return stream.read(), size
+
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    os.makedirs(upload_folder, exist_ok=True)
+    fd, filepath = tempfile.mkstemp(suffix=f"_{filename}", dir=upload_folder)
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(stream, out)
+    current_app.logger.info(f"File spooled: {filepath}")
+    return filepath, size
+
+
+def _discard_upload(source: FileSource | None) -> None:
+    """Hapus file temp hasil spool (sumber bytes tidak perlu dibersihkan)."""
+    if isinstance(source, str) and os.path.exists(source):
+        os.remove(source)
+
+
+def _run_upload_job(job, app, source: FileSource, filename: str, file_ext: str,
+                    include_text: bool = False) -> dict:
+    """Task job queue: ekstrak teks + analisis NLP di worker."""
+    try:
+        job.update(0.05, "extract")
+        extraction: dict = {}
+        text = FileProcessor.extract_text(source, file_ext, stats=extraction)
+        if not text or not text.strip():
+            raise RuntimeError(
+                "Tidak ada teks yang bisa diekstrak dari file ini. "
+                "Pastikan file tidak terproteksi atau kosong."
+            )
+        job.update(0.2, "analyze")
+
+        # Worker berjalan di luar request → app context sendiri untuk
+        # pencarian near-duplicate di database
+        with app.app_context():
+            analysis, duplicates, source_doc = _analyze_upload(
+                text,
+                progress=lambda fraction, stage: job.update(0.2 + 0.8 * fraction, stage),
+            )
+        result = _stage_upload_result(
+            _build_upload_result(filename, file_ext, text, analysis), analysis, include_text
+        )
+        result["near_duplicates"] = duplicates
+        result["reused_analysis_from"] = source_doc.id if source_doc is not None else None
+        if extraction:
+            result["extraction"] = extraction
+        return result
+    finally:
+        _discard_upload(source)
+
+
 @doc_bp.route("/upload", methods=["POST"])
 def upload_and_analyze():
+    source = None
     try:
         # Cek apakah ada file di request
         if "file" not in request.files:
@@ -41,31 +251,65 @@ def upload_and_analyze():
                 "error": "Format file tidak didukung. Gunakan PDF atau DOCX."
             }), 400
 
-        # Simpan file sementara
+        # Baca file (di memori, atau spool ke disk jika besar)
         filename = secure_filename(file.filename)
-        upload_folder = current_app.config["UPLOAD_FOLDER"]
-        os.makedirs(upload_folder, exist_ok=True)
-        filepath = os.path.join(upload_folder, filename)
-
-        file.save(filepath)
-        current_app.logger.info(f"File saved: {filepath}")
-
-        # Cek file benar-benar tersimpan
-        if not os.path.exists(filepath):
-            return jsonify({"error": "Gagal menyimpan file sementara"}), 500
-
-        file_size = os.path.getsize(filepath)
+        source, file_size = _read_upload(file, filename)
         current_app.logger.info(f"File size: {file_size} bytes")
 
         if file_size == 0:
-            os.remove(filepath)
             return jsonify({"error": "File kosong (0 bytes)"}), 422
 
         # Ekstrak teks
         file_ext = filename.rsplit(".", 1)[1].lower()
+
+        if _request_flag("async"):
+            try:
+                job = job_queue.submit(
+                    _run_upload_job, current_app._get_current_object(),
+                    source, filename, file_ext, _request_flag("full_text"),
+                    meta={"filename": filename, "file_type": file_ext},
+                )
+            except JobQueueFull as e:
+                response = jsonify({"error": str(e)})
+                response.headers["Retry-After"] = str(JOB_RETRY_AFTER_SECONDS)
+                return response, 503
+            source = None  # sumber kini milik worker
+            current_app.logger.info(f"Job queued: {job.id}")
+            return jsonify({
+                "status": "queued",
+                "job_id": job.id,
+                "status_url": f"/api/jobs/{job.id}",
+                "result_url": f"/api/jobs/{job.id}/result",
+            }), 202
+
         current_app.logger.info(f"Processing {file_ext} file...")
 
-        text = FileProcessor.extract_text(filepath, file_ext)
+        if _request_flag("stream"):
+            # Mode streaming: halaman dianalisis satu per satu, teks penuh
+            # tidak pernah digabung sehingga tidak ikut dikirim balik
+            analysis = NLPAnalyzer.stream_analysis(
+                FileProcessor.iter_text(source, file_ext),
+                idf=corpus_stats.idf if corpus_stats.enabled else None,
+                ner_budget_ms=analysis_pool.ner_time_budget_ms or None,
+            )
+            if not analysis["stats"]["chars"]:
+                return jsonify({
+                    "error": "Tidak ada teks yang bisa diekstrak dari file ini. "
+                             "Pastikan file tidak terproteksi atau kosong."
+                }), 422
+
+            preview = analysis.pop("preview")
+            return jsonify({
+                "status": "analyzed",
+                "mode": "stream",
+                "filename": filename,
+                "file_type": file_ext,
+                "original_text": preview + "..." if analysis["stats"]["chars"] > len(preview) else preview,
+                **analysis,
+            }), 200
+
+        extraction: dict = {}
+        text = FileProcessor.extract_text(source, file_ext, stats=extraction)
 
         if not text or not text.strip():
             return jsonify({
@@ -75,39 +319,235 @@ def upload_and_analyze():
 
         current_app.logger.info(f"Text extracted: {len(text)} chars")
 
-        # Analisis NLP
-        analysis = NLPAnalyzer.full_analysis(text)
+        analysis, duplicates, source_doc = _analyze_upload(text)
 
-        # Preview teks (500 char)
-        preview = text[:500] + "..." if len(text) > 500 else text
+        result = _stage_upload_result(
+            _build_upload_result(filename, file_ext, text, analysis),
+            analysis, _request_flag("full_text"),
+        )
+        result["near_duplicates"] = duplicates
+        result["reused_analysis_from"] = source_doc.id if source_doc is not None else None
+        if extraction:
+            result["extraction"] = extraction
+        return jsonify(result), 200
 
-        return jsonify({
-            "status": "analyzed",
-            "filename": filename,
-            "file_type": file_ext,
-            "original_text": preview,
-            "full_text": text,
-            "summary": analysis["summary"],
-            "keywords": analysis["keywords"],
-            "entities": analysis["entities"],
-            "sentiment": analysis["sentiment"],
-            "enriched_info": analysis["enriched_info"],
-        }), 200
+    except RequestEntityTooLarge:
+        # Biarkan handler 413 aplikasi yang menjawab (pesan berisi batasnya)
+        raise
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": f"Error: {str(e)}"}), 500
 
     finally:
-        # Hapus file sementara
+        # Hapus file sementara (hanya jika di-spool ke disk)
         try:
-            if 'filepath' in locals() and os.path.exists(filepath):
-                os.remove(filepath)
-                current_app.logger.info(f"Temp file deleted: {filepath}")
+            _discard_upload(source)
         except Exception:
             pass
 
 
+def _collect_batch_files(files, max_files: int):
+    """
+    Baca file batch (PDF/DOCX, ZIP dibongkar) menjadi item
+    (nama, sumber, ekstensi) untuk FileProcessor.extract_many.
+    Return (items, rejected, spooled); `spooled` wajib di-_discard_upload.
+    """
+    allowed = current_app.config.get("ALLOWED_EXTENSIONS", {"pdf", "docx"})
+    items: list[tuple[str, FileSource, str]] = []
+    rejected: list[dict] = []
+    spooled: list[FileSource] = []
+    try:
+        for file in files:
+            filename = secure_filename(file.filename)
+            ext = filename.rsplit(".", 1)[1].lower() if "." in filename else ""
+            if ext == "zip":
+                source, _ = _read_upload(file, filename)
+                spooled.append(source)
+                items.extend(FileProcessor.iter_zip(
+                    source, allowed,
+                    max_files=max_files - len(items),
+                    max_member_bytes=current_app.config["MAX_CONTENT_LENGTH"],
+                ))
+            elif ext in allowed:
+                source, size = _read_upload(file, filename)
+                spooled.append(source)
+                if size == 0:
+                    rejected.append({"filename": filename, "error": "File kosong (0 bytes)"})
+                else:
+                    items.append((filename, source, ext))
+            else:
+                rejected.append({
+                    "filename": filename,
+                    "error": "Format file tidak didukung. Gunakan PDF, DOCX, atau ZIP.",
+                })
+            if len(items) >= max_files:
+                items = items[:max_files]
+                break
+    except Exception:
+        for source in spooled:
+            _discard_upload(source)
+        raise
+    return items, rejected, spooled
+
+
+def _ndjson(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+@doc_bp.route("/upload/batch", methods=["POST"])
+def upload_batch():
+    """
+    Analisis banyak file (field `files`, boleh berisi ZIP) secara paralel.
+    Hasil per file dikirim sebagai NDJSON begitu selesai. Dengan ?save=1
+    semua hasil sukses disimpan ke `documents` dengan satu bulk insert.
+    """
+    request.max_content_length = current_app.config.get(
+        "BATCH_MAX_CONTENT_LENGTH", current_app.config["MAX_CONTENT_LENGTH"]
+    )
+    files = request.files.getlist("files") + request.files.getlist("file")
+    files = [f for f in files if f and f.filename]
+    if not files:
+        return jsonify({"error": "Tidak ada file dalam request"}), 400
+
+    max_files = current_app.config.get("BATCH_MAX_FILES", 500)
+    workers = current_app.config.get("BATCH_WORKERS", 4)
+    save = _request_flag("save")
+    include_text = _request_flag("full_text")
+    extract_nota_dinas = current_app.config.get("NOTA_DINAS_EXTRACT_ON_SAVE", True)
+
+    try:
+        items, rejected, spooled = _collect_batch_files(files, max_files)
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": f"Gagal membaca batch: {str(e)}"}), 400
+
+    def generate():
+        extraction_errors: list[dict] = []
+        to_save: list[Document] = []
+        counts = {"analyzed": 0, "error": len(rejected)}
+
+        def extracted_texts():
+            for item in FileProcessor.extract_many(items, max_workers=workers):
+                if "error" in item:
+                    extraction_errors.append(item)
+                    continue
+                yield item, item["text"]
+
+        def flush_errors():
+            while extraction_errors:
+                item = extraction_errors.pop(0)
+                counts["error"] += 1
+                yield _ndjson({**item, "status": "error"})
+
+        try:
+            for item in rejected:
+                yield _ndjson({"index": None, "status": "error", **item})
+
+            for item, analysis, error in NLPAnalyzer.analyze_many(
+                extracted_texts(), max_workers=workers, analyze=_analyze,
+            ):
+                yield from flush_errors()
+                if error:
+                    counts["error"] += 1
+                    yield _ndjson({
+                        "index": item["index"], "filename": item["filename"],
+                        "file_type": item["file_type"], "status": "error", "error": error,
+                    })
+                    continue
+
+                counts["analyzed"] += 1
+                result = _build_upload_result(
+                    item["filename"], item["file_type"], item["text"], analysis
+                )
+                if save:
+                    doc = Document(
+                        filename=item["filename"],
+                        original_text=item["text"],
+                        summary=analysis["summary"],
+                        keywords=analysis["keywords"],
+                        entities=analysis["entities"],
+                        sentiment=analysis["sentiment"],
+                        enriched_info=analysis["enriched_info"],
+                        file_type=item["file_type"],
+                    )
+                    if extract_nota_dinas:
+                        nota_dinas_error = NotaDinasStore.attach(doc)
+                        if nota_dinas_error:
+                            result["nota_dinas_error"] = nota_dinas_error
+                    near_duplicates.attach(doc, analysis.get("minhash"))
+                    _attach_paragraphs(doc)
+                    to_save.append(doc)
+                if not save:
+                    # Belum disimpan: hasil di-staging untuk /api/save nanti
+                    _stage_upload_result(result, analysis, include_text)
+                elif not include_text:
+                    result.pop("full_text")
+                yield _ndjson({"index": item["index"], **result})
+
+            yield from flush_errors()
+
+            saved_ids: list[int] = []
+            if to_save:
+                try:
+                    db.session.add_all(to_save)
+                    staged_terms = [corpus_stats.stage_add(doc) for doc in to_save]
+                    db.session.commit()
+                    _invalidate_document_count()
+                    for doc, terms in zip(to_save, staged_terms):
+                        search_index.add(doc)
+                        corpus_stats.apply(terms, 1)
+                    saved_ids = [doc.id for doc in to_save]
+                except Exception as e:
+                    db.session.rollback()
+                    traceback.print_exc()
+                    yield _ndjson({"status": "error", "error": f"Gagal menyimpan: {str(e)}"})
+
+            yield _ndjson({
+                "status": "completed",
+                "total": len(items) + len(rejected),
+                **counts,
+                "saved_ids": saved_ids,
+            })
+        finally:
+            for source in spooled:
+                _discard_upload(source)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+    )
+
+
+@doc_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id: str):
+    """Status & progres job analisis asinkron."""
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@doc_bp.route("/jobs/<job_id>/result", methods=["GET"])
+def get_job_result(job_id: str):
+    """Hasil akhir job; 202 selama job belum selesai."""
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+    if not job.finished:
+        return jsonify(job.to_dict()), 202
+    if job.status != JOB_DONE:
+        return jsonify({"error": job.error, **job.to_dict()}), 422
+    return jsonify(job.result), 200
+
+
+@doc_bp.route("/jobs/<job_id>", methods=["DELETE"])
+def delete_job(job_id: str):
+    if not job_queue.delete(job_id):
+        return jsonify({"error": "Job tidak ditemukan"}), 404
+    return jsonify({"status": "deleted", "job_id": job_id}), 200
+
+
 @doc_bp.route("/save", methods=["POST"])
 def save_document():
     try:
@@ -115,6 +555,19 @@ def save_document():
         if not data:
             return jsonify({"error": "Tidak ada data JSON"}), 400
 
+        # Hasil upload yang di-staging: klien cukup mengirim token + field
+        # yang diedit; signature MinHash dipakai ulang bila teks tidak diedit
+        token = data.get("staging_token")
+        minhash = None
+        if token:
+            staged = staging_store.get(token)
+            if staged is None:
+                return jsonify({"error": "Token staging tidak ditemukan atau sudah kedaluwarsa"}), 404
+            edited = {k: v for k, v in data.items() if v is not None and k != "staging_token"}
+            if "full_text" not in edited:
+                minhash = staged.get("minhash")
+            data = {**staged, **edited}
+
         required = ["filename", "full_text", "summary", "keywords", "entities", "sentiment"]
         missing = [f for f in required if f not in data or data[f] is None]
         if missing:
@@ -124,19 +577,37 @@ def save_document():
             filename=data["filename"],
             original_text=data["full_text"],
             summary=data["summary"],
-            keywords=json.dumps(data["keywords"]),
-            entities=json.dumps(data["entities"]),
+            keywords=data["keywords"],
+            entities=data["entities"],
             sentiment=data["sentiment"],
             enriched_info=data.get("enriched_info", ""),
             file_type=data.get("file_type", ""),
         )
+        nota_dinas_error = None
+        if current_app.config.get("NOTA_DINAS_EXTRACT_ON_SAVE", True):
+            # Selalu diekstrak dari teks yang disimpan; data nota_dinas dari
+            # klien tidak dipakai agar struktur tidak bertentangan dengan teks
+            nota_dinas_error = NotaDinasStore.attach(doc)
+            if nota_dinas_error:
+                current_app.logger.warning(nota_dinas_error)
+        near_duplicates.attach(doc, minhash)
+        _attach_paragraphs(doc)
         db.session.add(doc)
+        terms = corpus_stats.stage_add(doc)
         db.session.commit()
+        _invalidate_document_count()
+        search_index.add(doc)
+        corpus_stats.apply(terms, 1)
+        if token:
+            staging_store.discard(token)
 
-        return jsonify({
+        response = {
             "status": "saved",
             "document": doc.to_dict()
-        }), 201
+        }
+        if nota_dinas_error:
+            response["nota_dinas_error"] = nota_dinas_error
+        return jsonify(response), 201
 
     except Exception as e:
         db.session.rollback()
@@ -148,36 +619,80 @@ def save_document():
 def regenerate():
     try:
         data = request.get_json(force=True)
-        if not data or "full_text" not in data:
-            return jsonify({"error": "full_text wajib diisi"}), 400
+        if not data:
+            return jsonify({"error": "Tidak ada data JSON"}), 400
+
+        token = data.get("staging_token")
+        staged = None
+        if token:
+            staged = staging_store.get(token)
+            if staged is None:
+                return jsonify({"error": "Token staging tidak ditemukan atau sudah kedaluwarsa"}), 404
+
+        doc_id = data.get("doc_id")
+        doc = db.session.get(Document, doc_id) if doc_id else None
 
-        text = data["full_text"].strip()
+        # Teks: yang dikirim (hasil edit), lalu hasil staging, lalu dokumen tersimpan
+        text = data.get("full_text")
+        if text is None and staged is not None:
+            text = staged["full_text"]
+        if text is None and doc is not None:
+            text = doc.original_text
+        if text is None:
+            return jsonify({"error": "full_text, staging_token, atau doc_id wajib diisi"}), 400
+
+        text = text.strip()
         if not text:
             return jsonify({"error": "Teks tidak boleh kosong"}), 400
 
-        analysis = NLPAnalyzer.full_analysis(text)
+        # Dokumen tersimpan: hanya paragraf yang berubah dianalisis ulang.
+        # Tidak lewat cache analisis: cache hit akan melewatkan pembaruan
+        # rekaman paragraf, dan paragraf yang dipakai ulang sudah murah.
+        incremental: dict = {}
+        if doc is not None and current_app.config.get("REGENERATE_INCREMENTAL", True):
+            analysis = corpus_stats.rank(text, _analyze_incremental(doc, text, incremental))
+        else:
+            analysis = _analyze(text)
 
-        doc_id = data.get("doc_id")
-        if doc_id:
-            doc = db.session.get(Document, doc_id)
-            if doc:
-                doc.summary = analysis["summary"]
-                doc.keywords = json.dumps(analysis["keywords"])
-                doc.entities = json.dumps(analysis["entities"])
-                doc.sentiment = analysis["sentiment"]
-                doc.enriched_info = analysis["enriched_info"]
-                db.session.commit()
-                return jsonify({
-                    "status": "regenerated_and_updated",
-                    "document": doc.to_dict(),
-                    **analysis,
-                }), 200
+        if doc is not None:
+            doc.summary = analysis["summary"]
+            doc.keywords = analysis["keywords"]
+            doc.entities = analysis["entities"]
+            doc.sentiment = analysis["sentiment"]
+            doc.enriched_info = analysis["enriched_info"]
+            db.session.commit()
+            search_index.add(doc)
+            return jsonify({
+                "status": "regenerated_and_updated",
+                "document": doc.to_dict(),
+                # None bila REGENERATE_INCREMENTAL dimatikan
+                "incremental": incremental or None,
+                **NLPAnalyzer.public_result(analysis),
+            }), 200
+
+        if staged is not None:
+            # Perbarui hasil staging agar /api/save menyimpan hasil terbaru
+            result = NLPAnalyzer.public_result(analysis)
+            expires_at = staging_store.update(token, {
+                **staged, **result,
+                "full_text": text, "minhash": analysis.get("minhash"),
+            })
+            response = {
+                "status": "regenerated",
+                "filename": data.get("filename") or staged.get("filename", "unknown"),
+                "staging_token": token if expires_at else None,
+                "staging_expires_at": expires_at,
+                **result,
+            }
+            if _request_flag("full_text") or not expires_at:
+                response["full_text"] = text
+            return jsonify(response), 200
 
         return jsonify({
             "status": "regenerated",
             "filename": data.get("filename", "unknown"),
             "full_text": text,
-            **analysis,
+            **NLPAnalyzer.public_result(analysis),
         }), 200
 
     except Exception as e:
@@ -186,11 +701,128 @@ def regenerate():
         return jsonify({"error": f"Gagal regenerate: {str(e)}"}), 500
 
 
+def _encode_cursor(doc: Document) -> str:
+    raw = f"{doc.created_at.isoformat()}|{doc.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, doc_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+    return datetime.fromisoformat(created_at), int(doc_id)
+
+
+# Cache jumlah dokumen: COUNT(*) penuh mahal pada tabel besar
+_document_count = {"value": None, "expires": 0.0}
+
+
+def _count_documents() -> int:
+    now = time.monotonic()
+    if _document_count["value"] is None or now >= _document_count["expires"]:
+        _document_count["value"] = db.session.query(func.count(Document.id)).scalar()
+        _document_count["expires"] = now + current_app.config.get("DOCUMENT_COUNT_TTL", 30)
+    return _document_count["value"]
+
+
+def _invalidate_document_count() -> None:
+    _document_count["value"] = None
+
+
 @doc_bp.route("/documents", methods=["GET"])
 def list_documents():
+    """
+    Daftar dokumen dengan keyset pagination (created_at, id) terbaru dulu.
+    Query: limit, cursor (next_cursor dari halaman sebelumnya),
+    fields (dipisah koma, atau "all"; default Document.LIST_FIELDS),
+    keyword (lemma keyword), entity (+ entity_label opsional).
+    """
+    try:
+        limit = min(
+            max(request.args.get("limit", 50, type=int), 1),
+            current_app.config.get("DOCUMENTS_MAX_PAGE_SIZE", 200),
+        )
+
+        fields_param = request.args.get("fields", "")
+        if fields_param == "all":
+            fields = list(Document.FIELD_COLUMNS)
+        elif fields_param:
+            fields = [f.strip() for f in fields_param.split(",")
+                      if f.strip() in Document.FIELD_COLUMNS]
+        else:
+            fields = list(Document.LIST_FIELDS)
+        if "id" not in fields:
+            fields.insert(0, "id")
+
+        query = Document.query.options(
+            load_only(*Document.columns_for(fields + ["created_at"], raw_json=True))
+        ).order_by(Document.created_at.desc(), Document.id.desc())
+
+        # Filter isi kolom JSON (indeks GIN di PostgreSQL)
+        keyword = request.args.get("keyword", "").strip().lower()
+        if keyword:
+            query = query.filter(Document.has_keyword(keyword))
+        entity = request.args.get("entity", "").strip()
+        if entity:
+            query = query.filter(Document.has_entity(
+                entity, request.args.get("entity_label", "").strip() or None
+            ))
+        # Total dengan filter isi JSON dihitung langsung (tanpa cache)
+        total = query.order_by(None).count() if keyword or entity else _count_documents()
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            try:
+                created_at, doc_id = _decode_cursor(cursor)
+            except Exception:
+                return jsonify({"error": "cursor tidak valid"}), 400
+            query = query.filter(or_(
+                Document.created_at < created_at,
+                and_(Document.created_at == created_at, Document.id < doc_id),
+            ))
+
+        docs = query.limit(limit + 1).all()
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
+        meta = json.dumps({
+            "next_cursor": _encode_cursor(docs[-1]) if has_more else None,
+            "total":       total,
+            "limit":       limit,
+        })
+        # Dokumen diserialisasi dengan to_json: keywords/entities tidak di-decode
+        body = '{"documents": [' + ", ".join(d.to_json(fields) for d in docs) + "], " + meta[1:]
+        return Response(body, status=200, mimetype="application/json")
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@doc_bp.route("/documents/search", methods=["GET"])
+def search_documents():
+    """
+    Pencarian full-text dokumen tersimpan (ranking + cuplikan).
+    Query: q, sentiment, file_type, date_from, date_to (ISO, inklusif), limit, offset.
+    """
     try:
-        docs = Document.query.order_by(Document.created_at.desc()).all()
-        return jsonify({"documents": [d.to_dict() for d in docs]}), 200
+        q = request.args.get("q", "").strip()
+        if not q:
+            return jsonify({"error": "q wajib diisi"}), 400
+
+        try:
+            filters = {
+                "sentiment": request.args.get("sentiment") or None,
+                "file_type": request.args.get("file_type") or None,
+                "date_from": parse_date(request.args.get("date_from")),
+                # Inklusif: date_to=2025-01-31 mencakup seluruh 31 Januari
+                "date_to":   parse_date(request.args.get("date_to"), end=True),
+            }
+        except ValueError:
+            return jsonify({"error": "Format tanggal harus ISO (YYYY-MM-DD)"}), 400
+
+        limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+        offset = max(request.args.get("offset", 0, type=int), 0)
+
+        return jsonify(search_index.search(q, filters, limit, offset)), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
@@ -198,12 +830,110 @@ def list_documents():
 
 @doc_bp.route("/documents/<int:doc_id>", methods=["GET"])
 def get_document(doc_id: int):
+    try:
+        doc = db.session.get(
+            Document, doc_id,
+            options=[load_only(*Document.columns_for(Document.FIELD_COLUMNS, raw_json=True))],
+        )
+        if not doc:
+            return jsonify({"error": "Dokumen tidak ditemukan"}), 404
+        return Response(doc.to_json(), status=200, mimetype="application/json")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@doc_bp.route("/documents/<int:doc_id>/similar", methods=["GET"])
+def get_similar_documents(doc_id: int):
+    """
+    Near-duplicate dokumen lewat indeks LSH (?threshold=0..1, ?limit=).
+    Hanya kandidat yang berbagi bucket LSH yang dibandingkan.
+    """
+    try:
+        doc = db.session.get(Document, doc_id)
+        if not doc:
+            return jsonify({"error": "Dokumen tidak ditemukan"}), 404
+        threshold = request.args.get("threshold", near_duplicates.threshold, type=float)
+        threshold = min(max(threshold, 0.0), 1.0)
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 100)
+        return jsonify({
+            "document_id": doc_id,
+            "threshold":   threshold,
+            "results":     near_duplicates.similar_to(doc, threshold, limit),
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@doc_bp.route("/documents/<int:doc_id>/nota-dinas", methods=["GET"])
+def get_document_nota_dinas(doc_id: int):
+    """Struktur Nota Dinas tersimpan untuk satu dokumen."""
     try:
         doc = db.session.get(Document, doc_id)
         if not doc:
             return jsonify({"error": "Dokumen tidak ditemukan"}), 404
-        return jsonify(doc.to_dict()), 200
+        if doc.nota_dinas is None:
+            return jsonify({"error": "Struktur Nota Dinas belum diekstrak"}), 404
+        return jsonify({
+            "document_id": doc_id,
+            "nota_dinas":  doc.nota_dinas.to_dict(),
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@doc_bp.route("/nota-dinas", methods=["GET"])
+def list_nota_dinas():
+    """
+    Query Nota Dinas tersimpan tanpa ekstraksi ulang.
+    Query: nomor, jenis (persis); dari, unit, hal, kepada, tembusan,
+    regulasi (substring); tanggal_from, tanggal_to, deadline_from,
+    deadline_to (ISO, inklusif); limit, offset.
+    """
+    try:
+        try:
+            filters = {
+                key: request.args.get(key, "").strip() or None
+                for key in ("nomor", "jenis", "dari", "unit", "hal",
+                            "kepada", "tembusan", "regulasi")
+            }
+            for key in ("tanggal_from", "tanggal_to", "deadline_from", "deadline_to"):
+                filters[key] = parse_iso_date(request.args.get(key))
+        except ValueError:
+            return jsonify({"error": "Format tanggal harus ISO (YYYY-MM-DD)"}), 400
+
+        limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+        offset = max(request.args.get("offset", 0, type=int), 0)
+
+        return jsonify(NotaDinasStore.query(filters, limit, offset)), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@doc_bp.route("/deadlines", methods=["GET"])
+def list_deadlines():
+    """
+    Deadline Nota Dinas tersimpan dalam rentang tanggal.
+    Query: from (default hari ini), to (ISO, inklusif), unit, limit, offset.
+    """
+    try:
+        try:
+            start = parse_iso_date(request.args.get("from")) or datetime.now().date()
+            end = parse_iso_date(request.args.get("to"))
+        except ValueError:
+            return jsonify({"error": "Format tanggal harus ISO (YYYY-MM-DD)"}), 400
+        if end is not None and end < start:
+            return jsonify({"error": "to tidak boleh sebelum from"}), 400
+
+        limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        unit = request.args.get("unit", "").strip() or None
+
+        return jsonify(NotaDinasStore.deadlines(start, end, unit, limit, offset)), 200
     except Exception as e:
+        traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 
@@ -213,8 +943,12 @@ def delete_document(doc_id: int):
         doc = db.session.get(Document, doc_id)
         if not doc:
             return jsonify({"error": "Dokumen tidak ditemukan"}), 404
+        terms = corpus_stats.stage_remove(doc)
         db.session.delete(doc)
         db.session.commit()
+        _invalidate_document_count()
+        search_index.remove(doc_id)
+        corpus_stats.apply(terms, -1)
         return jsonify({"status": "deleted", "id": doc_id}), 200
     except Exception as e:
         db.session.rollback()
@@ -228,8 +962,20 @@ def health_check():
         "status": "ok",
         "upload_folder": current_app.config["UPLOAD_FOLDER"],
         "allowed_extensions": list(current_app.config["ALLOWED_EXTENSIONS"]),
+        "jobs": job_queue.stats(),
+        "staging": staging_store.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "corpus_stats": corpus_stats.stats(),
+        "sentence_cache": sentence_cache.stats(),
+        "nlp_models": NLPModels.status(),
     }), 200
 
+
+@doc_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Counter hit/miss cache analisis untuk monitoring."""
+    return jsonify(analysis_cache.stats()), 200
+
 @doc_bp.route("/extract-nota-dinas", methods=["POST"])
 def extract_nota_dinas():
     """Ekstrak data terstruktur dari teks Nota Dinas."""
@@ -252,6 +998,99 @@ def extract_nota_dinas():
         return jsonify({"error": str(e)}), 500
 
 
+@doc_bp.route("/extract-nota-dinas/batch", methods=["POST"])
+def extract_nota_dinas_batch():
+    """
+    Ekstrak banyak Nota Dinas sekaligus. Input JSON {"texts": [...]} atau
+    {"items": [{"id", "text"}, ...]}, atau multipart `files` (PDF/DOCX/ZIP).
+    Hasil dikirim sebagai NDJSON per item begitu selesai; ?ordered=1
+    mempertahankan urutan input.
+    """
+    max_items = current_app.config.get("NOTA_DINAS_BATCH_MAX_ITEMS", 1000)
+    workers = current_app.config.get("BATCH_WORKERS", 4)
+    chunk_size = current_app.config.get("NOTA_DINAS_BATCH_CHUNK", 16)
+    ordered = _request_flag("ordered")
+
+    rejected: list[dict] = []
+    spooled: list[FileSource] = []
+
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        raw = data.get("items", data.get("texts"))
+        if not isinstance(raw, list) or not raw:
+            return jsonify({"error": "texts atau items wajib berupa list"}), 400
+        if len(raw) > max_items:
+            return jsonify({"error": f"Maksimal {max_items} item per batch"}), 413
+
+        def inputs():
+            for index, entry in enumerate(raw):
+                meta = {"index": index}
+                if isinstance(entry, dict):
+                    meta["id"] = entry.get("id")
+                    text = entry.get("text")
+                else:
+                    text = entry
+                if not isinstance(text, str) or not text.strip():
+                    meta["error"] = "text wajib diisi"
+                    text = ""
+                yield meta, text
+        total = len(raw)
+    else:
+        request.max_content_length = current_app.config.get(
+            "BATCH_MAX_CONTENT_LENGTH", current_app.config["MAX_CONTENT_LENGTH"]
+        )
+        files = request.files.getlist("files") + request.files.getlist("file")
+        files = [f for f in files if f and f.filename]
+        if not files:
+            return jsonify({"error": "Sediakan JSON texts/items atau file"}), 400
+        try:
+            items, rejected, spooled = _collect_batch_files(
+                files, current_app.config.get("BATCH_MAX_FILES", 500)
+            )
+        except Exception as e:
+            traceback.print_exc()
+            return jsonify({"error": f"Gagal membaca batch: {str(e)}"}), 400
+
+        def inputs():
+            # Gagal ekstrak teks tetap dilewatkan (teks kosong) agar urutan terjaga
+            for item in FileProcessor.extract_many(items, max_workers=workers, ordered=ordered):
+                meta = {k: item[k] for k in ("index", "filename", "file_type")}
+                if "error" in item:
+                    meta["error"] = item["error"]
+                yield meta, item.get("text", "")
+        total = len(items) + len(rejected)
+
+    executor = analysis_pool.executor if analysis_pool.enabled else None
+
+    def generate():
+        counts = {"success": 0, "error": len(rejected)}
+        try:
+            for item in rejected:
+                yield _ndjson({"index": None, "status": "error", **item})
+
+            for meta, nd_dict, error in NotaDinasExtractor.extract_many(
+                inputs(), max_workers=workers, executor=executor,
+                chunk_size=chunk_size, ordered=ordered,
+            ):
+                error = meta.pop("error", None) or error
+                if error:
+                    counts["error"] += 1
+                    yield _ndjson({**meta, "status": "error", "error": error})
+                else:
+                    counts["success"] += 1
+                    yield _ndjson({**meta, "status": "success", "nota_dinas": nd_dict})
+
+            yield _ndjson({"status": "completed", "total": total, **counts})
+        finally:
+            for source in spooled:
+                _discard_upload(source)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+    )
+
+
 @doc_bp.route("/generate-balasan", methods=["POST"])
 def generate_balasan():
     """Generate konsep balasan Nota Dinas."""
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Callable
+
+from flask import has_app_context
+
+from models import db
+from models.analysis_cache import AnalysisCacheEntry
+from services.nlp_analyzer import ANALYZER_VERSION, NLPAnalyzer
+
+
+class AnalysisCache:
+    """
+    Cache hasil analisis dengan kunci hash teks + versi analyzer.
+
+    - Tier 1: LRU di memori, dibatasi jumlah entri dan total byte.
+    - Tier 2 (opsional): tabel `analysis_cache` di database.
+
+    Hasil parsial (NER terpotong anggaran waktu) tidak disimpan, agar
+    request berikutnya menganalisis ulang teks yang sama.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 persist: bool = False):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.persist     = persist
+        self._app = None
+        self._lru: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits":     0,
+            "misses":      0,
+            "stores":      0,
+            "evictions":   0,
+            "partial":     0,
+        }
+
+    def init_app(self, app) -> None:
+        self.max_entries = app.config.get("ANALYSIS_CACHE_SIZE", self.max_entries)
+        self.max_bytes   = app.config.get("ANALYSIS_CACHE_MAX_BYTES", self.max_bytes)
+        self.persist     = app.config.get("ANALYSIS_CACHE_PERSIST", self.persist)
+        self._app = app
+        app.extensions["analysis_cache"] = self
+
+    @staticmethod
+    def make_key(text: str, params: dict | None = None) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        param_str = ",".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"v{ANALYZER_VERSION}:{param_str}:{digest}"
+
+    def get_or_compute(self, text: str, compute: Callable[[str], dict],
+                       params: dict | None = None) -> dict:
+        key = self.make_key(text, params)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute(text)
+        if NLPAnalyzer.is_partial(result):
+            with self._lock:
+                self._stats["partial"] += 1
+        else:
+            self.put(key, result)
+        return result
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is not None:
+                self._lru.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return item[0]
+
+        if self.persist:
+            raw = self._db_get(key)
+            if raw is not None:
+                result = json.loads(raw)
+                self._memory_put(key, result, len(raw))
+                with self._lock:
+                    self._stats["db_hits"] += 1
+                return result
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        raw = json.dumps(result)
+        self._memory_put(key, result, len(raw))
+        if self.persist:
+            self._db_put(key, raw)
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = (self._stats["memory_hits"] + self._stats["db_hits"]
+                       + self._stats["misses"])
+            hits = self._stats["memory_hits"] + self._stats["db_hits"]
+            return {
+                **self._stats,
+                "entries":  len(self._lru),
+                "bytes":    self._bytes,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "persist":  self.persist,
+            }
+
+    # ── Tier memori ──────────────────────────────────────────────
+
+    def _memory_put(self, key: str, result: dict, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._lru[key] = (result, size)
+            self._bytes += size
+
+            while self._lru and (
+                len(self._lru) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._lru.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    # ── Tier database ────────────────────────────────────────────
+    # Lewat koneksi engine sendiri, bukan db.session: commit/rollback
+    # cache tidak boleh ikut meng-commit atau membatalkan perubahan
+    # yang sedang disiapkan route di session request.
+
+    def _db_call(self, fn: Callable[[], object]):
+        # Job worker berjalan di luar request → buka app context sendiri
+        if has_app_context() or self._app is None:
+            return self._db_run(fn)
+        with self._app.app_context():
+            return self._db_run(fn)
+
+    @staticmethod
+    def _db_run(fn: Callable[[], object]):
+        try:
+            return fn()
+        except Exception:
+            traceback.print_exc()
+            return None
+
+    def _db_get(self, key: str) -> str | None:
+        def fetch():
+            with db.engine.connect() as conn:
+                return conn.execute(
+                    db.select(AnalysisCacheEntry.result).where(AnalysisCacheEntry.key == key)
+                ).scalar()
+        return self._db_call(fetch)
+
+    def _db_put(self, key: str, raw: str) -> None:
+        def store():
+            table = AnalysisCacheEntry.__table__
+            with db.engine.begin() as conn:
+                conn.execute(table.delete().where(table.c.key == key))
+                conn.execute(table.insert().values(key=key, result=raw))
+        self._db_call(store)
+
+analysis_cache = AnalysisCache()
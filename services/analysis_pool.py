@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from services.nlp_analyzer import NLPAnalyzer
+from services.nlp_models import NLPModels
+from services.sentence_cache import sentence_cache
+
+
+def _warm_worker(cache_settings: tuple[int, int] | None = None) -> None:
+    """Initializer worker: muat tagger, NE chunker, stopwords, wordnet."""
+    if cache_settings:
+        sentence_cache.configure(*cache_settings)
+    try:
+        NLPModels.warm_up()
+    except Exception:
+        traceback.print_exc()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class AnalysisPool:
+    """
+    Backend eksekusi NLPAnalyzer.
+
+    - backend "inline"  : jalan di thread pemanggil (default, perilaku lama)
+    - backend "process" : jalan di ProcessPoolExecutor agar tidak antre di GIL;
+      untuk dokumen besar, kalimat yang sudah di-POS tag (sekali, oleh
+      core_analysis) dibagi per kelompok ke beberapa worker untuk NER.
+
+    `ner_time_budget_ms` (0 = tanpa batas) membatasi waktu NER di kedua
+    backend, dihitung sejak dokumen di-submit; entitas dari kelompok yang
+    belum selesai tidak ikut.
+    """
+
+    def __init__(self, backend: str = "inline", processes: int | None = None,
+                 ner_parallel_min_chars: int = 4000, ner_chunk_chars: int = 2000,
+                 ner_time_budget_ms: int = 0, start_method: str = "spawn"):
+        self.backend                = backend
+        self.processes              = processes or os.cpu_count() or 1
+        self.ner_parallel_min_chars = ner_parallel_min_chars
+        self.ner_chunk_chars        = ner_chunk_chars
+        self.ner_time_budget_ms     = ner_time_budget_ms
+        self.start_method           = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.backend                = app.config.get("ANALYSIS_BACKEND", self.backend)
+        self.processes              = app.config.get("ANALYSIS_PROCESSES") or self.processes
+        self.ner_parallel_min_chars = app.config.get(
+            "ANALYSIS_NER_PARALLEL_MIN_CHARS", self.ner_parallel_min_chars
+        )
+        self.ner_chunk_chars        = app.config.get(
+            "ANALYSIS_NER_CHUNK_CHARS", self.ner_chunk_chars
+        )
+        self.ner_time_budget_ms     = app.config.get(
+            "NER_TIME_BUDGET_MS", self.ner_time_budget_ms
+        )
+        self.start_method           = app.config.get(
+            "ANALYSIS_START_METHOD", self.start_method
+        )
+        app.extensions["analysis_pool"] = self
+
+        if self.enabled:
+            self.warm_up()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend == "process"
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=_warm_worker,
+                        initargs=(sentence_cache.settings(),),
+                    )
+        return self._executor
+
+    def warm_up(self) -> None:
+        """Start semua worker sekarang, bukan saat request pertama."""
+        futures = [self.executor.submit(_ping) for _ in range(self.processes)]
+        for f in futures:
+            f.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def full_analysis(self, text: str, progress=None, minhash: list[int] | None = None) -> dict:
+        """Pengganti NLPAnalyzer.full_analysis yang memakai backend terpilih."""
+        budget = self.ner_time_budget_ms or None
+        if not self.enabled:
+            return NLPAnalyzer.full_analysis(
+                text, progress=progress, ner_budget_ms=budget, minhash=minhash
+            )
+
+        try:
+            return self._full_analysis_parallel(text, progress, minhash)
+        except BrokenProcessPool:
+            # Worker mati (OOM, dll.) → buat ulang pool, jalankan inline
+            traceback.print_exc()
+            self.shutdown()
+            return NLPAnalyzer.full_analysis(
+                text, progress=progress, ner_budget_ms=budget, minhash=minhash
+            )
+
+    def incremental_analysis(self, text: str,
+                             previous: list[dict] | None = None) -> tuple[dict, list[dict], int]:
+        """NLPAnalyzer.incremental_analysis lewat backend yang aktif."""
+        budget = self.ner_time_budget_ms or None
+        if not self.enabled:
+            return NLPAnalyzer.incremental_analysis(text, previous, budget)
+
+        try:
+            return self.executor.submit(
+                NLPAnalyzer.incremental_analysis, text, previous, budget
+            ).result()
+        except BrokenProcessPool:
+            traceback.print_exc()
+            self.shutdown()
+            return NLPAnalyzer.incremental_analysis(text, previous, budget)
+
+    def paragraph_records(self, text: str) -> list[dict]:
+        """NLPAnalyzer.paragraph_records lewat backend yang aktif."""
+        budget = self.ner_time_budget_ms or None
+        if not self.enabled:
+            return NLPAnalyzer.paragraph_records(text, budget)
+
+        try:
+            return self.executor.submit(NLPAnalyzer.paragraph_records, text, budget).result()
+        except BrokenProcessPool:
+            traceback.print_exc()
+            self.shutdown()
+            return NLPAnalyzer.paragraph_records(text, budget)
+
+    def _full_analysis_parallel(self, text: str, progress=None,
+                                minhash: list[int] | None = None) -> dict:
+        report = progress or (lambda fraction, stage: None)
+
+        budget = self.ner_time_budget_ms or None
+        if len(text) < self.ner_parallel_min_chars:
+            result = self.executor.submit(
+                NLPAnalyzer.full_analysis, text, None, budget, minhash
+            ).result()
+            report(1.0, "done")
+            return result
+
+        # Dokumen besar: tokenisasi & POS tag sekali (core_analysis), lalu
+        # NER per kelompok kalimat ter-tag di beberapa worker. Deadline
+        # absolut dari saat submit dikirim ke worker, sehingga kelompok yang
+        # baru mulai saat pool penuh tidak mendapat anggaran baru.
+        deadline = NLPAnalyzer.ner_deadline(budget)
+        core = self.executor.submit(NLPAnalyzer.core_analysis, text, True, minhash).result()
+        context = core.pop("context")
+        report(0.4, "tokenize")
+        ner_futures = [
+            self.executor.submit(
+                NLPAnalyzer.entities_for_sentences,
+                context["tagged"][first:last], context["sentences"][first:last],
+                context["offsets"][first:last], deadline,
+            )
+            for first, last in NLPAnalyzer.ner_batches(context["sentences"], self.ner_chunk_chars)
+        ]
+
+        parts: list[list[tuple[str, str, int]]] = []
+        error: Exception | None = None
+        pending = 0
+        for f in ner_futures:
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                parts.append(f.result(timeout=timeout))
+            except FutureTimeout:
+                f.cancel()
+                pending += 1
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                error = error or e
+        if pending:
+            error = error or TimeoutError(
+                f"Batas waktu NER tercapai: {pending} dari {len(ner_futures)} potongan belum selesai"
+            )
+        entities = NLPAnalyzer.merge_entities(parts)
+        if error is not None:
+            entities.append(NLPAnalyzer._ner_error(error))
+        report(0.8, "entities")
+
+        enriched = NLPAnalyzer.generate_enriched_info(
+            text, core["keywords"], entities, core["summary"],
+            sentence_count=core["sentence_count"],
+        )
+        report(1.0, "done")
+
+        return {
+            "summary":      core["summary"],
+            "keywords":     core["keywords"],
+            "entities":     entities,
+            "sentiment":    core["sentiment"],
+            "sentiment_detail": core["sentiment_detail"],
+            "enriched_info": enriched,
+            "keyword_tf":     core["keyword_tf"],
+            "sentence_count": core["sentence_count"],
+            "minhash":        core["minhash"],
+        }
+
+
+analysis_pool = AnalysisPool()
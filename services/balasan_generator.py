@@ -1,6 +1,7 @@
 import re
 from datetime import datetime
 from services.nota_dinas_extractor import NotaDinas
+from services.keyword_matcher import keyword_rules
 
 
 # Konversi angka ke romawi untuk nomor ND
@@ -27,21 +28,12 @@ class BalasanGenerator:
 
     @staticmethod
     def _detect_action_type(nd: NotaDinas) -> str:
-        """Deteksi jenis tindak lanjut yang diminta."""
-        hal_lower = nd.hal.lower()
-        isi_text  = " ".join(nd.isi_pokok + nd.poin_penting).lower()
-
-        if any(k in hal_lower for k in ["profil risiko", "risiko"]):
-            return "profil_risiko"
-        if any(k in hal_lower for k in ["rka", "rencana kerja", "anggaran", "pagu"]):
-            return "rka_anggaran"
-        if any(k in hal_lower for k in ["infrastruktur", "tik", "server", "jaringan"]):
-            return "infrastruktur_tik"
-        if any(k in hal_lower for k in ["matriks", "tindak lanjut"]):
-            return "tindak_lanjut"
-        if any(k in isi_text for k in ["mohon", "diminta", "usulan", "sampaikan"]):
-            return "permintaan_data"
-        return "umum"
+        """Deteksi jenis tindak lanjut yang diminta (aturan di keyword_rules)."""
+        return (
+            keyword_rules.action_types_hal.best_label([nd.hal])
+            or keyword_rules.action_types_isi.best_label(nd.isi_pokok + nd.poin_penting)
+            or "umum"
+        )
 
     @classmethod
     def generate(cls, nd: NotaDinas, unit_pembalas: str = "",
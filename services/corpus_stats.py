@@ -0,0 +1,187 @@
+import json
+import math
+import threading
+from array import array
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db
+from models.corpus_stats import CorpusTerm, DocumentTermSet
+from models.document import Document
+from services.nlp_analyzer import NLPAnalyzer
+
+
+class CorpusStats:
+    """
+    Document frequency (DF) term keyword atas seluruh dokumen tersimpan,
+    untuk ranking keyword TF-IDF.
+
+    - Di memori: vocab term → id, DF di `array("l")` per id, jumlah dokumen.
+    - Di database: tabel corpus_terms (DF) + document_terms (term unik per
+      dokumen), diperbarui dalam transaksi yang sama dengan simpan/hapus
+      dokumen. Biaya per dokumen O(term unik), tanpa hitung ulang korpus.
+
+    Pola pakai: stage_add()/stage_remove() sebelum commit, apply() setelah
+    commit berhasil (memori tidak berubah bila transaksi di-rollback).
+    """
+
+    MAX_TERM_LENGTH = 100
+    UPSERT_CHUNK = 1000
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.vocab: dict[str, int] = {}
+        self.terms: list[str] = []
+        self.df = array("l")
+        self.n_docs = 0
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config.get("KEYWORD_TFIDF", self.enabled)
+        app.extensions["corpus_stats"] = self
+
+    def load(self) -> None:
+        """Muat DF dari database; dipanggil sekali setelah db.create_all()."""
+        vocab: dict[str, int] = {}
+        terms: list[str] = []
+        df = array("l")
+        rows = db.session.execute(
+            db.select(CorpusTerm.term, CorpusTerm.doc_count)
+            .where(CorpusTerm.doc_count > 0)
+            .execution_options(yield_per=5000)
+        )
+        for term, count in rows:
+            vocab[term] = len(terms)
+            terms.append(term)
+            df.append(count)
+        n_docs = db.session.execute(
+            db.select(func.count()).select_from(DocumentTermSet)
+        ).scalar() or 0
+        with self._lock:
+            self.vocab, self.terms, self.df, self.n_docs = vocab, terms, df, n_docs
+
+    # ── Ranking ──────────────────────────────────────────────────
+
+    def idf(self, term: str) -> float:
+        """IDF ter-smoothing; korpus kosong → 1.0 (urutan frekuensi mentah)."""
+        term_id = self.vocab.get(term)
+        df = self.df[term_id] if term_id is not None else 0
+        return math.log((1 + self.n_docs) / (1 + df)) + 1.0
+
+    def rank(self, text: str, analysis: dict) -> dict:
+        """Hasil full_analysis dengan keyword diurutkan TF-IDF korpus."""
+        return NLPAnalyzer.apply_keyword_idf(
+            text, analysis, self.idf if self.enabled else None
+        )
+
+    # ── Pemeliharaan ─────────────────────────────────────────────
+
+    def stage_add(self, doc: Document) -> list[str]:
+        """
+        Hitung term unik dokumen baru, pasang doc.term_set, dan naikkan DF
+        di database (dalam transaksi sesi). Return term untuk apply().
+        """
+        terms = [
+            t for t in NLPAnalyzer.document_terms(doc.original_text or "")
+            if len(t) <= self.MAX_TERM_LENGTH
+        ]
+        doc.term_set = DocumentTermSet(terms=json.dumps(terms))
+        self._adjust_db(terms, 1)
+        return terms
+
+    def stage_remove(self, doc: Document) -> list[str]:
+        """Turunkan DF term milik dokumen yang akan dihapus."""
+        if doc.term_set is None:
+            return []
+        terms = json.loads(doc.term_set.terms)
+        self._adjust_db(terms, -1)
+        return terms
+
+    def apply(self, terms: list[str] | None, delta: int) -> None:
+        """Terapkan perubahan yang sudah di-commit ke DF di memori."""
+        if terms is None:
+            return
+        with self._lock:
+            for term in terms:
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    if delta < 0:
+                        continue
+                    term_id = self.vocab[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.df.append(0)
+                self.df[term_id] = max(0, self.df[term_id] + delta)
+            self.n_docs = max(0, self.n_docs + delta)
+
+    def _adjust_db(self, terms: list[str], delta: int) -> None:
+        table = CorpusTerm.__table__
+        for start in range(0, len(terms), self.UPSERT_CHUNK):
+            chunk = terms[start:start + self.UPSERT_CHUNK]
+            if delta > 0:
+                self._increment(table, chunk)
+            else:
+                db.session.execute(
+                    table.update()
+                    .where(table.c.term.in_(chunk))
+                    .values(doc_count=table.c.doc_count - 1)
+                )
+                db.session.execute(
+                    table.delete()
+                    .where(table.c.term.in_(chunk), table.c.doc_count <= 0)
+                )
+
+    @staticmethod
+    def _increment(table, terms: list[str]) -> None:
+        dialect = db.session.get_bind().dialect.name
+        insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect)
+        if insert is not None:
+            stmt = insert(table).values([{"term": t, "doc_count": 1} for t in terms])
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.term],
+                set_={"doc_count": table.c.doc_count + 1},
+            ))
+            return
+
+        # Dialect lain: update yang sudah ada, insert sisanya
+        existing = set(db.session.execute(
+            db.select(table.c.term).where(table.c.term.in_(terms))
+        ).scalars())
+        if existing:
+            db.session.execute(
+                table.update()
+                .where(table.c.term.in_(existing))
+                .values(doc_count=table.c.doc_count + 1)
+            )
+        missing = [{"term": t, "doc_count": 1} for t in terms if t not in existing]
+        if missing:
+            db.session.execute(table.insert(), missing)
+
+    def backfill(self, batch_size: int = 200) -> int:
+        """Tambahkan dokumen lama (tanpa document_terms) ke statistik korpus."""
+        done = 0
+        while True:
+            docs = db.session.execute(
+                db.select(Document)
+                .outerjoin(DocumentTermSet)
+                .where(DocumentTermSet.document_id.is_(None))
+                .order_by(Document.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not docs:
+                return done
+            staged = [self.stage_add(doc) for doc in docs]
+            db.session.commit()
+            for terms in staged:
+                self.apply(terms, 1)
+            done += len(docs)
+
+    def stats(self) -> dict:
+        return {
+            "enabled":   self.enabled,
+            "documents": self.n_docs,
+            "terms":     sum(1 for count in self.df if count),
+        }
+
+
+corpus_stats = CorpusStats()
@@ -0,0 +1,47 @@
+from sqlalchemy import inspect
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from models import db
+
+
+class DocumentSchema:
+    """
+    Upgrade tabel documents yang sudah ada (db.create_all tidak mengubah
+    tabel lama): kolom keywords/entities dari teks JSON menjadi JSONB, plus
+    indeks GIN (jsonb_path_ops) untuk query @> "dokumen berisi keyword /
+    entitas X". Di SQLite tipe JSON tetap disimpan sebagai teks, sehingga
+    isi lama langsung terbaca tanpa migrasi.
+    """
+
+    JSON_COLUMNS = ("keywords", "entities")
+
+    @classmethod
+    def upgrade(cls) -> list[str]:
+        """Idempotent; dipanggil setelah db.create_all(). Return kolom yang dikonversi."""
+        bind = db.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return []
+
+        columns = {c["name"]: c["type"] for c in inspect(bind).get_columns("documents")}
+        converted = [c for c in cls.JSON_COLUMNS if not isinstance(columns.get(c), JSONB)]
+        try:
+            if converted:
+                # Indeks FTS lama memakai keywords sebagai teks; dibuat ulang
+                # oleh search_index.setup() dengan ekspresi keywords::text
+                db.session.execute(sql_text("DROP INDEX IF EXISTS ix_documents_fts"))
+            for column in converted:
+                db.session.execute(sql_text(
+                    f"ALTER TABLE documents ALTER COLUMN {column} TYPE jsonb "
+                    f"USING NULLIF({column}, '')::jsonb"
+                ))
+            for column in cls.JSON_COLUMNS:
+                db.session.execute(sql_text(
+                    f"CREATE INDEX IF NOT EXISTS ix_documents_{column}_gin "
+                    f"ON documents USING GIN ({column} jsonb_path_ops)"
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return converted
@@ -1,30 +1,167 @@
+import io
+import logging
+import multiprocessing
 import os
+import threading
+import time
+import traceback
+import zipfile
+from xml.etree import ElementTree
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Iterable, Iterator, Union
+
 import fitz  # PyMuPDF
 from docx import Document as DocxDocument
 
 
+# Sumber file: path di disk, isi file (bytes), atau stream file-like
+FileSource = Union[str, bytes, bytearray, BinaryIO]
+
+logger = logging.getLogger(__name__)
+
+# Namespace WordprocessingML untuk parsing word/document.xml langsung
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P, _W_T, _W_TC, _W_VMERGE = f"{_W}p", f"{_W}t", f"{_W}tc", f"{_W}vMerge"
+_W_BREAKS = {f"{_W}tab": "\t", f"{_W}br": "\n", f"{_W}cr": "\n"}
+
+
+def _pdf_page_range(source: str | bytes, start: int, end: int) -> list[tuple[int, str, float]]:
+    """
+    Task worker: buka PDF sendiri lalu ekstrak halaman [start, end).
+    Return (nomor halaman, teks, durasi ms) per halaman.
+    """
+    doc = FileProcessor._open_pdf(source)
+    try:
+        pages = []
+        for number in range(start, end):
+            started = time.perf_counter()
+            text = doc[number].get_text("text")
+            pages.append((number, text, (time.perf_counter() - started) * 1000))
+        return pages
+    finally:
+        doc.close()
+
+
 class FileProcessor:
 
+    # PDF dengan halaman >= ini diekstrak paralel di beberapa proses
+    PDF_PARALLEL_MIN_PAGES = 300
+    PDF_WORKERS = os.cpu_count() or 1
+
+    _pdf_executor: ProcessPoolExecutor | None = None
+    _pdf_lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app) -> None:
+        cls.PDF_PARALLEL_MIN_PAGES = app.config.get(
+            "PDF_PARALLEL_MIN_PAGES", cls.PDF_PARALLEL_MIN_PAGES
+        )
+        cls.PDF_WORKERS = app.config.get("PDF_WORKERS") or cls.PDF_WORKERS
+
     @staticmethod
-    def extract_text_from_pdf(filepath: str) -> str:
-        text_parts = []
+    def _read_bytes(source: FileSource) -> bytes:
+        if isinstance(source, (bytes, bytearray)):
+            return bytes(source)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+
+    @staticmethod
+    def _open_pdf(source: FileSource) -> fitz.Document:
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=FileProcessor._read_bytes(source), filetype="pdf")
+
+    @staticmethod
+    def _open_docx(source: FileSource):
+        if isinstance(source, str):
+            return DocxDocument(source)
+        if isinstance(source, (bytes, bytearray)):
+            return DocxDocument(io.BytesIO(source))
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return DocxDocument(source)
+
+    @staticmethod
+    def iter_pdf_pages(source: FileSource) -> Iterator[str]:
+        """Yield teks per halaman PDF secara lazy (halaman kosong dilewati)."""
+        try:
+            doc = FileProcessor._open_pdf(source)
+        except Exception as e:
+            raise RuntimeError(f"Gagal membaca PDF: {e}")
+
         try:
-            doc = fitz.open(filepath)
             if doc.is_encrypted:
                 raise RuntimeError(
                     "File PDF terproteksi password, tidak bisa diekstrak."
                 )
-            for page_num, page in enumerate(doc):
-                page_text = page.get_text("text")
+            for page in doc:
+                try:
+                    page_text = page.get_text("text")
+                except Exception as e:
+                    raise RuntimeError(f"Gagal membaca PDF: {e}")
                 if page_text.strip():
-                    text_parts.append(page_text)
+                    yield page_text
+        finally:
             doc.close()
-        except RuntimeError:
-            raise
+
+    @classmethod
+    def extract_text_from_pdf(cls, source: FileSource, stats: dict | None = None) -> str:
+        """
+        Ekstrak seluruh teks PDF sesuai urutan halaman. Di atas
+        PDF_PARALLEL_MIN_PAGES halaman, rentang halaman dibagi ke worker
+        process yang masing-masing membuka dokumen sendiri. `stats`
+        (opsional) diisi mode, jumlah worker, dan durasi per halaman.
+        """
+        started = time.perf_counter()
+        try:
+            doc = cls._open_pdf(source)
         except Exception as e:
             raise RuntimeError(f"Gagal membaca PDF: {e}")
+        try:
+            if doc.is_encrypted:
+                raise RuntimeError(
+                    "File PDF terproteksi password, tidak bisa diekstrak."
+                )
+            page_count = doc.page_count
+            workers = min(cls.PDF_WORKERS, page_count)
+            pages = None
+            if page_count >= cls.PDF_PARALLEL_MIN_PAGES and workers > 1:
+                # Stream tidak bisa di-pickle → kirim path atau bytes ke worker
+                payload = source if isinstance(source, str) else cls._read_bytes(source)
+                pages = cls._extract_pdf_parallel(payload, page_count, workers)
+            if pages is None:
+                workers = 1
+                pages = []
+                for number, page in enumerate(doc):
+                    page_started = time.perf_counter()
+                    try:
+                        text = page.get_text("text")
+                    except Exception as e:
+                        raise RuntimeError(f"Gagal membaca PDF: {e}")
+                    pages.append((number, text, (time.perf_counter() - page_started) * 1000))
+        finally:
+            doc.close()
+
+        result = "\n".join(text for _, text, _ in pages if text.strip()).strip()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        page_ms = [round(ms, 2) for _, _, ms in pages]
+        logger.info(
+            "PDF %d halaman diekstrak dalam %.0f ms (%s, %d worker, halaman terlama %.1f ms)",
+            page_count, elapsed_ms, "parallel" if workers > 1 else "sequential",
+            workers, max(page_ms, default=0.0),
+        )
+        if stats is not None:
+            stats.update({
+                "pages":      page_count,
+                "mode":       "parallel" if workers > 1 else "sequential",
+                "workers":    workers,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "page_ms":    page_ms,
+            })
 
-        result = "\n".join(text_parts).strip()
         if not result:
             raise RuntimeError(
                 "PDF tidak mengandung teks yang bisa diekstrak. "
@@ -32,45 +169,303 @@ class FileProcessor:
             )
         return result
 
+    @classmethod
+    def _pdf_pool(cls) -> ProcessPoolExecutor:
+        if cls._pdf_executor is None:
+            with cls._pdf_lock:
+                if cls._pdf_executor is None:
+                    cls._pdf_executor = ProcessPoolExecutor(
+                        max_workers=cls.PDF_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return cls._pdf_executor
+
+    @classmethod
+    def _extract_pdf_parallel(cls, source: str | bytes, page_count: int,
+                              workers: int) -> list[tuple[int, str, float]] | None:
+        """
+        Bagi halaman menjadi `workers` rentang berurutan; hasil digabung
+        kembali sesuai nomor halaman. None bila pool rusak (fallback
+        sekuensial oleh pemanggil).
+        """
+        step = -(-page_count // workers)
+        try:
+            futures = [
+                cls._pdf_pool().submit(_pdf_page_range, source, start, min(start + step, page_count))
+                for start in range(0, page_count, step)
+            ]
+            pages: list[tuple[int, str, float]] = []
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+        except BrokenProcessPool:
+            traceback.print_exc()
+            with cls._pdf_lock:
+                if cls._pdf_executor is not None:
+                    cls._pdf_executor.shutdown(wait=False, cancel_futures=True)
+                    cls._pdf_executor = None
+            return None
+        except Exception as e:
+            raise RuntimeError(f"Gagal membaca PDF: {e}")
+
     @staticmethod
-    def extract_text_from_docx(filepath: str) -> str:
+    def iter_docx_paragraphs(source: FileSource) -> Iterator[str]:
+        """
+        Yield teks paragraf dan sel tabel DOCX (yang tidak kosong) sesuai
+        urutan dokumen. Jalur cepat: stream word/document.xml dengan
+        iterparse; python-docx hanya fallback bila jalur cepat gagal
+        sebelum menghasilkan teks.
+        """
+        produced = False
         try:
-            doc = DocxDocument(filepath)
-            paragraphs = []
+            for text in FileProcessor._iter_docx_xml(source):
+                produced = True
+                yield text
+            return
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            if produced:
+                raise RuntimeError(f"Gagal membaca DOCX: {e}")
+            logger.info("Jalur cepat DOCX gagal (%s), fallback ke python-docx", e)
+        yield from FileProcessor._iter_docx_python_docx(source)
+
+    @staticmethod
+    def _docx_archive(source: FileSource) -> zipfile.ZipFile:
+        if isinstance(source, str):
+            return zipfile.ZipFile(source)
+        if isinstance(source, (bytes, bytearray)):
+            return zipfile.ZipFile(io.BytesIO(source))
+        source.seek(0)
+        return zipfile.ZipFile(source)
+
+    @staticmethod
+    def _iter_docx_xml(source: FileSource) -> Iterator[str]:
+        """
+        Parse word/document.xml secara incremental tanpa membangun object
+        model. Teks sel tabel = paragraf di dalamnya digabung baris baru;
+        sel lanjutan merge vertikal (w:vMerge tanpa "restart") dilewati dan
+        sel merge horizontal (gridSpan) hanya muncul sekali, sehingga teks
+        merged cell tidak berulang seperti pada row.cells python-docx.
+        """
+        with FileProcessor._docx_archive(source) as archive:
+            with archive.open("word/document.xml") as xml:
+                runs: list[list[str]] = []        # teks run per paragraf terbuka
+                cells: list[list[str]] = []       # paragraf per sel terbuka
+                continued: list[bool] = []        # sel lanjutan vMerge?
+                for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                    tag = elem.tag
+                    if event == "start":
+                        if tag == _W_P:
+                            runs.append([])
+                        elif tag == _W_TC:
+                            cells.append([])
+                            continued.append(False)
+                        continue
+
+                    if tag == _W_T:
+                        if runs and elem.text:
+                            runs[-1].append(elem.text)
+                    elif tag in _W_BREAKS:
+                        if runs:
+                            runs[-1].append(_W_BREAKS[tag])
+                    elif tag == _W_VMERGE:
+                        if continued and elem.get(f"{_W}val", "continue") != "restart":
+                            continued[-1] = True
+                    elif tag == _W_P:
+                        text = "".join(runs.pop()).strip()
+                        elem.clear()
+                        if not text:
+                            continue
+                        if cells:
+                            cells[-1].append(text)
+                        else:
+                            yield text
+                    elif tag == _W_TC:
+                        text = "\n".join(cells.pop()).strip()
+                        skip = continued.pop()
+                        elem.clear()
+                        if not text or skip:
+                            continue
+                        if cells:
+                            # Tabel bersarang: teksnya bagian dari sel induk
+                            cells[-1].append(text)
+                        else:
+                            yield text
 
+    @staticmethod
+    def _iter_docx_python_docx(source: FileSource) -> Iterator[str]:
+        """Fallback python-docx: paragraf lalu sel tabel (merged cell di-dedupe)."""
+        try:
+            doc = FileProcessor._open_docx(source)
+        except Exception as e:
+            raise RuntimeError(f"Gagal membaca DOCX: {e}")
+
+        try:
             # Ambil teks dari paragraf utama
             for p in doc.paragraphs:
                 if p.text.strip():
-                    paragraphs.append(p.text.strip())
+                    yield p.text.strip()
 
-            # Ambil teks dari tabel
+            # Ambil teks dari tabel; row.cells mengulang sel yang di-merge
             for table in doc.tables:
+                seen: set = set()
                 for row in table.rows:
                     for cell in row.cells:
+                        if cell._tc in seen:
+                            continue
+                        seen.add(cell._tc)
                         if cell.text.strip():
-                            paragraphs.append(cell.text.strip())
-
-            result = "\n".join(paragraphs).strip()
-            if not result:
-                raise RuntimeError(
-                    "Dokumen DOCX tidak mengandung teks yang bisa diekstrak."
-                )
-            return result
-
-        except RuntimeError:
-            raise
+                            yield cell.text.strip()
         except Exception as e:
             raise RuntimeError(f"Gagal membaca DOCX: {e}")
 
+    @staticmethod
+    def extract_text_from_docx(source: FileSource) -> str:
+        paragraphs = list(FileProcessor.iter_docx_paragraphs(source))
+
+        result = "\n".join(paragraphs).strip()
+        if not result:
+            raise RuntimeError(
+                "Dokumen DOCX tidak mengandung teks yang bisa diekstrak."
+            )
+        return result
+
+    @staticmethod
+    def iter_docx_chunks(source: FileSource, chunk_chars: int = 20000) -> Iterator[str]:
+        """Yield teks DOCX per kelompok paragraf ±chunk_chars karakter."""
+        buffer: list[str] = []
+        size = 0
+        for paragraph in FileProcessor.iter_docx_paragraphs(source):
+            buffer.append(paragraph)
+            size += len(paragraph) + 1
+            if size >= chunk_chars:
+                yield "\n".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "\n".join(buffer)
+
+    @staticmethod
+    def _check_source(source: FileSource) -> None:
+        if isinstance(source, str) and not os.path.exists(source):
+            raise FileNotFoundError(f"File tidak ditemukan: {source}")
+
     @classmethod
-    def extract_text(cls, filepath: str, file_ext: str) -> str:
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File tidak ditemukan: {filepath}")
+    def iter_text(cls, source: FileSource, file_ext: str) -> Iterator[str]:
+        """Versi generator dari extract_text: yield halaman/potongan teks."""
+        cls._check_source(source)
 
         ext = file_ext.lower().lstrip(".")
         if ext == "pdf":
-            return cls.extract_text_from_pdf(filepath)
+            return cls.iter_pdf_pages(source)
         elif ext in ("docx", "doc"):
-            return cls.extract_text_from_docx(filepath)
+            return cls.iter_docx_chunks(source)
+        else:
+            raise ValueError(f"Format tidak didukung: {ext}")
+
+    @classmethod
+    def extract_text(cls, source: FileSource, file_ext: str,
+                     stats: dict | None = None) -> str:
+        """
+        Ekstrak teks dari path file, bytes, atau stream file-like
+        (mis. FileStorage.stream) tanpa harus menulis ke disk.
+        `stats` (opsional, PDF) diisi statistik ekstraksi per halaman.
+        """
+        cls._check_source(source)
+
+        ext = file_ext.lower().lstrip(".")
+        if ext == "pdf":
+            return cls.extract_text_from_pdf(source, stats)
+        elif ext in ("docx", "doc"):
+            return cls.extract_text_from_docx(source)
+        else:
+            raise ValueError(f"Format tidak didukung: {ext}")
+
+    @staticmethod
+    def iter_zip(source: FileSource, allowed_extensions: set[str],
+                 max_files: int = 500,
+                 max_member_bytes: int = 16 * 1024 * 1024) -> Iterator[tuple[str, bytes, str]]:
+        """
+        Yield (nama, isi, ekstensi) untuk tiap anggota ZIP yang didukung.
+        Anggota yang terlalu besar atau melebihi max_files dilewati.
+        """
+        if isinstance(source, str):
+            archive = zipfile.ZipFile(source)
         else:
-            raise ValueError(f"Format tidak didukung: {ext}")
\ No newline at end of file
+            archive = zipfile.ZipFile(io.BytesIO(FileProcessor._read_bytes(source)))
+
+        with archive:
+            count = 0
+            for info in archive.infolist():
+                if info.is_dir() or "." not in info.filename:
+                    continue
+                name = os.path.basename(info.filename)
+                ext = name.rsplit(".", 1)[1].lower()
+                if not name or name.startswith(".") or ext not in allowed_extensions:
+                    continue
+                if info.file_size > max_member_bytes:
+                    continue
+                count += 1
+                if count > max_files:
+                    break
+                yield name, archive.read(info), ext
+
+    @classmethod
+    def extract_many(
+        cls,
+        items: Iterable[tuple[str, FileSource, str]],
+        max_workers: int = 4,
+        ordered: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Ekstrak banyak file secara paralel (thread pool).
+        `items` berisi (nama, sumber, ekstensi) dan boleh berupa generator;
+        hasil di-yield sesuai urutan selesai (atau urutan input bila
+        `ordered=True`):
+        {"index", "filename", "file_type", "text"} atau
+        {"index", "filename", "file_type", "error"}.
+
+        Paling banyak 2 × max_workers file berjalan sekaligus sehingga
+        sumber dan teks hasil ekstraksi tidak dimuat semuanya ke memori.
+        """
+        def run(index: int, name: str, source: FileSource, ext: str) -> dict:
+            result = {"index": index, "filename": name, "file_type": ext}
+            try:
+                text = cls.extract_text(source, ext)
+                if not text or not text.strip():
+                    raise RuntimeError("Tidak ada teks yang bisa diekstrak dari file ini.")
+                result["text"] = text
+            except Exception as e:
+                result["error"] = str(e)
+            return result
+
+        iterator = enumerate(items)
+        pending: deque = deque()
+        max_pending = max(1, max_workers) * 2
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit_next() -> bool:
+                item = next(iterator, None)
+                if item is None:
+                    return False
+                index, (name, source, ext) = item
+                pending.append(executor.submit(run, index, name, source, ext))
+                return True
+
+            try:
+                exhausted = False
+                while True:
+                    while not exhausted and len(pending) < max_pending:
+                        exhausted = not submit_next()
+                    if not pending:
+                        break
+
+                    if ordered:
+                        yield pending.popleft().result()
+                        continue
+
+                    wait(pending, return_when=FIRST_COMPLETED)
+                    for future in [f for f in pending if f.done()]:
+                        pending.remove(future)
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
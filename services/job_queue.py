@@ -0,0 +1,150 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+# Status job
+JOB_QUEUED  = "queued"
+JOB_RUNNING = "running"
+JOB_DONE    = "done"
+JOB_FAILED  = "failed"
+
+
+class JobQueueFull(RuntimeError):
+    """Jumlah job di memori sudah mencapai max_jobs."""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = JOB_QUEUED
+    progress: float = 0.0
+    stage: str = ""
+    result: Any = None
+    error: str = ""
+    meta: dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def update(self, progress: float, stage: str = "") -> None:
+        """Dipanggil task untuk melaporkan progres (0.0 - 1.0)."""
+        self.progress = max(0.0, min(1.0, progress))
+        if stage:
+            self.stage = stage
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        data = {
+            "job_id":      self.id,
+            "status":      self.status,
+            "progress":    round(self.progress, 3),
+            "stage":       self.stage,
+            "error":       self.error or None,
+            "meta":        self.meta,
+            "created_at":  self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Antrian job lokal berbasis thread pool (tanpa broker eksternal).
+    Job yang sudah selesai disimpan di memori sampai TTL habis.
+    """
+
+    def __init__(self, max_workers: int = 2, ttl_seconds: int = 3600,
+                 max_jobs: int = 1000):
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs    = max_jobs
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def init_app(self, app) -> None:
+        self.max_workers = app.config.get("JOB_WORKERS", self.max_workers)
+        self.ttl_seconds = app.config.get("JOB_TTL_SECONDS", self.ttl_seconds)
+        self.max_jobs    = app.config.get("JOB_MAX_JOBS", self.max_jobs)
+        app.extensions["job_queue"] = self
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="nlp-job",
+                    )
+        return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args, meta: dict | None = None,
+               **kwargs) -> Job:
+        """
+        Jalankan `fn(job, *args, **kwargs)` di worker pool.
+        Nilai kembalian fn menjadi `job.result`.
+        """
+        self._evict()
+        job = Job(id=uuid.uuid4().hex, meta=meta or {})
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs:
+                raise JobQueueFull("Antrian job penuh, coba lagi nanti.")
+            self._jobs[job.id] = job
+
+        self.executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._evict()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.max_workers, "total": len(jobs), **counts}
+
+    @staticmethod
+    def _run(job: Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+        job.status = JOB_RUNNING
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = JOB_DONE
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self) -> None:
+        """Hapus job selesai yang sudah melewati TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and job.finished_at and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+job_queue = JobQueue()
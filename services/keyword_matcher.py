@@ -0,0 +1,180 @@
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable
+
+
+# Aturan default; bisa diganti lewat file JSON KEYWORD_RULES_FILE (per kunci)
+DEFAULT_RULES = {
+    # Kata kerja tindakan untuk poin penting Nota Dinas
+    "action_words": [
+        "mohon", "diminta", "agar", "diharapkan", "harus",
+        "wajib", "perlu", "segera", "melakukan", "menyampaikan",
+        "melaksanakan", "memperhatikan", "berkoordinasi",
+    ],
+    # Penanda jenis dokumen; urutan = prioritas
+    "document_types": {
+        "Nota Dinas":      ["nota dinas"],
+        "Surat Edaran":    ["surat edaran"],
+        "Surat Keputusan": ["surat keputusan"],
+        "Instruksi":       ["instruksi"],
+    },
+    # Jenis tindak lanjut dari field hal; urutan = prioritas
+    "action_types_hal": {
+        "profil_risiko":     ["profil risiko", "risiko"],
+        "rka_anggaran":      ["rka", "rencana kerja", "anggaran", "pagu"],
+        "infrastruktur_tik": ["infrastruktur", "tik", "server", "jaringan"],
+        "tindak_lanjut":     ["matriks", "tindak lanjut"],
+    },
+    # Jenis tindak lanjut dari isi pokok + poin penting (bila hal tidak cocok)
+    "action_types_isi": {
+        "permintaan_data": ["mohon", "diminta", "usulan", "sampaikan"],
+    },
+    # Singkatan pendek yang hanya cocok sebagai kata utuh ("tik" ≠ "praktik")
+    "whole_words": ["rka", "tik"],
+}
+
+
+@dataclass(frozen=True)
+class Match:
+    start: int
+    end: int
+    keyword: str
+    label: str
+
+
+class AhoCorasick:
+    """
+    Automaton Aho–Corasick case-insensitive: semua kemunculan semua
+    keyword ditemukan dalam satu scan linear, lengkap dengan posisinya.
+    `rules` memetakan label → daftar keyword; urutan label = prioritas.
+    """
+
+    def __init__(self, rules: dict[str, Iterable[str]], whole_words: Iterable[str] = ()):
+        self.labels = list(rules)
+        self.priority = {label: i for i, label in enumerate(self.labels)}
+        self.whole_words = frozenset(w.lower() for w in whole_words)
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[tuple[str, str], ...]] = [()]
+
+        for label, keywords in rules.items():
+            for keyword in keywords:
+                self._insert(keyword.lower(), label)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, label: str) -> None:
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] += ((keyword, label),)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    @staticmethod
+    def _lower(text: str) -> str:
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        # Beberapa huruf Unicode memanjang saat lower(); jaga posisi tetap sejajar
+        return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+    def iter_matches(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        lowered = self._lower(text)
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for keyword, label in out[state]:
+                start = i - len(keyword) + 1
+                if keyword in self.whole_words and not self._is_word(lowered, start, i + 1):
+                    continue
+                yield Match(start, i + 1, keyword, label)
+
+    def find_all(self, text: str) -> list[Match]:
+        return list(self.iter_matches(text))
+
+    def best_label(self, texts: Iterable[str]) -> str | None:
+        """Label prioritas tertinggi yang ditemukan di salah satu teks."""
+        best: int | None = None
+        for text in texts:
+            for match in self.iter_matches(text):
+                rank = self.priority[match.label]
+                if best is None or rank < best:
+                    best = rank
+                    if best == 0:
+                        return self.labels[0]
+        return self.labels[best] if best is not None else None
+
+    @staticmethod
+    def _is_word(text: str, start: int, end: int) -> bool:
+        return (
+            (start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum())
+        )
+
+
+class KeywordRules:
+    """
+    Matcher bersama untuk NotaDinasExtractor & BalasanGenerator, dibangun
+    sekali saat import dari DEFAULT_RULES dan dibangun ulang di init_app
+    bila KEYWORD_RULES_FILE diset.
+    """
+
+    def __init__(self, rules_file: str | None = None):
+        self.rules: dict = {}
+        self.rules_file = rules_file
+        self.configure(self._load(rules_file))
+
+    def init_app(self, app) -> None:
+        path = app.config.get("KEYWORD_RULES_FILE")
+        if path and path != self.rules_file:
+            self.rules_file = path
+            self.configure(self._load(path))
+        app.extensions["keyword_rules"] = self
+
+    @staticmethod
+    def _load(path: str | None) -> dict:
+        if not path:
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def configure(self, overrides: dict) -> None:
+        rules = {**DEFAULT_RULES, **overrides}
+        whole_words = rules["whole_words"]
+        self.rules = rules
+        self.action_words = AhoCorasick({"action": rules["action_words"]}, whole_words)
+        self.document_types = AhoCorasick(rules["document_types"], whole_words)
+        self.action_types_hal = AhoCorasick(rules["action_types_hal"], whole_words)
+        self.action_types_isi = AhoCorasick(rules["action_types_isi"], whole_words)
+
+
+# Worker ProcessPool (spawn) tidak menjalankan init_app → baca path dari env saat import
+keyword_rules = KeywordRules(os.getenv("KEYWORD_RULES_FILE") or None)
@@ -0,0 +1,81 @@
+import hashlib
+import re
+import struct
+
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+NUM_PERM = 128
+SHINGLE = 3
+
+
+class MinHasher:
+    """
+    Signature MinHash dari shingle kata (default 3 kata berurutan).
+    Kemiripan dua signature (posisi yang sama / jumlah posisi)
+    mengestimasi Jaccard himpunan shingle kedua teks.
+
+    Skema one-permutation hashing: tiap shingle di-hash sekali (blake2b,
+    stabil antar proses & restart, tidak seperti hash() bawaan); bit bawah
+    hash memilih bucket, nilai minimum per bucket menjadi signature. Bucket
+    kosong (teks pendek) diisi dari bucket terisi berikutnya beserta
+    jaraknya (rotation densification). Satu kali sort, bukan NUM_PERM scan.
+    Signature tersimpan hanya valid untuk NUM_PERM/SHINGLE yang sama.
+    """
+
+    NUM_PERM = NUM_PERM
+    SHINGLE = SHINGLE
+
+    _struct = struct.Struct(f"<{NUM_PERM}Q")
+
+    @classmethod
+    def shingles(cls, text: str) -> set[int]:
+        tokens = TOKEN_RE.findall(text.lower())
+        if len(tokens) < cls.SHINGLE:
+            grams = tokens
+        else:
+            grams = [
+                " ".join(tokens[i:i + cls.SHINGLE])
+                for i in range(len(tokens) - cls.SHINGLE + 1)
+            ]
+        return {
+            int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+            for g in grams
+        }
+
+    @classmethod
+    def signature(cls, text: str) -> list[int] | None:
+        """None bila teks tidak punya token sama sekali."""
+        hashes = cls.shingles(text or "")
+        if not hashes:
+            return None
+
+        k = cls.NUM_PERM
+        # Urut menurun → nilai terakhir per bucket adalah minimumnya
+        buckets = {h % k: h // k for h in sorted(hashes, reverse=True)}
+
+        signature = [0] * k
+        filled = sorted(buckets)
+        pos = 0
+        for i in range(k):
+            while pos < len(filled) and filled[pos] < i:
+                pos += 1
+            donor = filled[pos] if pos < len(filled) else filled[0]
+            distance = (donor - i) % k
+            # Nilai asli < 2^57; jarak disimpan di bit atas agar tetap 64-bit
+            signature[i] = buckets[donor] | (distance << 57)
+        return signature
+
+    @staticmethod
+    def similarity(a, b) -> float:
+        if not a or not b or len(a) != len(b):
+            return 0.0
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    @classmethod
+    def pack(cls, signature: list[int]) -> bytes:
+        return cls._struct.pack(*signature)
+
+    @classmethod
+    def unpack(cls, raw: bytes) -> list[int]:
+        return list(cls._struct.unpack(raw))
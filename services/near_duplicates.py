@@ -0,0 +1,174 @@
+import hashlib
+import traceback
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import load_only
+
+from models import db
+from models.document import Document
+from models.document_signature import DocumentLshBand, DocumentSignature
+from services.minhash import MinHasher
+
+
+class NearDuplicateIndex:
+    """
+    Deteksi near-duplicate (Nota Dinas yang sama dari scan, ekspor ulang,
+    atau terusan) dengan MinHash + LSH.
+
+    Signature 128 posisi dibagi BANDS band × ROWS baris; tiap band di-hash
+    ke satu bucket di tabel document_lsh_bands. Kandidat = dokumen yang
+    berbagi minimal satu (band, bucket) → lookup indeks, bukan scan semua
+    dokumen; kemiripan lalu dihitung hanya untuk kandidat. Dengan 16×8,
+    pasangan dengan Jaccard ≥ ~0.7 hampir pasti menjadi kandidat.
+    """
+
+    BANDS = 16
+    ROWS = MinHasher.NUM_PERM // BANDS
+    MAX_CANDIDATES = 200
+
+    def __init__(self, threshold: float = 0.8, reuse_threshold: float = 0.95,
+                 check_on_upload: bool = True):
+        self.threshold       = threshold
+        self.reuse_threshold = reuse_threshold
+        self.check_on_upload = check_on_upload
+
+    def init_app(self, app) -> None:
+        self.threshold       = app.config.get("NEAR_DUP_THRESHOLD", self.threshold)
+        self.reuse_threshold = app.config.get("NEAR_DUP_REUSE_THRESHOLD", self.reuse_threshold)
+        self.check_on_upload = app.config.get("NEAR_DUP_CHECK_ON_UPLOAD", self.check_on_upload)
+        app.extensions["near_duplicates"] = self
+
+    @classmethod
+    def band_buckets(cls, signature: list[int]) -> list[tuple[int, int]]:
+        """(band, bucket) per band; bucket = hash 64-bit signed (muat BIGINT)."""
+        raw = MinHasher.pack(signature)
+        width = cls.ROWS * 8
+        return [
+            (band, int.from_bytes(
+                hashlib.blake2b(raw[band * width:(band + 1) * width], digest_size=8).digest(),
+                "little", signed=True,
+            ))
+            for band in range(cls.BANDS)
+        ]
+
+    def attach(self, doc: Document, signature: list[int] | None = None) -> list[int] | None:
+        """Pasang signature + bucket LSH ke dokumen sebelum commit."""
+        try:
+            signature = signature or MinHasher.signature(doc.original_text or "")
+            if signature is None:
+                return None
+            doc.signature = DocumentSignature(
+                signature=MinHasher.pack(signature),
+                bands=[
+                    DocumentLshBand(band=band, bucket=bucket)
+                    for band, bucket in self.band_buckets(signature)
+                ],
+            )
+            return signature
+        except Exception:
+            traceback.print_exc()
+            return None
+
+    def find(self, signature: list[int], threshold: float | None = None,
+             limit: int = 10, exclude_id: int | None = None) -> list[dict]:
+        """Dokumen tersimpan dengan estimasi Jaccard ≥ threshold, urut kemiripan."""
+        threshold = self.threshold if threshold is None else threshold
+        conditions = [
+            tuple_(DocumentLshBand.band, DocumentLshBand.bucket).in_(self.band_buckets(signature))
+        ]
+        if exclude_id is not None:
+            conditions.append(DocumentLshBand.document_id != exclude_id)
+
+        # Kandidat yang berbagi paling banyak band diperiksa lebih dulu
+        candidate_ids = db.session.execute(
+            db.select(DocumentLshBand.document_id)
+            .where(*conditions)
+            .group_by(DocumentLshBand.document_id)
+            .order_by(func.count().desc(), DocumentLshBand.document_id.desc())
+            .limit(self.MAX_CANDIDATES)
+        ).scalars().all()
+        if not candidate_ids:
+            return []
+
+        scored: list[tuple[float, int]] = []
+        for doc_id, raw in db.session.execute(
+            db.select(DocumentSignature.document_id, DocumentSignature.signature)
+            .where(DocumentSignature.document_id.in_(candidate_ids))
+        ):
+            if not raw:
+                continue
+            similarity = MinHasher.similarity(signature, MinHasher.unpack(raw))
+            if similarity >= threshold:
+                scored.append((similarity, doc_id))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        scored = scored[:limit]
+        if not scored:
+            return []
+
+        docs = {
+            d.id: d for d in db.session.execute(
+                db.select(Document)
+                .options(load_only(*Document.columns_for(Document.LIST_FIELDS)))
+                .where(Document.id.in_([doc_id for _, doc_id in scored]))
+            ).scalars()
+        }
+        return [
+            {**docs[doc_id].to_dict(Document.LIST_FIELDS), "similarity": round(similarity, 4)}
+            for similarity, doc_id in scored if doc_id in docs
+        ]
+
+    def find_for_text(self, text: str, limit: int = 10) -> list[dict]:
+        signature = MinHasher.signature(text)
+        return self.find(signature, limit=limit) if signature else []
+
+    def similar_to(self, doc: Document, threshold: float | None = None,
+                   limit: int = 10) -> list[dict]:
+        """Near-duplicate dari dokumen tersimpan; signature dibuat bila belum ada."""
+        if doc.signature is None:
+            if self.attach(doc) is None:
+                return []
+            db.session.commit()
+        if not doc.signature.signature:
+            return []
+        return self.find(
+            MinHasher.unpack(doc.signature.signature),
+            threshold=threshold, limit=limit, exclude_id=doc.id,
+        )
+
+    @staticmethod
+    def stored_analysis(doc: Document, minhash: list[int] | None = None) -> dict:
+        """
+        Hasil analisis tersimpan dalam bentuk keluaran full_analysis.
+        `minhash` = signature teks upload (sudah dihitung untuk pencarian
+        near-duplicate); tanpa itu dipakai signature dokumen tersimpan.
+        """
+        if minhash is None and doc.signature is not None and doc.signature.signature:
+            minhash = MinHasher.unpack(doc.signature.signature)
+        return {
+            **doc.to_dict(("summary", "keywords", "entities", "sentiment", "enriched_info")),
+            "minhash": minhash,
+        }
+
+    def backfill(self, batch_size: int = 200) -> int:
+        """Buat signature untuk dokumen lama. Return jumlahnya."""
+        done = 0
+        while True:
+            docs = db.session.execute(
+                db.select(Document)
+                .options(load_only(Document.id, Document.original_text))
+                .outerjoin(DocumentSignature)
+                .where(DocumentSignature.document_id.is_(None))
+                .order_by(Document.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not docs:
+                return done
+            for doc in docs:
+                if self.attach(doc) is None:
+                    # Teks tanpa token: signature kosong agar tidak diproses ulang
+                    doc.signature = DocumentSignature(signature=b"")
+            db.session.commit()
+            done += len(docs)
+
+
+near_duplicates = NearDuplicateIndex()
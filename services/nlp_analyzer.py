@@ -1,12 +1,18 @@
+import hashlib
 import json
 import re
+import time
 import nltk
 from collections import Counter
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords, wordnet
-from nltk.stem import WordNetLemmatizer
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator
+from nltk.tokenize import word_tokenize
+
+from services.minhash import MinHasher
+from services.nlp_models import NLPModels
+from services.sentence_cache import sentence_cache
+from services.text_matrix import SentenceTermMatrix
 
 
 # Label mapping untuk Named Entity
@@ -42,27 +48,197 @@ NEGATIVE_WORDS = {
 }
 
 
-class NLPAnalyzer:
+# Naikkan setiap kali hasil analisis berubah (dipakai sebagai kunci cache)
+ANALYZER_VERSION = "8"
+
+# Jumlah keyword yang dikembalikan & kandidat (term, tf) yang disimpan di
+# hasil analisis agar bisa diurutkan ulang dengan IDF korpus terbaru
+KEYWORD_TOP_N      = 15
+KEYWORD_CANDIDATES = 100
+
+# Field hasil analisis yang hanya dipakai internal (tidak dikirim ke klien)
+INTERNAL_FIELDS = ("keyword_tf", "sentence_count", "minhash")
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+
+# Batas paragraf: baris kosong, atau baris baru setelah akhir kalimat.
+# Baris yang terpotong di tengah kalimat (teks PDF) tetap satu paragraf.
+PARAGRAPH_BREAK_RE = re.compile(r"(?<=[.!?])[ \t]*\n\s*|\n[ \t]*\n\s*")
+
+# Ukuran bagian (karakter) untuk skor sentimen per bagian teks penuh
+SENTIMENT_SECTION_CHARS = 5000
+
+# NER seluruh dokumen: jumlah entitas unik yang dikembalikan (urut
+# kemunculan pertama, batas 30 seperti sebelumnya; entitas setelahnya
+# dibuang) dan ukuran potongan kalimat untuk worker paralel
+NER_MAX_ENTITIES = 30
+NER_CHUNK_CHARS  = 2000
+
+# Teks entitas INFO untuk NER yang terpotong anggaran waktu (hasil parsial)
+NER_TIMEOUT_TEXT = "NER dibatasi waktu"
+
+
+@dataclass
+class AnalysisContext:
+    """
+    Hasil tokenisasi satu dokumen yang dipakai bersama oleh semua tahap
+    analisis: kalimat, token per kalimat, dan POS tag per kalimat.
+    """
+    text: str
+    sentences: list[str] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=list)       # posisi awal tiap kalimat
+    tokens: list[list[str]] = field(default_factory=list)
+    lowered: list[list[str]] = field(default_factory=list)
+    tagged: list[list[tuple[str, str]]] = field(default_factory=list)
+    _term_matrix: SentenceTermMatrix | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def build(cls, text: str) -> "AnalysisContext":
+        """Sentence-split, tokenisasi, dan POS tagging, masing-masing sekali."""
+        ctx = cls(text=text, sentences=cls.split_sentences(text))
+
+        pos = 0
+        for sentence in ctx.sentences:
+            start = text.find(sentence, pos)
+            if start < 0:
+                start = pos
+            ctx.offsets.append(start)
+            pos = start + len(sentence)
+
+        # Kalimat yang POS tag-nya sudah di cache tidak ditokenisasi ulang;
+        # tagger hanya dijalankan sekali untuk tiap kalimat baru
+        keys = [sentence_cache.key(sentence) for sentence in ctx.sentences]
+        by_key: dict[bytes, Any] = {}
+        missing: dict[bytes, str] = {}
+        for key, sentence in zip(keys, ctx.sentences):
+            if key in by_key or key in missing:
+                continue
+            cached = sentence_cache.tags.get(key)
+            if cached is None:
+                missing[key] = sentence
+            else:
+                by_key[key] = cached
+
+        fresh_tokens: list[list[str]] = []
+        for sentence in missing.values():
+            try:
+                tokens = word_tokenize(sentence, preserve_line=True)
+            except Exception:
+                tokens = sentence.split()
+            fresh_tokens.append(tokens)
 
-    @staticmethod
-    def _get_stopwords() -> set:
         try:
-            en_stop = set(stopwords.words("english"))
+            fresh = NLPModels.tagger().tag_sents(fresh_tokens) if fresh_tokens else []
+            for key, pairs in zip(missing, fresh):
+                sentence_cache.tags.put(key, tuple(pairs))
         except Exception:
-            en_stop = set()
+            fresh = [[(t, "NN") for t in tokens] for tokens in fresh_tokens]
+        by_key.update(zip(missing, fresh))
+
+        ctx.tagged = [list(by_key[key]) for key in keys]
+        ctx.tokens = [[word for word, _ in pairs] for pairs in ctx.tagged]
+        ctx.lowered = [[t.lower() for t in tokens] for tokens in ctx.tokens]
+        return ctx
+
+    @staticmethod
+    def split_sentences(text: str) -> list[str]:
+        # Per paragraf: kalimat tidak pernah melintasi batas paragraf,
+        # sehingga re-analisis per paragraf memberi kalimat yang sama
+        sentences: list[str] = []
+        for start, end in AnalysisContext.paragraph_spans(text):
+            paragraph = text[start:end]
+            try:
+                sentences.extend(NLPModels.punkt().tokenize(paragraph))
+            except Exception:
+                sentences.extend(re.split(r"(?<=[.!?])\s+", paragraph))
+        return [s for s in sentences if s]
+
+    @staticmethod
+    def document_sentences(text: str) -> list[str]:
+        """
+        Kalimat seluruh teks tanpa pemotongan per paragraf (sama dengan
+        sent_tokenize). Batas kalimat ringkasan metode "frequency".
+        """
         try:
-            id_stop = set(stopwords.words("indonesian"))
+            return NLPModels.punkt().tokenize(text)
         except Exception:
-            id_stop = set()
-        return en_stop | id_stop
+            return re.split(r"(?<=[.!?])\s+", text.strip())
 
     @staticmethod
-    def summarize(text: str, max_sentences: int = 5) -> str:
-        """Extractive summarization menggunakan frekuensi kata."""
+    def lowered_tokens(sentence: str) -> list[str]:
         try:
-            sentences = sent_tokenize(text)
+            return word_tokenize(sentence.lower(), preserve_line=True)
         except Exception:
-            sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+            return sentence.lower().split()
+
+    @staticmethod
+    def paragraph_spans(text: str) -> list[tuple[int, int]]:
+        """(awal, akhir) tiap paragraf tak kosong, tanpa spasi di tepinya."""
+        spans: list[tuple[int, int]] = []
+        start = 0
+        for match in [*PARAGRAPH_BREAK_RE.finditer(text), None]:
+            end = match.start() if match else len(text)
+            paragraph = text[start:end]
+            stripped = paragraph.strip()
+            if stripped:
+                lead = len(paragraph) - len(paragraph.lstrip())
+                spans.append((start + lead, start + lead + len(stripped)))
+            if match:
+                start = match.end()
+        return spans
+
+    def term_matrix(self, stop_words: frozenset) -> SentenceTermMatrix:
+        """Matriks kalimat × term (dibangun sekali, dipakai ulang)."""
+        if self._term_matrix is None:
+            self._term_matrix = SentenceTermMatrix.build(self.lowered, stop_words)
+        return self._term_matrix
+
+    def sentence_limit(self, max_chars: int) -> int:
+        """Jumlah kalimat awal yang dimulai dalam `max_chars` karakter pertama."""
+        count = 0
+        for start in self.offsets:
+            if start >= max_chars:
+                break
+            count += 1
+        return count
+
+
+class NLPAnalyzer:
+
+    @staticmethod
+    def _get_stopwords() -> frozenset:
+        return NLPModels.stopwords()
+
+    SUMMARY_METHODS = ("frequency", "tfidf", "textrank")
+
+    @staticmethod
+    def summarize(
+        text: str,
+        max_sentences: int = 5,
+        ctx: AnalysisContext | None = None,
+        method: str = "frequency",
+    ) -> str:
+        """
+        Extractive summarization. Skor semua kalimat dihitung sekaligus dari
+        matriks kalimat × term (SentenceTermMatrix):
+        - "frequency" (default): jumlah frekuensi kata per kalimat
+        - "tfidf"    : rata-rata TF-IDF term per kalimat
+        - "textrank" : TextRank atas kemiripan cosine term antar kalimat
+        """
+        if method not in NLPAnalyzer.SUMMARY_METHODS:
+            raise ValueError(f"Metode ringkasan tidak dikenal: {method}")
+
+        ctx = ctx or AnalysisContext.build(text)
+        sentences = ctx.sentences
+        lowered = None
+        if method == "frequency":
+            # Metode default mempertahankan batas kalimat lama (seluruh teks,
+            # bukan per paragraf): header tanpa tanda baca di atas baris
+            # kosong tetap menyatu dengan kalimat sesudahnya
+            whole = AnalysisContext.document_sentences(text)
+            if whole != sentences:
+                sentences = whole
+                lowered = [AnalysisContext.lowered_tokens(s) for s in whole]
 
         if not sentences:
             return text[:500]
@@ -71,128 +247,337 @@ class NLPAnalyzer:
             return " ".join(sentences)
 
         stop_words = NLPAnalyzer._get_stopwords()
+        if lowered is None:
+            matrix = ctx.term_matrix(stop_words)
+        else:
+            matrix = SentenceTermMatrix.build(lowered, stop_words)
+        if not matrix.n_terms:
+            return " ".join(sentences[:max_sentences])
 
-        # Hitung frekuensi kata
-        try:
-            words = word_tokenize(text.lower())
-        except Exception:
-            words = text.lower().split()
+        if method == "tfidf":
+            scores = matrix.tfidf_scores()
+        elif method == "textrank":
+            scores = matrix.textrank_scores()
+        else:
+            scores = matrix.frequency_scores()
 
-        word_freq: dict[str, int] = {}
-        for w in words:
-            if w.isalpha() and w not in stop_words and len(w) > 2:
-                word_freq[w] = word_freq.get(w, 0) + 1
+        # Ambil top N indeks (seri → kalimat lebih awal), urutkan sesuai posisi asli
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        top_indices = sorted(ranked[:max_sentences])
+        return " ".join(sentences[i] for i in top_indices)
 
-        if not word_freq:
-            return " ".join(sentences[:max_sentences])
+    @staticmethod
+    def extract_keywords(
+        text: str,
+        top_n: int = KEYWORD_TOP_N,
+        ctx: AnalysisContext | None = None,
+        idf: Callable[[str], float] | None = None,
+    ) -> list[str]:
+        """
+        Ekstrak keyword menggunakan POS tagging + frekuensi. Dengan `idf`
+        (mis. CorpusStats.idf) kandidat diurutkan berdasarkan TF-IDF.
+        """
+        ctx = ctx or AnalysisContext.build(text)
+        candidates = NLPAnalyzer.keyword_frequencies(ctx)
+        return NLPAnalyzer.rank_keywords(candidates, idf, top_n)
 
-        max_freq = max(word_freq.values())
-        word_freq = {w: f / max_freq for w, f in word_freq.items()}
+    @staticmethod
+    def keyword_frequencies(
+        ctx: AnalysisContext,
+        limit: int = KEYWORD_CANDIDATES,
+    ) -> list[tuple[str, int]]:
+        """Kandidat keyword + frekuensinya di dokumen (urut frekuensi)."""
+        return Counter(NLPAnalyzer._keyword_terms(ctx)).most_common(limit)
 
-        # Skor tiap kalimat
-        sentence_scores: dict[int, float] = {}
-        for i, sentence in enumerate(sentences):
-            try:
-                sent_words = word_tokenize(sentence.lower())
-            except Exception:
-                sent_words = sentence.lower().split()
+    @staticmethod
+    def rank_keywords(
+        candidates: Iterable[tuple[str, int]],
+        idf: Callable[[str], float] | None = None,
+        top_n: int = KEYWORD_TOP_N,
+    ) -> list[str]:
+        """Top-N kandidat berdasarkan tf × idf; tanpa idf = frekuensi mentah."""
+        candidates = list(candidates)
+        if idf is not None:
+            # sorted() stabil: skor seri mempertahankan urutan frekuensi
+            candidates = sorted(
+                candidates, key=lambda item: item[1] * idf(item[0]), reverse=True
+            )
+        return [word for word, _ in candidates[:top_n]]
 
-            score = sum(word_freq.get(w, 0) for w in sent_words if w.isalpha())
-            sentence_scores[i] = score
+    @staticmethod
+    def document_terms(text: str) -> list[str]:
+        """
+        Himpunan lemma kandidat keyword untuk statistik korpus (DF). Tanpa
+        POS tagging agar murah saat dokumen disimpan; mencakup semua
+        kandidat yang mungkin dihasilkan _keyword_terms.
+        """
+        stop_words = NLPAnalyzer._get_stopwords()
+        lemmatize = NLPAnalyzer._lemmatizer()
 
-        # Ambil top N indeks, urutkan sesuai posisi asli
-        top_indices = sorted(
-            sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:max_sentences]
-        )
-        return " ".join(sentences[i] for i in top_indices)
+        terms: dict[str, None] = {}
+        for word in dict.fromkeys(WORD_RE.findall(text.lower())):
+            if len(word) > 2 and word not in stop_words:
+                terms[lemmatize(word)] = None
+        return list(terms)
 
     @staticmethod
-    def extract_keywords(text: str, top_n: int = 15) -> list[str]:
-        """Ekstrak keyword menggunakan POS tagging + frekuensi."""
-        stop_words = NLPAnalyzer._get_stopwords()
-        lemmatizer = WordNetLemmatizer()
+    def public_result(analysis: dict) -> dict:
+        """Hasil analisis tanpa field internal, untuk dikirim ke klien."""
+        return {k: v for k, v in analysis.items() if k not in INTERNAL_FIELDS}
 
-        try:
-            tokens = word_tokenize(text)
-            tagged = pos_tag(tokens)
-        except Exception:
-            tokens = text.split()
-            tagged = [(t, "NN") for t in tokens]
+    @staticmethod
+    def apply_keyword_idf(
+        text: str,
+        analysis: dict,
+        idf: Callable[[str], float] | None,
+    ) -> dict:
+        """
+        Susun ulang keyword hasil full_analysis (yang bisa berasal dari
+        cache/process pool) memakai IDF korpus saat ini. Laporan
+        enriched_info dibuat ulang bila keyword berubah.
+        """
+        candidates = analysis.get("keyword_tf")
+        if idf is None or not candidates:
+            return analysis
+
+        keywords = NLPAnalyzer.rank_keywords(candidates, idf)
+        result = dict(analysis)
+        if keywords != analysis["keywords"]:
+            result["keywords"] = keywords
+            result["enriched_info"] = NLPAnalyzer.generate_enriched_info(
+                text, keywords, analysis["entities"], analysis["summary"],
+                sentence_count=analysis.get("sentence_count"),
+            )
+        return result
+
+    @staticmethod
+    def _keyword_terms(ctx: AnalysisContext) -> list[str]:
+        """Lemma kandidat keyword (kata benda/sifat) dari satu konteks."""
+        stop_words = NLPAnalyzer._get_stopwords()
+        lemmatize = NLPAnalyzer._lemmatizer()
 
         keywords: list[str] = []
-        for word, tag in tagged:
+        for word, tag in (pair for sent in ctx.tagged for pair in sent):
             if (
                 word.isalpha()
                 and len(word) > 2
                 and word.lower() not in stop_words
                 and tag in ("NN", "NNS", "NNP", "NNPS", "JJ", "VBG")
             ):
+                keywords.append(lemmatize(word.lower()))
+        return keywords
+
+    @staticmethod
+    def _lemmatizer() -> Callable[[str], str]:
+        """
+        Lemmatizer WordNet dengan memo LRU bersama (sentence_cache.lemmas).
+        Kata yang gagal di-lemmatize dikembalikan apa adanya (dan ikut
+        di-memo, karena kegagalan corpus mahal dan berulang); lemmatizer
+        tidak tersedia → str.lower.
+        """
+        try:
+            lemmatize = NLPModels.lemmatizer().lemmatize
+        except Exception:
+            return str.lower
+
+        cache = sentence_cache.lemmas
+
+        def cached(word: str) -> str:
+            lemma = cache.get(word)
+            if lemma is None:
                 try:
-                    lemma = lemmatizer.lemmatize(word.lower())
+                    lemma = lemmatize(word)
                 except Exception:
-                    lemma = word.lower()
-                keywords.append(lemma)
-
-        freq = Counter(keywords)
-        return [word for word, _ in freq.most_common(top_n)]
+                    lemma = word
+                cache.put(word, lemma)
+            return lemma
+        return cached
 
     @staticmethod
-    def extract_entities(text: str) -> list[dict]:
-        """Named Entity Recognition menggunakan NLTK ne_chunk."""
-        entities: list[dict] = []
-        seen: set[str] = set()
-
-        # Batasi teks agar tidak terlalu lambat
-        truncated = text[:8000]
+    def extract_entities(
+        text: str,
+        ctx: AnalysisContext | None = None,
+        time_budget_ms: int | None = None,
+    ) -> list[dict]:
+        """
+        Named Entity Recognition (NLTK ne_chunk) atas seluruh dokumen.
+        `time_budget_ms` membatasi waktu ne_chunk; bila habis, entitas
+        yang sudah ditemukan dikembalikan beserta penanda INFO.
+        """
+        ctx = ctx or AnalysisContext.build(text)
+        deadline = NLPAnalyzer.ner_deadline(time_budget_ms)
 
+        found: list[tuple[str, str, int]] = []
         try:
-            sentences = sent_tokenize(truncated)
-            for sentence in sentences:
-                tokens = word_tokenize(sentence)
-                tagged = pos_tag(tokens)
-                chunks = ne_chunk(tagged, binary=False)
-
-                for chunk in chunks:
-                    if hasattr(chunk, "label"):
-                        entity_text = " ".join(c[0] for c in chunk)
-                        entity_label = chunk.label()
-                        key = f"{entity_text}|{entity_label}"
-
-                        if key not in seen and entity_text.strip():
-                            seen.add(key)
-                            entities.append({
-                                "text": entity_text,
-                                "label": entity_label,
-                                "description": NE_LABEL_MAP.get(
-                                    entity_label, entity_label
-                                ),
-                            })
+            NLPAnalyzer._chunk_entities(
+                ctx.tagged, found, ctx.sentences, ctx.offsets, deadline
+            )
         except Exception as e:
-            entities.append({
-                "text": "NER tidak tersedia",
-                "label": "INFO",
-                "description": str(e),
-            })
+            return NLPAnalyzer.merge_entities([found]) + [NLPAnalyzer._ner_error(e)]
+
+        return NLPAnalyzer.merge_entities([found])
+
+    @staticmethod
+    def ner_deadline(time_budget_ms: int | None) -> float | None:
+        """Deadline time.monotonic() dari anggaran ms (None/0 = tanpa batas)."""
+        return time.monotonic() + time_budget_ms / 1000 if time_budget_ms else None
+
+    @staticmethod
+    def _chunk_entities(
+        tagged_sentences: list[list[tuple[str, str]]],
+        found: list[tuple[str, str, int]],
+        sentences: list[str] | None = None,
+        offsets: list[int] | None = None,
+        deadline: float | None = None,
+    ) -> list[tuple[str, str, int]]:
+        """
+        Jalankan ne_chunk per kalimat, tambahkan (teks, label, posisi) ke
+        `found`. Posisi = offset karakter di dokumen bila `sentences` dan
+        `offsets` diberikan (-1 bila tidak diketahui). TimeoutError bila
+        `deadline` terlewati.
+        """
+        chunker = NLPModels.ne_chunker()
+        for i, tagged in enumerate(tagged_sentences):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Batas waktu NER tercapai setelah {i} dari "
+                    f"{len(tagged_sentences)} kalimat"
+                )
+            sentence = sentences[i] if sentences else ""
+            base = offsets[i] if offsets else -1
+
+            # Kunci cache hanya bila teks kalimat diketahui (hasil chunk
+            # ditentukan oleh kalimat, karena POS tag juga per kalimat)
+            key = sentence_cache.key(sentence) if sentence else None
+            entities = sentence_cache.chunks.get(key) if key else None
+            if entities is None:
+                entities = tuple(NLPAnalyzer._sentence_entities(chunker, tagged, sentence))
+                if key:
+                    sentence_cache.chunks.put(key, entities)
+
+            for entity_text, entity_label, start in entities:
+                position = base + start if base >= 0 and start >= 0 else base
+                found.append((entity_text, entity_label, position))
+        return found
+
+    @staticmethod
+    def _sentence_entities(chunker, tagged: list[tuple[str, str]],
+                           sentence: str) -> Iterator[tuple[str, str, int]]:
+        """(teks, label, posisi dalam kalimat atau -1) tiap entitas satu kalimat."""
+        cursor = 0
+        for node in chunker.parse(tagged):
+            is_entity = hasattr(node, "label")
+            first = node[0][0] if is_entity else node[0]
+            start = sentence.find(first, cursor) if sentence else -1
+            if start >= 0:
+                cursor = start + len(first)
+            if is_entity:
+                yield " ".join(c[0] for c in node), node.label(), start
+
+    @staticmethod
+    def ner_batches(sentences: list[str],
+                    chunk_chars: int = NER_CHUNK_CHARS) -> list[tuple[int, int]]:
+        """
+        Kelompokkan kalimat berurutan menjadi rentang indeks [awal, akhir)
+        berukuran ±chunk_chars karakter, untuk NER paralel per kelompok.
+        """
+        batches: list[tuple[int, int]] = []
+        first, size = 0, 0
+        for i, sentence in enumerate(sentences):
+            size += len(sentence)
+            if size >= chunk_chars:
+                batches.append((first, i + 1))
+                first, size = i + 1, 0
+        if first < len(sentences):
+            batches.append((first, len(sentences)))
+        return batches
+
+    @staticmethod
+    def entities_for_sentences(
+        tagged: list[list[tuple[str, str]]],
+        sentences: list[str],
+        offsets: list[int],
+        deadline: float | None = None,
+    ) -> list[tuple[str, str, int]]:
+        """
+        ne_chunk kalimat yang sudah di-POS tag (tanpa tokenisasi ulang).
+        Dipakai worker process untuk NER paralel; `deadline` absolut
+        (time.monotonic, jam sistem yang sama untuk semua proses) agar
+        anggaran waktu berlaku untuk seluruh dokumen, bukan per potongan.
+        """
+        return NLPAnalyzer._chunk_entities(tagged, [], sentences, offsets, deadline)
+
+    @staticmethod
+    def merge_entities(parts: list[list[tuple[str, str, int]]],
+                       max_entities: int = NER_MAX_ENTITIES) -> list[dict]:
+        """
+        Gabungkan hasil NER (bagian urut sesuai posisi) dan buang duplikat
+        (teks + label). Skema entitas sama seperti sebelumnya (text, label,
+        description); hanya `max_entities` entitas pertama menurut urutan
+        kemunculan yang dikembalikan.
+        """
+        entities: list[dict] = []
+        seen: set[tuple[str, str]] = set()
+        for part in parts:
+            for entity_text, entity_label, _ in part:
+                if len(entities) >= max_entities:
+                    return entities
+                key = (entity_text, entity_label)
+                if key in seen or not entity_text.strip():
+                    continue
+                seen.add(key)
+                entities.append({
+                    "text": entity_text,
+                    "label": entity_label,
+                    "description": NE_LABEL_MAP.get(entity_label, entity_label),
+                })
+        return entities
+
+    @staticmethod
+    def _ner_error(e: Exception) -> dict:
+        return {
+            # Timeout = hasil parsial (anggaran waktu habis), bukan NER gagal
+            "text": NER_TIMEOUT_TEXT if isinstance(e, TimeoutError) else "NER tidak tersedia",
+            "label": "INFO",
+            "description": str(e),
+        }
 
-        return entities[:30]  # max 30 entitas
+    @staticmethod
+    def is_partial(analysis: dict) -> bool:
+        """True bila NER hasil analisis terpotong anggaran waktu."""
+        return any(
+            e.get("label") == "INFO" and e.get("text") == NER_TIMEOUT_TEXT
+            for e in analysis.get("entities") or ()
+        )
 
     @staticmethod
     def analyze_sentiment(text: str) -> str:
-        """Analisis sentimen berbasis kamus kata positif/negatif."""
-        try:
-            tokens = word_tokenize(text[:5000].lower())
-        except Exception:
-            tokens = text[:5000].lower().split()
+        """Label sentimen seluruh teks (lihat sentiment_scores)."""
+        return NLPAnalyzer.sentiment_scores(text)["label"]
 
-        token_set = {t for t in tokens if t.isalpha()}
-        pos_score = len(token_set & POSITIVE_WORDS)
-        neg_score = len(token_set & NEGATIVE_WORDS)
+    @staticmethod
+    def sentiment_scores(text: str, section_chars: int = SENTIMENT_SECTION_CHARS) -> dict:
+        """
+        Sentimen berbasis kamus atas seluruh teks: label keseluruhan dan
+        skor per bagian ±section_chars karakter (dipotong di spasi).
+        """
+        scorer = SentimentScorer()
+        for section in NLPAnalyzer.text_sections(text, section_chars):
+            scorer.feed(section)
+        return scorer.result()
 
-        if pos_score > neg_score:
-            return "Positive"
-        elif neg_score > pos_score:
-            return "Negative"
-        return "Neutral"
+    @staticmethod
+    def text_sections(text: str, section_chars: int) -> Iterator[str]:
+        """Potong teks ±section_chars karakter tanpa memotong kata."""
+        start = 0
+        while start < len(text):
+            end = start + section_chars
+            if end < len(text):
+                cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+                if cut > start:
+                    end = cut + 1
+            yield text[start:end]
+            start = end
 
     @staticmethod
     def generate_enriched_info(
@@ -200,15 +585,24 @@ class NLPAnalyzer:
         keywords: list[str],
         entities: list[dict],
         summary: str,
+        ctx: AnalysisContext | None = None,
+        sentence_count: int | None = None,
+        word_count: int | None = None,
+        char_count: int | None = None,
     ) -> str:
         """Buat laporan analisis lengkap."""
-        word_count = len(text.split())
-        char_count = len(text)
+        if word_count is None:
+            word_count = len(text.split())
+        if char_count is None:
+            char_count = len(text)
 
-        try:
-            sentence_count = len(sent_tokenize(text))
-        except Exception:
-            sentence_count = text.count(".") + text.count("!") + text.count("?")
+        if ctx is not None:
+            sentence_count = len(ctx.sentences)
+        elif sentence_count is None:
+            try:
+                sentence_count = len(NLPModels.punkt().tokenize(text))
+            except Exception:
+                sentence_count = text.count(".") + text.count("!") + text.count("?")
 
         entity_lines = "\n".join(
             f"  - {e['text']} [{e['label']}] → {e['description']}"
@@ -246,17 +640,462 @@ class NLPAnalyzer:
         return enriched
 
     @classmethod
-    def full_analysis(cls, text: str) -> dict:
-        summary   = cls.summarize(text)
-        keywords  = cls.extract_keywords(text)
-        entities  = cls.extract_entities(text)
-        sentiment = cls.analyze_sentiment(text)
-        enriched  = cls.generate_enriched_info(text, keywords, entities, summary)
+    def full_analysis(
+        cls,
+        text: str,
+        progress: Callable[[float, str], None] | None = None,
+        ner_budget_ms: int | None = None,
+        minhash: list[int] | None = None,
+    ) -> dict:
+        """
+        Jalankan seluruh tahap analisis. `progress(fraksi, tahap)` opsional
+        dipanggil setelah tiap tahap (dipakai oleh job queue).
+        `ner_budget_ms` membatasi waktu NER (lihat extract_entities).
+        `minhash` = signature teks yang sudah dihitung pemanggil (opsional).
+        """
+        report = progress or (lambda fraction, stage: None)
+
+        # Tokenisasi & POS tagging sekali, dipakai semua tahap
+        ctx = AnalysisContext.build(text)
+        report(0.3, "tokenize")
+
+        entities = cls.extract_entities(text, ctx=ctx, time_budget_ms=ner_budget_ms)
+        report(0.7, "entities")
+        result = cls._assemble(text, ctx, entities, minhash)
+        report(1.0, "done")
+        return result
+
+    @classmethod
+    def _assemble(cls, text: str, ctx: AnalysisContext, entities: list[dict],
+                  minhash: list[int] | None = None) -> dict:
+        """Tahap agregat seluruh dokumen dari konteks + entitas yang sudah ada."""
+        summary    = cls.summarize(text, ctx=ctx)
+        keyword_tf = cls.keyword_frequencies(ctx)
+        keywords   = cls.rank_keywords(keyword_tf)
+        sentiment  = cls.sentiment_scores(text)
+        enriched   = cls.generate_enriched_info(
+            text, keywords, entities, summary, ctx=ctx
+        )
+        return {
+            "summary":      summary,
+            "keywords":     keywords,
+            "entities":     entities,
+            "sentiment":    sentiment["label"],
+            "sentiment_detail": sentiment,
+            "enriched_info": enriched,
+            "keyword_tf":     keyword_tf,
+            "sentence_count": len(ctx.sentences),
+            "minhash":        minhash or MinHasher.signature(text),
+        }
+
+    @staticmethod
+    def paragraph_fingerprint(paragraph: str) -> str:
+        return hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def incremental_analysis(
+        cls,
+        text: str,
+        previous: list[dict] | None = None,
+        ner_budget_ms: int | None = None,
+    ) -> tuple[dict, list[dict], int]:
+        """
+        full_analysis yang memakai ulang hasil per paragraf dari analisis
+        sebelumnya (`previous` = daftar paragraf dari panggilan sebelumnya).
+
+        Hanya paragraf dengan fingerprint baru yang ditokenisasi, di-tag,
+        dan di-chunk; ringkasan, keyword, sentimen, dan laporan dihitung
+        ulang dari gabungan semua paragraf. Hasil sama dengan full_analysis
+        (kalimat juga dipotong per paragraf di sana).
+
+        Return (hasil, paragraf untuk disimpan, jumlah paragraf dipakai ulang).
+        Paragraf yang NER-nya tidak selesai (anggaran waktu habis) disimpan
+        dengan entities None dan dianalisis ulang pada panggilan berikutnya.
+        """
+        ctx, paragraphs, entities, reused = cls._paragraph_pass(text, previous, ner_budget_ms)
+        return cls._assemble(text, ctx, entities), paragraphs, reused
+
+    @classmethod
+    def paragraph_records(cls, text: str, ner_budget_ms: int | None = None) -> list[dict]:
+        """
+        Rekaman per paragraf (fingerprint, kalimat, POS tag, entitas) untuk
+        disimpan di document_paragraphs saat dokumen disimpan, agar
+        regenerate pertama sudah bisa memakai ulang paragraf.
+        """
+        return cls._paragraph_pass(text, None, ner_budget_ms)[1]
+
+    @classmethod
+    def _paragraph_pass(
+        cls,
+        text: str,
+        previous: list[dict] | None,
+        ner_budget_ms: int | None,
+    ) -> tuple[AnalysisContext, list[dict], list[dict], int]:
+        """(konteks gabungan, paragraf, entitas, jumlah dipakai ulang)."""
+        known = {
+            p["fingerprint"]: p for p in previous or ()
+            if p.get("entities") is not None
+        }
+        deadline = cls.ner_deadline(ner_budget_ms)
+        ctx = AnalysisContext(text=text)
+        paragraphs: list[dict] = []
+        parts: list[list[tuple[str, str, int]]] = []
+        error: Exception | None = None
+        reused = 0
+        try:
+            NLPModels.ne_chunker()
+            ner_available = True
+        except Exception as e:
+            # NER tidak tersedia sama sekali: paragraf tetap dianggap lengkap
+            error, ner_available = e, False
+
+        for start, end in AnalysisContext.paragraph_spans(text):
+            paragraph = text[start:end]
+            fingerprint = cls.paragraph_fingerprint(paragraph)
+            record = known.get(fingerprint)
+            if record is not None:
+                reused += 1
+                spans = record["sentences"]
+                tagged = [[tuple(pair) for pair in sent] for sent in record["tagged"]]
+                found = [tuple(entity) for entity in record["entities"]]
+            else:
+                part = AnalysisContext.build(paragraph)
+                spans = [[o, o + len(s)] for o, s in zip(part.offsets, part.sentences)]
+                tagged = part.tagged
+                found = []
+                complete = not ner_available
+                if ner_available and error is None:
+                    try:
+                        cls._chunk_entities(tagged, found, part.sentences, part.offsets, deadline)
+                        complete = True
+                    except Exception as e:
+                        error = e
+                record = {
+                    "fingerprint": fingerprint,
+                    "sentences":   spans,
+                    "tagged":      tagged,
+                    "entities":    found if complete else None,
+                }
+            paragraphs.append(record)
+
+            for (s, e), pairs in zip(spans, tagged):
+                tokens = [word for word, _ in pairs]
+                ctx.sentences.append(paragraph[s:e])
+                ctx.offsets.append(start + s)
+                ctx.tagged.append(pairs)
+                ctx.tokens.append(tokens)
+                ctx.lowered.append([t.lower() for t in tokens])
+            parts.append([(t, label, start + pos) for t, label, pos in found])
+
+        entities = cls.merge_entities(parts)
+        if error is not None:
+            entities.append(cls._ner_error(error))
+        return ctx, paragraphs, entities, reused
+
+    @classmethod
+    def core_analysis(cls, text: str, with_context: bool = False,
+                      minhash: list[int] | None = None) -> dict:
+        """
+        Semua tahap kecuali NER dan laporan. Dipakai backend process pool
+        yang menjalankan NER secara paralel lalu merakit hasilnya.
+        `with_context` menyertakan kalimat, offset, dan POS tag ("context")
+        agar NER tidak perlu men-tag ulang dokumen.
+        """
+        ctx = AnalysisContext.build(text)
+        keyword_tf = cls.keyword_frequencies(ctx)
+        sentiment = cls.sentiment_scores(text)
+        result = {
+            "summary":          cls.summarize(text, ctx=ctx),
+            "keywords":         cls.rank_keywords(keyword_tf),
+            "keyword_tf":       keyword_tf,
+            "minhash":          minhash or MinHasher.signature(text),
+            "sentiment":        sentiment["label"],
+            "sentiment_detail": sentiment,
+            "sentence_count":   len(ctx.sentences),
+        }
+        if with_context:
+            result["context"] = {
+                "sentences": ctx.sentences,
+                "offsets":   ctx.offsets,
+                "tagged":    ctx.tagged,
+            }
+        return result
+
+    @classmethod
+    def analyze_many(
+        cls,
+        items: Iterable[tuple[Any, str]],
+        max_workers: int = 4,
+        analyze: Callable[[str], dict] | None = None,
+    ) -> Iterator[tuple[Any, dict | None, str | None]]:
+        """
+        Analisis banyak teks secara paralel. `items` berisi (kunci, teks)
+        dan boleh berupa generator; hasil (kunci, hasil, error) di-yield
+        segera setelah tiap analisis selesai, tanpa menunggu input habis.
+        `analyze` default cls.full_analysis (bisa diganti cache/process pool).
+        """
+        analyze = analyze or cls.full_analysis
+        pending: dict[Future, Any] = {}
+
+        def collect(futures) -> Iterator[tuple[Any, dict | None, str | None]]:
+            for future in futures:
+                key = pending.pop(future)
+                try:
+                    yield key, future.result(), None
+                except Exception as e:
+                    yield key, None, str(e)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for key, text in items:
+                pending[executor.submit(analyze, text)] = key
+                done = [f for f in pending if f.done()]
+                yield from collect(done)
+            yield from collect(as_completed(list(pending)))
+
+    @classmethod
+    def stream_analysis(
+        cls,
+        chunks: Iterable[str],
+        progress: Callable[[int], None] | None = None,
+        idf: Callable[[str], float] | None = None,
+        ner_budget_ms: int | None = None,
+    ) -> dict:
+        """
+        Analisis inkremental atas potongan teks (mis. halaman PDF dari
+        FileProcessor.iter_text) tanpa menggabungkan seluruh dokumen.
+        `progress(jumlah_potongan)` opsional dipanggil setelah tiap potongan.
+        """
+        stream = StreamingAnalysis(ner_budget_ms=ner_budget_ms)
+        for chunk in chunks:
+            stream.feed(chunk)
+            if progress:
+                progress(stream.chunk_count)
+        return stream.result(idf=idf)
+
+
+class SentimentScorer:
+    """
+    Skor sentimen kamus yang di-stream per bagian teks (halaman, blok).
+
+    Tiap bagian dipindai sekali: kata di-lowercase dan dihitung dengan
+    Counter (loop C), lalu hanya kata kamus yang dicari di hitungan itu.
+    Biaya O(n) tanpa tokenisasi NLTK; memori konstan di luar daftar skor
+    per bagian. Label = mana yang lebih banyak muncul, positif/negatif.
+    """
+
+    LEXICON = tuple(POSITIVE_WORDS), tuple(NEGATIVE_WORDS)
+
+    def __init__(self):
+        self.positive = 0
+        self.negative = 0
+        self.chars    = 0
+        self.sections: list[dict] = []
+
+    def feed(self, section: str) -> dict:
+        counts = Counter(WORD_RE.findall(section.lower()))
+        positive_words, negative_words = self.LEXICON
+        pos = sum(counts[w] for w in positive_words if w in counts)
+        neg = sum(counts[w] for w in negative_words if w in counts)
+
+        scored = {
+            "section":  len(self.sections) + 1,
+            "start":    self.chars,
+            "positive": pos,
+            "negative": neg,
+            "score":    self.score(pos, neg),
+            "label":    self.label(pos, neg),
+        }
+        self.sections.append(scored)
+        self.positive += pos
+        self.negative += neg
+        self.chars    += len(section)
+        return scored
+
+    def result(self) -> dict:
+        return {
+            "label":    self.label(self.positive, self.negative),
+            "score":    self.score(self.positive, self.negative),
+            "positive": self.positive,
+            "negative": self.negative,
+            "sections": self.sections,
+        }
+
+    @staticmethod
+    def score(pos: int, neg: int) -> float:
+        """(positif − negatif) / total, di rentang −1..1; 0 bila tidak ada."""
+        return round((pos - neg) / (pos + neg), 3) if pos + neg else 0.0
+
+    @staticmethod
+    def label(pos: int, neg: int) -> str:
+        if pos > neg:
+            return "Positive"
+        if neg > pos:
+            return "Negative"
+        return "Neutral"
+
+
+class StreamingAnalysis:
+    """
+    Akumulator analisis per potongan teks dengan memori terbatas.
+
+    Yang disimpan hanya agregat: frekuensi kata, frekuensi keyword,
+    skor sentimen per potongan, entitas unik (maks. NER_MAX_ENTITIES,
+    dibatasi total waktu ner_budget_ms), dan kumpulan kandidat kalimat
+    ringkasan berukuran tetap. Kandidat diseleksi dengan frekuensi berjalan
+    lalu diskor ulang di akhir, sehingga ringkasan bisa sedikit berbeda dari
+    NLPAnalyzer.summarize.
+
+    Kalimat yang belum selesai dibawa ke potongan berikutnya paling banyak
+    `max_carry_chars` karakter / `max_carry_lines` baris; lewat dari itu
+    (teks tanpa . ! ?) langsung diproses sebagai kalimat.
+    """
+
+    def __init__(self, max_sentences: int = 5, top_n: int = 15,
+                 candidate_pool: int = 200, preview_chars: int = 500,
+                 ner_budget_ms: int | None = None,
+                 max_carry_chars: int = 2000, max_carry_lines: int = 20):
+        self.max_sentences  = max_sentences
+        self.top_n          = top_n
+        self.candidate_pool = candidate_pool
+        self.preview_chars  = preview_chars
+        self.ner_budget_ms  = ner_budget_ms
+        self.ner_spent_ms   = 0.0
+        self.max_carry_chars = max_carry_chars
+        self.max_carry_lines = max_carry_lines
+
+        self.word_freq: Counter = Counter()
+        self.keyword_freq: Counter = Counter()
+        self.sentiment = SentimentScorer()
+        self.entities: list[dict] = []
+        self.entity_error: Exception | None = None
+
+        self.chunk_count    = 0
+        self.sentence_count = 0
+        self.word_count     = 0
+        self.char_count     = 0
+        self.preview        = ""
+
+        # (indeks kalimat, kalimat, kata-kata konten)
+        self._candidates: list[tuple[int, str, list[str]]] = []
+        self._carry = ""
+        self._consumed_chars = 0
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self.chunk_count += 1
+        self.word_count  += len(chunk.split())
+        self.char_count  += len(chunk)
+        if len(self.preview) < self.preview_chars:
+            self.preview += chunk[: self.preview_chars - len(self.preview)]
+        # Satu potongan (halaman PDF / blok DOCX) = satu bagian skor sentimen
+        self.sentiment.feed(chunk)
+
+        # Kalimat terakhir yang belum selesai dibawa ke potongan berikutnya
+        text = f"{self._carry} {chunk}" if self._carry else chunk
+        sentences = AnalysisContext.split_sentences(text)
+        self._carry = ""
+        if sentences and not sentences[-1].rstrip().endswith((".", "!", "?")):
+            tail = sentences[-1]
+            if len(tail) <= self.max_carry_chars and tail.count("\n") < self.max_carry_lines:
+                self._carry = sentences.pop()
+        self._consume(sentences)
+
+    def _consume(self, sentences: list[str]) -> None:
+        if not sentences:
+            return
+        ctx = AnalysisContext.build(" ".join(sentences))
+        base_offset = self._consumed_chars
+        self._consumed_chars += len(ctx.text)
+        stop_words = NLPAnalyzer._get_stopwords()
+
+        self.keyword_freq.update(NLPAnalyzer._keyword_terms(ctx))
+
+        for words in ctx.lowered:
+            content = [
+                w for w in words
+                if w.isalpha() and w not in stop_words and len(w) > 2
+            ]
+            self.word_freq.update(content)
+
+        for sentence, words in zip(ctx.sentences, ctx.lowered):
+            self._candidates.append(
+                (self.sentence_count, sentence, [w for w in words if w.isalpha()])
+            )
+            self.sentence_count += 1
+        if len(self._candidates) > 2 * self.candidate_pool:
+            self._candidates = self._top_candidates(self.candidate_pool)
+
+        # NER seluruh potongan sampai sisa anggaran waktu habis atau
+        # batas jumlah entitas tercapai
+        if self.entity_error is None and len(self.entities) < NER_MAX_ENTITIES:
+            started = time.monotonic()
+            deadline = None
+            if self.ner_budget_ms:
+                deadline = started + (self.ner_budget_ms - self.ner_spent_ms) / 1000
+            found: list[tuple[str, str, int]] = []
+            try:
+                NLPAnalyzer._chunk_entities(
+                    ctx.tagged, found, ctx.sentences,
+                    [base_offset + offset for offset in ctx.offsets],
+                    deadline,
+                )
+            except Exception as e:
+                self.entity_error = e
+            known = [(e["text"], e["label"], 0) for e in self.entities]
+            self.entities = NLPAnalyzer.merge_entities([known, found])
+            self.ner_spent_ms += (time.monotonic() - started) * 1000
+
+    def _top_candidates(self, n: int) -> list[tuple[int, str, list[str]]]:
+        freq = self.word_freq
+        ranked = sorted(
+            self._candidates,
+            key=lambda c: (-sum(freq.get(w, 0) for w in c[2]), c[0]),
+        )
+        return ranked[:n]
+
+    def result(self, idf: Callable[[str], float] | None = None) -> dict:
+        if self._carry:
+            carry, self._carry = self._carry, ""
+            self._consume([carry])
+
+        if self.sentence_count <= self.max_sentences:
+            chosen = self._candidates
+        else:
+            chosen = self._top_candidates(self.max_sentences)
+        summary = " ".join(c[1] for c in sorted(chosen, key=lambda c: c[0]))
+        if not summary:
+            summary = self.preview
+
+        keywords = NLPAnalyzer.rank_keywords(
+            self.keyword_freq.most_common(KEYWORD_CANDIDATES), idf, self.top_n
+        )
+
+        entities = list(self.entities)
+        if self.entity_error is not None:
+            entities.append(NLPAnalyzer._ner_error(self.entity_error))
+
+        sentiment = self.sentiment.result()
+
+        enriched = NLPAnalyzer.generate_enriched_info(
+            "", keywords, entities, summary,
+            sentence_count=self.sentence_count,
+            word_count=self.word_count,
+            char_count=self.char_count,
+        )
 
         return {
             "summary":      summary,
             "keywords":     keywords,
             "entities":     entities,
-            "sentiment":    sentiment,
+            "sentiment":    sentiment["label"],
+            "sentiment_detail": sentiment,
             "enriched_info": enriched,
-        }
\ No newline at end of file
+            "stats": {
+                "chunks":    self.chunk_count,
+                "sentences": self.sentence_count,
+                "words":     self.word_count,
+                "chars":     self.char_count,
+            },
+            "preview":      self.preview,
+        }
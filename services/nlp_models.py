@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+
+from nltk.chunk import Maxent_NE_Chunker
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from nltk.tag import PerceptronTagger
+from nltk.tokenize import PunktTokenizer
+
+
+class NLPModels:
+    """
+    Registry model NLTK yang dimuat sekali per proses.
+
+    `pos_tag`/`ne_chunk` bawaan NLTK membuat tagger & chunker baru di setiap
+    panggilan, dan stopwords dibaca ulang dari corpus. Registry ini menyimpan
+    satu instance bersama. Model yang gagal dimuat menyimpan error-nya, dan
+    accessor akan me-raise error tersebut sehingga fallback di NLPAnalyzer
+    tetap berjalan. Stopwords tanpa corpus sama sekali memakai himpunan
+    kosong (fallback) dengan error tetap tercatat di status.
+    """
+
+    _lock = threading.Lock()
+    _models: dict[str, object] = {}
+    _errors: dict[str, Exception] = {}
+    _load_seconds: dict[str, float] = {}
+    _warmed = False
+
+    @classmethod
+    def _load_stopwords(cls) -> frozenset:
+        words: set[str] = set()
+        error: Exception | None = None
+        for lang in ("english", "indonesian"):
+            try:
+                words |= set(stopwords.words(lang))
+            except Exception as e:
+                error = e
+        if not words:
+            cls._errors["stopwords"] = error or LookupError("Corpus stopwords kosong")
+        return frozenset(words)
+
+    _LOADERS = {
+        "punkt":      lambda: PunktTokenizer("english"),
+        "tagger":     lambda: PerceptronTagger(),
+        "ne_chunker": lambda: Maxent_NE_Chunker(),
+        "lemmatizer": lambda: WordNetLemmatizer(),
+        "stopwords":  lambda: NLPModels._load_stopwords(),
+    }
+
+    @classmethod
+    def _get(cls, name: str):
+        if name in cls._models:
+            return cls._models[name]
+        if name in cls._errors:
+            raise cls._errors[name]
+
+        with cls._lock:
+            if name not in cls._models and name not in cls._errors:
+                start = time.perf_counter()
+                try:
+                    cls._models[name] = cls._LOADERS[name]()
+                except Exception as e:
+                    cls._errors[name] = e
+                cls._load_seconds[name] = round(time.perf_counter() - start, 3)
+
+        # Model fallback (mis. stopwords kosong) tetap dikembalikan
+        if name in cls._models:
+            return cls._models[name]
+        raise cls._errors[name]
+
+    # ── Accessor ─────────────────────────────────────────────────
+
+    @classmethod
+    def punkt(cls) -> PunktTokenizer:
+        return cls._get("punkt")
+
+    @classmethod
+    def tagger(cls) -> PerceptronTagger:
+        return cls._get("tagger")
+
+    @classmethod
+    def ne_chunker(cls) -> Maxent_NE_Chunker:
+        return cls._get("ne_chunker")
+
+    @classmethod
+    def lemmatizer(cls) -> WordNetLemmatizer:
+        return cls._get("lemmatizer")
+
+    @classmethod
+    def stopwords(cls) -> frozenset:
+        return cls._get("stopwords")
+
+    # ── Lifecycle ────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls) -> dict:
+        """Muat semua model sekarang (idempotent)."""
+        for name in cls._LOADERS:
+            try:
+                cls._get(name)
+            except Exception:
+                pass
+        return cls.status()
+
+    @classmethod
+    def warm_up(cls) -> dict:
+        """
+        Muat semua model lalu jalankan input kecil lewat tiap model,
+        agar lazy-load internal (mis. corpus wordnet) terjadi sekarang.
+        """
+        cls.load()
+        if cls._warmed:
+            return cls.status()
+
+        tagged = [
+            ("The", "DT"), ("Ministry", "NNP"), ("of", "IN"), ("Finance", "NNP"),
+            ("in", "IN"), ("Jakarta", "NNP"), ("approved", "VBD"), ("reports", "NNS"),
+        ]
+        for name, fn in (
+            ("punkt",      lambda: cls.punkt().tokenize("Warm up. Second sentence.")),
+            ("tagger",     lambda: cls.tagger().tag([w for w, _ in tagged])),
+            ("ne_chunker", lambda: cls.ne_chunker().parse(tagged)),
+            ("lemmatizer", lambda: cls.lemmatizer().lemmatize("reports")),
+        ):
+            if name in cls._models:
+                try:
+                    fn()
+                except Exception as e:
+                    cls._errors[name] = e
+                    cls._models.pop(name, None)
+        cls._warmed = True
+        return cls.status()
+
+    @classmethod
+    def status(cls) -> dict:
+        return {
+            name: {
+                "loaded":   name in cls._models and name not in cls._errors,
+                "fallback": name in cls._models and name in cls._errors,
+                "seconds":  cls._load_seconds.get(name),
+                "error":    cls._short_error(cls._errors[name])
+                            if name in cls._errors else None,
+            }
+            for name in cls._LOADERS
+        }
+
+    @staticmethod
+    def _short_error(e: Exception) -> str:
+        # LookupError NLTK berisi banner multi-baris; ambil baris pertama yang bermakna
+        message = re.sub(r"\x1b\[[0-9;]*m", "", str(e))
+        lines = [
+            ln.strip(" *") for ln in message.splitlines()
+            if any(ch.isalpha() for ch in ln)
+        ]
+        return lines[0] if lines else type(e).__name__
@@ -1,5 +1,12 @@
 import re
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from services.keyword_matcher import keyword_rules
 
 
 @dataclass
@@ -14,6 +21,7 @@ class NotaDinas:
     isi_pokok: list[str] = field(default_factory=list)
     poin_penting: list[str] = field(default_factory=list)
     deadline: list[str] = field(default_factory=list)
+    deadline_iso: list[str | None] = field(default_factory=list)  # sejajar dengan deadline
     referensi_regulasi: list[str] = field(default_factory=list)
     penandatangan: str = ""
     jabatan_penandatangan: str = ""
@@ -22,10 +30,27 @@ class NotaDinas:
     jenis_dokumen: str = "Nota Dinas"
 
 
+@dataclass
+class NotaDinasSegments:
+    """
+    Hasil segmentasi: header (kop + blok Yth..Tanggal), body (isi),
+    footer (penutup, tanda tangan, tembusan), dan nilai mentah field header.
+    """
+    header: str = ""
+    body: str = ""
+    footer: str = ""
+    fields: dict[str, str] = field(default_factory=dict)
+    has_header: bool = False
+
+
 class NotaDinasExtractor:
     """
     Ekstraktor data terstruktur dari Nota Dinas Kemenkeu.
     Menggunakan rule-based regex + pattern matching.
+
+    Teks dipecah sekali menjadi header/body/footer (lihat `segment`),
+    lalu tiap field diekstrak hanya dari segmennya. Semua pattern
+    dikompilasi di level kelas.
     """
 
     # ── Regex patterns ──────────────────────────────────────────
@@ -33,38 +58,39 @@ class NotaDinasExtractor:
         r"NOMOR\s+(ND[-/][\w./]+)",
         re.IGNORECASE
     )
-    PATTERN_KEPADA = re.compile(
-        r"Yth\s*[.:]\s*(.*?)(?=Dari\s*[.:])",
-        re.IGNORECASE | re.DOTALL
-    )
-    PATTERN_DARI = re.compile(
-        r"Dari\s*[.:]\s*(.+?)(?=Sifat\s*[.:])",
-        re.IGNORECASE | re.DOTALL
-    )
-    PATTERN_SIFAT = re.compile(
-        r"Sifat\s*[.:]\s*(.+?)(?=Lampiran\s*[.:]|Hal\s*[.:])",
-        re.IGNORECASE | re.DOTALL
-    )
-    PATTERN_LAMPIRAN = re.compile(
-        r"Lampiran\s*[.:]\s*(.+?)(?=Hal\s*[.:])",
-        re.IGNORECASE | re.DOTALL
-    )
-    PATTERN_HAL = re.compile(
-        r"Hal\s*[.:]\s*(.+?)(?=Tanggal\s*[.:])",
-        re.IGNORECASE | re.DOTALL
-    )
-    PATTERN_TANGGAL = re.compile(
-        r"Tanggal\s*[.:]\s*(.+?)(?=\n)",
+    # Label field header; satu kali scan linear menggantikan pattern
+    # lookahead per field (Yth→Dari, Dari→Sifat, dst.)
+    PATTERN_HEADER_LABEL = re.compile(
+        r"(Yth|Dari|Sifat|Lampiran|Hal|Tanggal)\s*[.:]",
         re.IGNORECASE
     )
+    # Field → label yang menutup nilainya
+    HEADER_FIELD_ENDS = {
+        "yth":      ("dari",),
+        "dari":     ("sifat",),
+        "sifat":    ("lampiran", "hal"),
+        "lampiran": ("hal",),
+        "hal":      ("tanggal",),
+    }
+    # Nilai Tanggal: sisa baris (boleh diawali whitespace/baris baru)
+    PATTERN_LINE_VALUE = re.compile(r"\s*(.+?)\n")
+    PATTERN_FOOTER = re.compile(
+        r"Demikian\s+(?:kami\s+)?disampaikan"
+        r"|^[ \t]*Tembusan\s*[:\n]"
+        r"|^[ \t]*(?:Ditandatangani secara elektronik|u\.b\.|ub\.)",
+        re.IGNORECASE | re.MULTILINE
+    )
+    # Baris jabatan di atas penanda tanda tangan ikut masuk footer
+    FOOTER_LOOKBACK_LINES = 3
     PATTERN_DEADLINE = re.compile(
         r"(?:paling lambat|batas waktu|selambat-lambatnya|"
         r"deadline|tanggal)\s+(\d{1,2}\s+\w+\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})",
         re.IGNORECASE
     )
+    # Nomor dst. hanya sampai akhir baris: paragraf bernomor sesudahnya tidak ikut
     PATTERN_REGULASI = re.compile(
-        r"(?:Peraturan|Keputusan|Instruksi|Perpres|Inpres|PMK|KMK|SE|"
-        r"Undang-Undang|UU)\s+[\w\s./]+(?:Nomor|No\.?)\s+[\w\s./]+(?:Tahun\s+\d{4})?",
+        r"\b(?:Peraturan|Keputusan|Instruksi|Perpres|Inpres|PMK|KMK|SE|"
+        r"Undang-Undang|UU)\s+[\w\s./]{1,200}?(?:Nomor|No\.?)\s+[\w./]+(?:[^\S\n]+[\w./]+)*",
         re.IGNORECASE
     )
     PATTERN_TEMBUSAN = re.compile(
@@ -75,11 +101,21 @@ class NotaDinasExtractor:
         r"(?:Ditandatangani secara elektronik\s*\n\s*)([\w\s.]+?)(?:\n|$)",
         re.IGNORECASE
     )
-    PATTERN_JABATAN_TTD = re.compile(
-        r"((?:Kepala|Direktur|Sekretaris|Inspektur|Plt\.|Pjs\.)[\w\s.,]+)"
-        r"\s*\n\s*(?:Ditandatangani|u\.b\.|ub\.)",
+    PATTERN_PENANDATANGAN_FALLBACK = re.compile(
+        r"elektronik\s*\n\s*([\w\s.]+?)(?:\n|Tembusan)",
         re.IGNORECASE
     )
+    PATTERNS_JABATAN_TTD = (
+        re.compile(
+            r"((?:Plt\.|Pjs\.)?\s*(?:Kepala|Direktur|Sekretaris|Inspektur)"
+            r"[\w\s,./]+?)\s*\n\s*(?:u\.b\.|Ditandatangani)",
+            re.IGNORECASE
+        ),
+        re.compile(
+            r"(Sekretaris Jenderal[\s\S]{0,50}?u\.b\.\s*\n\s*[\w\s]+)",
+            re.IGNORECASE
+        ),
+    )
     PATTERN_UNIT = re.compile(
         r"(BADAN|DIREKTORAT|SEKRETARIAT|INSPEKTORAT|PUSAT|BIRO)[\w\s,]+",
         re.IGNORECASE
@@ -89,6 +125,16 @@ class NotaDinasExtractor:
         re.IGNORECASE
     )
 
+    # Normalisasi & pemecah
+    RE_CRLF           = re.compile(r"\r\n")
+    RE_BLANK_LINES    = re.compile(r"\n{3,}")
+    RE_SPACES         = re.compile(r"[ \t]+")
+    RE_WHITESPACE     = re.compile(r"\s+")
+    RE_NUMBERED_SPLIT = re.compile(r"\n?\s*\d+\.\s+")
+    RE_NUMBER_PREFIX  = re.compile(r"^\d+\.\s*")
+    RE_PARAGRAPH      = re.compile(r"\n(?=\d+\.)")
+    RE_SENTENCE       = re.compile(r"[.;]\s*")
+
     # Bulan Indonesia
     BULAN_ID = {
         "januari": "Januari", "februari": "Februari", "maret": "Maret",
@@ -96,213 +142,368 @@ class NotaDinasExtractor:
         "juli": "Juli", "agustus": "Agustus", "september": "September",
         "oktober": "Oktober", "november": "November", "desember": "Desember",
     }
+    PATTERN_TANGGAL_BULAN = re.compile(
+        r"\b(\d{1,2}\s+(?:" + "|".join(BULAN_ID) + r")\s+\d{4})\b",
+        re.IGNORECASE
+    )
+
+    # Parsing tanggal: "5 Januari 2025" / "5 Jan 2025" / "05/01/2025" (hari/bulan/tahun)
+    PATTERN_DATE_TEXT = re.compile(r"\b(\d{1,2})\s+([A-Za-z]{3,})\.?\s+(\d{4})\b")
+    PATTERN_DATE_NUMERIC = re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b")
+    MONTH_NUMBERS = {
+        **{name: i for i, name in enumerate(BULAN_ID, start=1)},
+        **{name[:3]: i for i, name in enumerate(BULAN_ID, start=1)},
+        "agt": 8, "ags": 8, "sept": 9, "nop": 11,
+    }
+
+    MAX_ISI_POKOK    = 10
+    MAX_POIN_PENTING = 8
+    MAX_DEADLINE     = 5
+    MAX_REGULASI     = 10
 
     @classmethod
     def extract(cls, text: str) -> NotaDinas:
         nd = NotaDinas()
         clean = cls._clean_text(text)
-
-        nd.nomor                = cls._extract_nomor(clean)
-        nd.kepada               = cls._extract_kepada(clean)
-        nd.dari                 = cls._extract_dari(clean)
-        nd.sifat                = cls._extract_sifat(clean)
-        nd.lampiran             = cls._extract_lampiran(clean)
-        nd.hal                  = cls._extract_hal(clean)
-        nd.tanggal              = cls._extract_tanggal(clean)
-        nd.isi_pokok            = cls._extract_isi_pokok(clean)
-        nd.poin_penting         = cls._extract_poin_penting(clean)
-        nd.deadline             = cls._extract_deadline(clean)
-        nd.referensi_regulasi   = cls._extract_regulasi(clean)
-        nd.penandatangan        = cls._extract_penandatangan(clean)
-        nd.jabatan_penandatangan = cls._extract_jabatan_ttd(clean)
-        nd.tembusan             = cls._extract_tembusan(clean)
-        nd.unit_asal            = cls._extract_unit_asal(clean, nd.dari)
-        nd.jenis_dokumen        = cls._detect_jenis(clean)
+        seg = cls.segment(clean)
+        fields = seg.fields
+
+        nd.nomor                = cls._extract_nomor(seg.header)
+        nd.kepada               = cls._extract_kepada(fields)
+        nd.dari                 = cls._extract_dari(fields)
+        nd.sifat                = cls._extract_sifat(fields)
+        nd.lampiran             = cls._extract_lampiran(fields)
+        nd.hal                  = cls._extract_hal(fields)
+        nd.tanggal              = cls._extract_tanggal(fields)
+        nd.isi_pokok            = cls._extract_isi_pokok(seg)
+        nd.poin_penting         = cls._extract_poin_penting(seg.body)
+        deadlines               = cls._extract_deadline(seg.body)
+        nd.deadline             = [raw for raw, _ in deadlines]
+        nd.deadline_iso         = [d.isoformat() if d else None for _, d in deadlines]
+        nd.referensi_regulasi   = cls._extract_regulasi(fields.get("hal", "") + "\n" + seg.body)
+        nd.penandatangan        = cls._extract_penandatangan(seg.footer)
+        nd.jabatan_penandatangan = cls._extract_jabatan_ttd(seg.footer)
+        nd.tembusan             = cls._extract_tembusan(seg.footer)
+        nd.unit_asal            = cls._extract_unit_asal(seg.header, nd.dari)
+        nd.jenis_dokumen        = cls._detect_jenis(seg.header)
 
         return nd
 
+    @classmethod
+    def extract_many(
+        cls,
+        items: Iterable[tuple[Any, str]],
+        max_workers: int = 4,
+        executor: Executor | None = None,
+        chunk_size: int = 16,
+        ordered: bool = False,
+    ) -> Iterator[tuple[Any, dict | None, str | None]]:
+        """
+        Ekstrak banyak Nota Dinas secara paralel. `items` berisi
+        (kunci, teks) dan boleh berupa generator; hasil (kunci, dict
+        to_dict, error) di-yield per item.
+
+        Teks dikirim per `chunk_size` item agar overhead antar-proses kecil
+        bila `executor` berupa ProcessPoolExecutor; tanpa `executor` dipakai
+        thread pool sendiri. Paling banyak 2 × max_workers potongan berjalan
+        sekaligus sehingga input besar tidak dimuat semuanya ke memori.
+        Dengan `ordered=True` hasil mengikuti urutan input, selain itu
+        sesuai urutan selesai.
+        """
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        iterator = iter(items)
+        pending: deque = deque()
+        max_pending = max(1, max_workers) * 2
+
+        def submit_next() -> bool:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return False
+            keys = [key for key, _ in chunk]
+            texts = [text for _, text in chunk]
+            pending.append((executor.submit(_extract_chunk, texts), keys))
+            return True
+
+        def results(future, keys) -> Iterator[tuple[Any, dict | None, str | None]]:
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                outcomes = [(None, str(e))] * len(keys)
+            for key, (data, error) in zip(keys, outcomes):
+                yield key, data, error
+
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    exhausted = not submit_next()
+                if not pending:
+                    break
+
+                if ordered:
+                    future, keys = pending.popleft()
+                    yield from results(future, keys)
+                    continue
+
+                wait([f for f, _ in pending], return_when=FIRST_COMPLETED)
+                for entry in [e for e in pending if e[0].done()]:
+                    pending.remove(entry)
+                    yield from results(*entry)
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def parse_tanggal(cls, value: str) -> date | None:
+        """Tanggal Indonesia (nama bulan atau dd/mm/yyyy) → date; None bila tak valid."""
+        m = cls.PATTERN_DATE_TEXT.search(value)
+        if m:
+            month = cls.MONTH_NUMBERS.get(m.group(2).lower())
+            if month:
+                day, year = int(m.group(1)), int(m.group(3))
+            else:
+                m = None
+        if not m:
+            m = cls.PATTERN_DATE_NUMERIC.search(value)
+            if not m:
+                return None
+            day, month, year = (int(g) for g in m.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    # ── Segmentasi ───────────────────────────────────────────────
+
+    @classmethod
+    def segment(cls, text: str) -> NotaDinasSegments:
+        """
+        Pecah teks (sudah dibersihkan) menjadi header/body/footer dengan
+        satu scan label header + satu pencarian penanda footer. Tanpa
+        blok Tanggal, seluruh teks sebelum footer dianggap header sekaligus
+        body agar field global tetap ditemukan.
+        """
+        first: dict[str, re.Match] = {}
+        later: dict[str, list[int]] = {}
+        for m in cls.PATTERN_HEADER_LABEL.finditer(text):
+            label = m.group(1).lower()
+            if label not in first:
+                first[label] = m
+            later.setdefault(label, []).append(m.start())
+
+        fields: dict[str, str] = {}
+        for name, ends in cls.HEADER_FIELD_ENDS.items():
+            start = first.get(name)
+            if start is None:
+                continue
+            stop = min(
+                (pos for label in ends for pos in later.get(label, ())
+                 if pos >= start.end()),
+                default=None,
+            )
+            if stop is not None:
+                fields[name] = text[start.end():stop].strip()
+
+        header_end = None
+        tanggal = first.get("tanggal")
+        if tanggal is not None:
+            line = cls.PATTERN_LINE_VALUE.match(text, tanggal.end())
+            if line:
+                fields["tanggal"] = line.group(1).strip()
+                header_end = line.end()
+
+        body_start = header_end or 0
+        footer_start = len(text)
+        m = cls.PATTERN_FOOTER.search(text, body_start)
+        if m:
+            footer_start = m.start()
+            if not m.group(0).lower().startswith(("demikian", "tembusan")):
+                for _ in range(cls.FOOTER_LOOKBACK_LINES):
+                    nl = text.rfind("\n", body_start, footer_start - 1)
+                    if nl < 0:
+                        break
+                    footer_start = nl + 1
+
+        return NotaDinasSegments(
+            header=text[:header_end] if header_end is not None else text[:footer_start],
+            body=text[body_start:footer_start],
+            footer=text[footer_start:],
+            fields=fields,
+            has_header=header_end is not None,
+        )
+
     # ── Helpers ──────────────────────────────────────────────────
 
-    @staticmethod
-    def _clean_text(text: str) -> str:
+    @classmethod
+    def _clean_text(cls, text: str) -> str:
         # Normalisasi whitespace berlebih
-        text = re.sub(r"\r\n", "\n", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r"[ \t]+", " ", text)
+        text = cls.RE_CRLF.sub("\n", text)
+        text = cls.RE_BLANK_LINES.sub("\n\n", text)
+        text = cls.RE_SPACES.sub(" ", text)
         return text.strip()
 
     @classmethod
-    def _extract_nomor(cls, text: str) -> str:
-        m = cls.PATTERN_NOMOR.search(text)
+    def _extract_nomor(cls, header: str) -> str:
+        m = cls.PATTERN_NOMOR.search(header)
         return m.group(1).strip() if m else ""
 
     @classmethod
-    def _extract_kepada(cls, text: str) -> list[str]:
-        m = cls.PATTERN_KEPADA.search(text)
-        if not m:
+    def _extract_kepada(cls, fields: dict[str, str]) -> list[str]:
+        if "yth" not in fields:
             return []
-        raw = m.group(1).strip()
+        raw = fields["yth"]
         # Split by numbering pattern: "1.", "2.", dll
-        items = re.split(r"\n?\s*\d+\.\s+", raw)
+        items = cls.RE_NUMBERED_SPLIT.split(raw)
         result = []
         for item in items:
             item = item.strip()
             if item and len(item) > 3:
                 result.append(item)
-        return result if result else [raw.strip()]
+        return result if result else [raw]
 
     @classmethod
-    def _extract_dari(cls, text: str) -> str:
-        m = cls.PATTERN_DARI.search(text)
-        if not m:
-            return ""
-        return re.sub(r"\s+", " ", m.group(1)).strip()
+    def _extract_dari(cls, fields: dict[str, str]) -> str:
+        return cls.RE_WHITESPACE.sub(" ", fields.get("dari", "")).strip()
 
     @classmethod
-    def _extract_sifat(cls, text: str) -> str:
-        m = cls.PATTERN_SIFAT.search(text)
-        if not m:
-            return ""
-        return m.group(1).strip().split("\n")[0].strip()
+    def _extract_sifat(cls, fields: dict[str, str]) -> str:
+        return fields.get("sifat", "").split("\n")[0].strip()
 
     @classmethod
-    def _extract_lampiran(cls, text: str) -> str:
-        m = cls.PATTERN_LAMPIRAN.search(text)
-        if not m:
-            return ""
-        return m.group(1).strip().split("\n")[0].strip()
+    def _extract_lampiran(cls, fields: dict[str, str]) -> str:
+        return fields.get("lampiran", "").split("\n")[0].strip()
 
     @classmethod
-    def _extract_hal(cls, text: str) -> str:
-        m = cls.PATTERN_HAL.search(text)
-        if not m:
-            return ""
-        return re.sub(r"\s+", " ", m.group(1)).strip()
+    def _extract_hal(cls, fields: dict[str, str]) -> str:
+        return cls.RE_WHITESPACE.sub(" ", fields.get("hal", "")).strip()
 
     @classmethod
-    def _extract_tanggal(cls, text: str) -> str:
-        m = cls.PATTERN_TANGGAL.search(text)
-        if not m:
-            return ""
-        return m.group(1).strip()
+    def _extract_tanggal(cls, fields: dict[str, str]) -> str:
+        return fields.get("tanggal", "")
 
     @classmethod
-    def _extract_isi_pokok(cls, text: str) -> list[str]:
-        """Ekstrak paragraf isi setelah blok header."""
-        # Cari body setelah 'Tanggal : ...'
-        split = re.split(r"Tanggal\s*[.:]\s*.+?\n", text, maxsplit=1)
-        if len(split) < 2:
+    def _extract_isi_pokok(cls, seg: NotaDinasSegments) -> list[str]:
+        """Ekstrak paragraf isi (body setelah blok header, sebelum penutup)."""
+        if not seg.has_header:
             return []
 
-        body = split[1].strip()
-        # Ambil paragraf sebelum tembusan/tanda tangan
-        body = re.split(r"\nTembusan\s*:", body, maxsplit=1)[0]
-        body = re.split(r"Demikian\s+(?:kami\s+)?disampaikan", body, maxsplit=1)[0]
-
         # Split per nomor poin
-        paragraphs = re.split(r"\n(?=\d+\.)", body)
+        paragraphs = cls.RE_PARAGRAPH.split(seg.body.strip())
         result = []
         for p in paragraphs:
-            p = re.sub(r"\s+", " ", p).strip()
+            p = cls.RE_WHITESPACE.sub(" ", p).strip()
             if len(p) > 20:
                 result.append(p)
-        return result[:10]  # max 10 poin
+                if len(result) == cls.MAX_ISI_POKOK:
+                    break
+        return result
 
     @classmethod
-    def _extract_poin_penting(cls, text: str) -> list[str]:
+    def _extract_poin_penting(cls, body: str) -> list[str]:
         """Ekstrak poin tindakan/action item."""
-        poin = []
-
-        # Cari kalimat yang mengandung kata kerja tindakan
-        action_keywords = [
-            "mohon", "diminta", "agar", "diharapkan", "harus",
-            "wajib", "perlu", "segera", "melakukan", "menyampaikan",
-            "melaksanakan", "memperhatikan", "berkoordinasi",
-        ]
-        sentences = re.split(r"[.;]\s*", text)
-        for sent in sentences:
-            sent = sent.strip()
-            if len(sent) < 20:
+        poin: list[str] = []
+        seen: set[str] = set()
+
+        # Satu scan Aho–Corasick untuk semua kata kerja tindakan, lalu
+        # petakan posisi kemunculan ke kalimat (dipisah "." / ";")
+        hits = iter(keyword_rules.action_words.iter_matches(body))
+        hit = next(hits, None)
+        start = 0
+        for sep in [*cls.RE_SENTENCE.finditer(body), None]:
+            end = sep.start() if sep else len(body)
+            while hit is not None and hit.start < start:
+                hit = next(hits, None)
+            has_action = hit is not None and hit.end <= end
+            sent = body[start:end].strip()
+            start = sep.end() if sep else len(body)
+
+            if not has_action or len(sent) < 20:
                 continue
-            sent_lower = sent.lower()
-            if any(kw in sent_lower for kw in action_keywords):
-                clean = re.sub(r"\s+", " ", sent).strip()
-                if len(clean) > 20 and clean not in poin:
-                    poin.append(clean)
+            clean = cls.RE_WHITESPACE.sub(" ", sent).strip()
+            if len(clean) > 20 and clean not in seen:
+                seen.add(clean)
+                poin.append(clean)
+                if len(poin) == cls.MAX_POIN_PENTING:
+                    break
 
-        return poin[:8]
+        return poin
 
     @classmethod
-    def _extract_deadline(cls, text: str) -> list[str]:
-        matches = cls.PATTERN_DEADLINE.findall(text)
+    def _extract_deadline(cls, body: str) -> list[tuple[str, date | None]]:
+        """
+        Deadline (teks asli, tanggal) urut dari yang paling awal; tanggal
+        yang sama dalam format berbeda dihitung sekali, teks yang tidak
+        bisa di-parse diletakkan di akhir.
+        """
+        matches = cls.PATTERN_DEADLINE.findall(body)
         # Juga cari pola "tanggal DD Bulan YYYY"
-        extra = re.findall(
-            r"\b(\d{1,2}\s+(?:" + "|".join(cls.BULAN_ID.keys()) + r")\s+\d{4})\b",
-            text, re.IGNORECASE
-        )
-        all_dates = list(set(matches + extra))
-        return all_dates[:5]
+        extra = cls.PATTERN_TANGGAL_BULAN.findall(body)
+
+        found: dict[object, tuple[str, date | None]] = {}
+        for raw in matches + extra:
+            parsed = cls.parse_tanggal(raw)
+            found.setdefault(parsed or raw, (raw, parsed))
+        ordered = sorted(found.values(), key=lambda item: (item[1] is None, item[1] or date.max))
+        return ordered[:cls.MAX_DEADLINE]
 
     @classmethod
     def _extract_regulasi(cls, text: str) -> list[str]:
-        matches = cls.PATTERN_REGULASI.findall(text)
         seen = set()
         result = []
-        for m in matches:
-            clean = re.sub(r"\s+", " ", m).strip()
+        for m in cls.PATTERN_REGULASI.finditer(text):
+            clean = cls.RE_WHITESPACE.sub(" ", m.group(0)).strip()
             if clean not in seen and len(clean) > 10:
                 seen.add(clean)
                 result.append(clean)
-        return result[:10]
+                if len(result) == cls.MAX_REGULASI:
+                    break
+        return result
 
     @classmethod
-    def _extract_penandatangan(cls, text: str) -> str:
-        m = cls.PATTERN_PENANDATANGAN.search(text)
+    def _extract_penandatangan(cls, footer: str) -> str:
+        m = cls.PATTERN_PENANDATANGAN.search(footer)
         if m:
             return m.group(1).strip()
         # Fallback: nama setelah "elektronik"
-        fallback = re.search(
-            r"elektronik\s*\n\s*([\w\s.]+?)(?:\n|Tembusan)",
-            text, re.IGNORECASE
-        )
+        fallback = cls.PATTERN_PENANDATANGAN_FALLBACK.search(footer)
         return fallback.group(1).strip() if fallback else ""
 
     @classmethod
-    def _extract_jabatan_ttd(cls, text: str) -> str:
+    def _extract_jabatan_ttd(cls, footer: str) -> str:
         # Cari jabatan sebelum TTD
-        patterns = [
-            r"((?:Plt\.|Pjs\.)?\s*(?:Kepala|Direktur|Sekretaris|Inspektur)"
-            r"[\w\s,./]+?)\s*\n\s*(?:u\.b\.|Ditandatangani)",
-            r"(Sekretaris Jenderal[\s\S]{0,50}?u\.b\.\s*\n\s*[\w\s]+)",
-        ]
-        for pat in patterns:
-            m = re.search(pat, text, re.IGNORECASE)
+        for pattern in cls.PATTERNS_JABATAN_TTD:
+            m = pattern.search(footer)
             if m:
-                return re.sub(r"\s+", " ", m.group(1)).strip()
+                return cls.RE_WHITESPACE.sub(" ", m.group(1)).strip()
         return ""
 
     @classmethod
-    def _extract_tembusan(cls, text: str) -> list[str]:
-        m = cls.PATTERN_TEMBUSAN.search(text)
+    def _extract_tembusan(cls, footer: str) -> list[str]:
+        m = cls.PATTERN_TEMBUSAN.search(footer)
         if not m:
             return []
         raw = m.group(1).strip()
         lines = [ln.strip() for ln in raw.split("\n") if ln.strip()]
         result = []
         for ln in lines:
-            ln = re.sub(r"^\d+\.\s*", "", ln).strip()
+            ln = cls.RE_NUMBER_PREFIX.sub("", ln).strip()
             if ln and len(ln) > 3:
                 result.append(ln)
         return result
 
     @classmethod
-    def _extract_unit_asal(cls, text: str, dari: str) -> str:
+    def _extract_unit_asal(cls, header: str, dari: str) -> str:
         # Ambil dari field "Dari" jika ada
         if dari:
             return dari
 
         # Fallback: cari nama unit dari header dokumen
-        lines = text.split("\n")[:10]
+        lines = header.split("\n", 10)[:10]
         for line in lines:
             line = line.strip()
             if any(kw in line.upper() for kw in
@@ -313,17 +514,9 @@ class NotaDinasExtractor:
         return ""
 
     @classmethod
-    def _detect_jenis(cls, text: str) -> str:
-        text_upper = text.upper()
-        if "NOTA DINAS" in text_upper:
-            return "Nota Dinas"
-        elif "SURAT EDARAN" in text_upper:
-            return "Surat Edaran"
-        elif "SURAT KEPUTUSAN" in text_upper:
-            return "Surat Keputusan"
-        elif "INSTRUKSI" in text_upper:
-            return "Instruksi"
-        return "Surat Dinas"
+    def _detect_jenis(cls, header: str) -> str:
+        # Penanda jenis dokumen dalam satu scan; prioritas = urutan aturan
+        return keyword_rules.document_types.best_label([header]) or "Surat Dinas"
 
     @classmethod
     def to_dict(cls, nd: NotaDinas) -> dict:
@@ -338,10 +531,23 @@ class NotaDinasExtractor:
             "isi_pokok":              nd.isi_pokok,
             "poin_penting":           nd.poin_penting,
             "deadline":               nd.deadline,
+            "deadline_iso":           nd.deadline_iso,
             "referensi_regulasi":     nd.referensi_regulasi,
             "penandatangan":          nd.penandatangan,
             "jabatan_penandatangan":  nd.jabatan_penandatangan,
             "tembusan":               nd.tembusan,
             "unit_asal":              nd.unit_asal,
             "jenis_dokumen":          nd.jenis_dokumen,
-        }
\ No newline at end of file
+        }
+
+
+def _extract_chunk(texts: list[str]) -> list[tuple[dict | None, str | None]]:
+    """Worker extract_many (level modul agar bisa di-pickle ke proses lain)."""
+    outcomes: list[tuple[dict | None, str | None]] = []
+    for text in texts:
+        try:
+            nd = NotaDinasExtractor.extract(text)
+            outcomes.append((NotaDinasExtractor.to_dict(nd), None))
+        except Exception as e:
+            outcomes.append((None, str(e)))
+    return outcomes
@@ -0,0 +1,236 @@
+import traceback
+from datetime import date
+
+from sqlalchemy import and_, func
+from sqlalchemy import text as sql_text
+from sqlalchemy.orm import load_only, selectinload
+
+from models import db
+from models.document import Document
+from models.nota_dinas import (
+    NotaDinasDeadline,
+    NotaDinasParty,
+    NotaDinasRecord,
+    NotaDinasRegulation,
+)
+from services.nota_dinas_extractor import NotaDinasExtractor
+
+
+class NotaDinasStore:
+    """
+    Penyimpanan struktur Nota Dinas ter-normalisasi (tabel nota_dinas +
+    child rows). Ekstraksi dijalankan sekali saat dokumen disimpan;
+    query berikutnya cukup memakai indeks, tanpa ekstraksi ulang.
+    """
+
+    # Filter teks (substring, case-insensitive) → kolom NotaDinasRecord.
+    # ILIKE '%x%' tidak bisa memakai b-tree; di PostgreSQL dilayani indeks
+    # GIN trigram (lihat setup)
+    TEXT_FILTERS = {
+        "dari":  NotaDinasRecord.dari,
+        "unit":  NotaDinasRecord.unit_asal,
+        "hal":   NotaDinasRecord.hal,
+    }
+
+    @staticmethod
+    def build(text: str, nd_dict: dict | None = None) -> NotaDinasRecord:
+        """Record dari hasil ekstraksi yang sudah ada, atau ekstrak dari teks."""
+        if nd_dict is None:
+            nd_dict = NotaDinasExtractor.to_dict(NotaDinasExtractor.extract(text))
+        return NotaDinasRecord.from_dict(nd_dict, NotaDinasExtractor.parse_tanggal)
+
+    @classmethod
+    def attach(cls, doc: Document) -> str | None:
+        """
+        Ekstrak struktur Nota Dinas dari teks dokumen (di server, bukan dari
+        data klien) dan pasang sebelum commit. Kegagalan ekstraksi tidak
+        menggagalkan penyimpanan dokumen; pesan error dikembalikan agar
+        bisa dilaporkan ke klien (None bila berhasil).
+        """
+        try:
+            doc.nota_dinas = cls.build(doc.original_text)
+        except Exception as e:
+            traceback.print_exc()
+            return f"Ekstraksi Nota Dinas gagal: {e}"
+        return None
+
+    @classmethod
+    def setup(cls) -> bool:
+        """
+        PostgreSQL: indeks GIN trigram (pg_trgm) untuk filter ILIKE
+        dari/unit/hal, menggantikan indeks b-tree yang tidak terpakai.
+        Dipanggil setelah db.create_all(). Return False bila tidak dibuat
+        (bukan PostgreSQL, atau ekstensi pg_trgm tidak bisa dipasang).
+        """
+        if db.session.get_bind().dialect.name != "postgresql":
+            return False
+        try:
+            db.session.execute(sql_text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for column in ("dari", "unit_asal"):
+                db.session.execute(sql_text(f"DROP INDEX IF EXISTS ix_nota_dinas_{column}"))
+            for column in ("dari", "unit_asal", "hal"):
+                db.session.execute(sql_text(
+                    f"CREATE INDEX IF NOT EXISTS ix_nota_dinas_{column}_trgm "
+                    f"ON nota_dinas USING GIN ({column} gin_trgm_ops)"
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            traceback.print_exc()
+            return False
+        return True
+
+    @classmethod
+    def backfill(cls, batch_size: int = 200) -> int:
+        """Ekstrak dokumen lama yang belum punya baris nota_dinas. Return jumlahnya."""
+        done = 0
+        while True:
+            docs = db.session.execute(
+                db.select(Document)
+                .options(load_only(Document.id, Document.original_text))
+                .outerjoin(NotaDinasRecord)
+                .where(NotaDinasRecord.id.is_(None))
+                .order_by(Document.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not docs:
+                return done
+            for doc in docs:
+                try:
+                    doc.nota_dinas = cls.build(doc.original_text)
+                except Exception:
+                    traceback.print_exc()
+                    # Tetap buat baris kosong agar tidak diproses berulang
+                    doc.nota_dinas = NotaDinasRecord()
+            db.session.commit()
+            done += len(docs)
+
+    @staticmethod
+    def _contains(column, value: str):
+        """ILIKE '%value%' dengan % dan _ dari input diperlakukan literal."""
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return column.ilike(f"%{escaped}%", escape="\\")
+
+    @classmethod
+    def query(cls, filters: dict, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Cari Nota Dinas tersimpan. Filter: nomor, jenis (persis); dari,
+        unit, hal, kepada, tembusan, regulasi (substring); tanggal_from/to,
+        deadline_from/to (date, inklusif).
+        """
+        conditions = []
+        if filters.get("nomor"):
+            conditions.append(NotaDinasRecord.nomor == filters["nomor"])
+        if filters.get("jenis"):
+            conditions.append(NotaDinasRecord.jenis_dokumen == filters["jenis"])
+        for key, column in cls.TEXT_FILTERS.items():
+            if filters.get(key):
+                conditions.append(cls._contains(column, filters[key]))
+        for role in ("kepada", "tembusan"):
+            if filters.get(role):
+                conditions.append(NotaDinasRecord.parties.any(and_(
+                    NotaDinasParty.role == role,
+                    cls._contains(NotaDinasParty.name, filters[role]),
+                )))
+        if filters.get("regulasi"):
+            conditions.append(NotaDinasRecord.regulations.any(
+                cls._contains(NotaDinasRegulation.reference, filters["regulasi"])
+            ))
+        if filters.get("tanggal_from"):
+            conditions.append(NotaDinasRecord.tanggal >= filters["tanggal_from"])
+        if filters.get("tanggal_to"):
+            conditions.append(NotaDinasRecord.tanggal <= filters["tanggal_to"])
+        if filters.get("deadline_from") or filters.get("deadline_to"):
+            due = []
+            if filters.get("deadline_from"):
+                due.append(NotaDinasDeadline.due_date >= filters["deadline_from"])
+            if filters.get("deadline_to"):
+                due.append(NotaDinasDeadline.due_date <= filters["deadline_to"])
+            conditions.append(NotaDinasRecord.deadlines.any(and_(*due)))
+
+        total = db.session.execute(
+            db.select(func.count(NotaDinasRecord.id)).where(*conditions)
+        ).scalar()
+
+        records = db.session.execute(
+            db.select(NotaDinasRecord)
+            .where(*conditions)
+            .options(
+                selectinload(NotaDinasRecord.parties),
+                selectinload(NotaDinasRecord.regulations),
+                selectinload(NotaDinasRecord.deadlines),
+                selectinload(NotaDinasRecord.document).load_only(
+                    *Document.columns_for(Document.LIST_FIELDS)
+                ),
+            )
+            .order_by(NotaDinasRecord.tanggal.desc().nulls_last(),
+                      NotaDinasRecord.id.desc())
+            .limit(limit)
+            .offset(offset)
+        ).scalars().all()
+
+        return {
+            "total":   total,
+            "limit":   limit,
+            "offset":  offset,
+            "results": [{
+                "document":   r.document.to_dict(Document.LIST_FIELDS),
+                "nota_dinas": r.to_dict(),
+            } for r in records],
+        }
+
+    @staticmethod
+    def deadlines(start: date, end: date | None = None, unit: str | None = None,
+                  limit: int = 50, offset: int = 0) -> dict:
+        """
+        Deadline dalam rentang [start, end] dari tabel nota_dinas_deadlines
+        (range scan indeks due_date), urut dari yang paling dekat.
+        """
+        conditions = [NotaDinasDeadline.due_date >= start]
+        if end is not None:
+            conditions.append(NotaDinasDeadline.due_date <= end)
+        if unit:
+            conditions.append(NotaDinasStore._contains(NotaDinasRecord.unit_asal, unit))
+
+        total = db.session.execute(
+            db.select(func.count(NotaDinasDeadline.id))
+            .join(NotaDinasRecord, NotaDinasDeadline.nota_dinas_id == NotaDinasRecord.id)
+            .where(*conditions)
+        ).scalar()
+
+        rows = db.session.execute(
+            db.select(
+                NotaDinasDeadline.due_date, NotaDinasDeadline.raw,
+                NotaDinasRecord.document_id, NotaDinasRecord.nomor,
+                NotaDinasRecord.hal, NotaDinasRecord.dari, NotaDinasRecord.unit_asal,
+                Document.filename,
+            )
+            .join(NotaDinasRecord, NotaDinasDeadline.nota_dinas_id == NotaDinasRecord.id)
+            .join(Document, Document.id == NotaDinasRecord.document_id)
+            .where(*conditions)
+            .order_by(NotaDinasDeadline.due_date, NotaDinasDeadline.id)
+            .limit(limit)
+            .offset(offset)
+        ).mappings().all()
+
+        return {
+            "from":    start.isoformat(),
+            "to":      end.isoformat() if end else None,
+            "total":   total,
+            "limit":   limit,
+            "offset":  offset,
+            "results": [{
+                "tanggal":     r["due_date"].isoformat(),
+                "raw":         r["raw"],
+                "document_id": r["document_id"],
+                "filename":    r["filename"],
+                "nomor":       r["nomor"] or "",
+                "hal":         r["hal"] or "",
+                "dari":        r["dari"] or "",
+                "unit_asal":   r["unit_asal"] or "",
+            } for r in rows],
+        }
+
+
+def parse_iso_date(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
@@ -0,0 +1,403 @@
+import html
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from nltk.stem import PorterStemmer
+from sqlalchemy import text as sql_text
+from sqlalchemy.orm import load_only
+
+from models import db
+from models.document import Document
+from services.nlp_models import NLPModels
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Penanda sorotan ts_headline (karakter private-use) → diganti <b> setelah escape
+HEADLINE_START, HEADLINE_STOP = "\ue000", "\ue001"
+HEADLINE_OPTIONS = (
+    f"MaxFragments=2, MaxWords=30, MinWords=10, "
+    f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}"
+)
+_porter = PorterStemmer()
+
+
+class IndonesianStemmer:
+    """
+    Stemmer Bahasa Indonesia ringan berbasis aturan (varian sederhana
+    Nazief-Adriani): buang partikel, kata ganti milik, akhiran, lalu awalan.
+    """
+
+    PARTICLES = ("lah", "kah", "tah", "pun")
+    POSSESSIVES = ("nya", "ku", "mu")
+    SUFFIXES = ("kan", "an", "i")
+    PREFIXES = (
+        "meng", "meny", "mem", "men", "me",
+        "peng", "peny", "pem", "pen", "per", "pe",
+        "ber", "be", "ter", "te", "di", "ke", "se",
+    )
+    MIN_ROOT = 3
+
+    @classmethod
+    def stem(cls, word: str) -> str:
+        for group in (cls.PARTICLES, cls.POSSESSIVES, cls.SUFFIXES):
+            for suffix in group:
+                if word.endswith(suffix) and len(word) - len(suffix) >= cls.MIN_ROOT + 1:
+                    word = word[: -len(suffix)]
+                    break
+        for prefix in cls.PREFIXES:
+            if word.startswith(prefix) and len(word) - len(prefix) >= cls.MIN_ROOT:
+                root = word[len(prefix):]
+                # meny-/peny- meluluhkan "s": menyampaikan → sampai
+                if prefix in ("meny", "peny"):
+                    root = "s" + root
+                return root
+        return word
+
+
+def analyze_terms(text: str) -> list[str]:
+    """Tokenisasi + stemming Indonesia & Inggris untuk indeks/query."""
+    try:
+        stop_words = NLPModels.stopwords()
+    except Exception:
+        stop_words = frozenset()
+
+    terms: list[str] = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if len(token) < 2 or token in stop_words:
+            continue
+        if token.isdigit():
+            terms.append(token)
+            continue
+        id_stem = IndonesianStemmer.stem(token)
+        en_stem = _porter.stem(token)
+        terms.append(id_stem)
+        if en_stem != id_stem:
+            terms.append(en_stem)
+    return terms
+
+
+def _document_text(doc) -> str:
+    return " ".join(filter(None, [doc.original_text, doc.summary, " ".join(doc.keywords or [])]))
+
+
+def make_snippet(text: str, terms: list[str], width: int = 80) -> str:
+    """
+    Potongan teks (HTML) di sekitar kemunculan pertama salah satu term.
+    Term berupa stem, jadi sorotan diperluas ke seluruh kata
+    (anggar → <b>anggaran</b>); teks dokumen di-escape sebelum diberi tag.
+    """
+    best = None
+    for term in terms:
+        m = re.search(r"\w*" + re.escape(term) + r"\w*", text, re.IGNORECASE)
+        if m and (best is None or m.start() < best.start()):
+            best = m
+    if best is None:
+        snippet = html.escape(text[: width * 2].strip())
+        return snippet + ("..." if len(text) > width * 2 else "")
+
+    start = max(0, best.start() - width)
+    end = min(len(text), best.end() + width)
+    snippet = (
+        html.escape(text[start:best.start()])
+        + "<b>" + html.escape(best.group(0)) + "</b>"
+        + html.escape(text[best.end():end])
+    )
+    snippet = re.sub(r"\s+", " ", snippet).strip()
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+
+
+def headline_html(headline: str | None) -> str:
+    """Hasil ts_headline → HTML aman: escape teks, lalu penanda jadi <b>."""
+    return (
+        html.escape(headline or "")
+        .replace(HEADLINE_START, "<b>")
+        .replace(HEADLINE_STOP, "</b>")
+    )
+
+
+class InvertedIndex:
+    """
+    Indeks terbalik in-memory dengan ranking BM25. Fallback untuk
+    SQLite/test; dibangun dari tabel documents saat pencarian pertama
+    dan diperbarui lewat add()/remove().
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self.postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self.doc_terms: dict[int, list[str]] = {}
+        self.doc_len: dict[int, int] = {}
+        self.meta: dict[int, dict] = {}
+        self.total_len = 0
+
+    def ensure_built(self) -> None:
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            query = db.select(Document).options(load_only(
+                Document.id, Document.original_text, Document.summary,
+                Document.keywords, Document.sentiment, Document.file_type,
+                Document.created_at,
+            )).execution_options(yield_per=500)
+            for doc in db.session.execute(query).scalars():
+                self._add(doc)
+            self._built = True
+
+    def add(self, doc) -> None:
+        with self._lock:
+            if not self._built:
+                return  # akan dimuat saat ensure_built
+            self._remove(doc.id)
+            self._add(doc)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add(self, doc) -> None:
+        counts = Counter(analyze_terms(_document_text(doc)))
+        for term, tf in counts.items():
+            self.postings[term][doc.id] = tf
+        length = sum(counts.values())
+        self.doc_terms[doc.id] = list(counts)
+        self.doc_len[doc.id] = length
+        self.total_len += length
+        self.meta[doc.id] = {
+            "sentiment":  doc.sentiment,
+            "file_type":  doc.file_type,
+            "created_at": doc.created_at,
+        }
+
+    def _remove(self, doc_id: int) -> None:
+        for term in self.doc_terms.pop(doc_id, []):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_len -= self.doc_len.pop(doc_id, 0)
+        self.meta.pop(doc_id, None)
+
+    def search(self, query: str, filters: dict, limit: int, offset: int) -> tuple[list[tuple[int, float]], int, list[str]]:
+        self.ensure_built()
+        terms = list(dict.fromkeys(analyze_terms(query)))
+        with self._lock:
+            n_docs = len(self.doc_len)
+            if not terms or not n_docs:
+                return [], 0, terms
+            avg_len = self.total_len / n_docs
+
+            scores: dict[int, float] = defaultdict(float)
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    if not self._matches(self.meta[doc_id], filters):
+                        continue
+                    norm = tf + self.K1 * (1 - self.B + self.B * self.doc_len[doc_id] / avg_len)
+                    scores[doc_id] += idf * tf * (self.K1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], -kv[0]))
+        return ranked[offset: offset + limit], len(ranked), terms
+
+    @staticmethod
+    def _matches(meta: dict, filters: dict) -> bool:
+        if filters.get("sentiment") and meta["sentiment"] != filters["sentiment"]:
+            return False
+        if filters.get("file_type") and meta["file_type"] != filters["file_type"]:
+            return False
+        created_at = meta["created_at"]
+        if filters.get("date_from") and (created_at is None or created_at < filters["date_from"]):
+            return False
+        if filters.get("date_to") and (created_at is None or created_at >= filters["date_to"]):
+            return False
+        return True
+
+
+class SearchIndex:
+    """
+    Pencarian full-text atas dokumen tersimpan.
+
+    - PostgreSQL: indeks GIN atas ekspresi tsvector (konfigurasi
+      SEARCH_TS_CONFIGS, default indonesian + english), ranking ts_rank,
+      cuplikan ts_headline. Indeks dipelihara otomatis oleh database.
+      Hanya SEARCH_INDEX_MAX_CHARS karakter awal original_text yang
+      diindeks agar tsvector tidak melewati batas 1MB PostgreSQL.
+    - Lainnya (SQLite/test): InvertedIndex in-memory.
+    """
+
+    def __init__(self):
+        self.ts_configs: list[str] = ["indonesian", "english"]
+        self.max_chars = 100_000
+        self.backend = "memory"
+        self.memory = InvertedIndex()
+
+    def init_app(self, app) -> None:
+        configs = app.config.get("SEARCH_TS_CONFIGS", "indonesian,english")
+        self.ts_configs = [
+            c.strip() for c in configs.split(",") if re.fullmatch(r"[a-z_]+", c.strip())
+        ] or ["simple"]
+        self.max_chars = max(1, int(app.config.get("SEARCH_INDEX_MAX_CHARS", self.max_chars)))
+        app.extensions["search_index"] = self
+
+    def setup(self) -> None:
+        """Pilih backend sesuai dialect; dipanggil setelah db.create_all()."""
+        if db.engine.dialect.name == "postgresql":
+            self.backend = "postgres"
+            self._create_pg_index()
+
+    # ── Pemeliharaan indeks (hanya relevan untuk backend memori) ──
+
+    def add(self, doc) -> None:
+        if self.backend == "memory":
+            self.memory.add(doc)
+
+    def remove(self, doc_id: int) -> None:
+        if self.backend == "memory":
+            self.memory.remove(doc_id)
+
+    # ── Query ─────────────────────────────────────────────────────
+
+    def search(self, query: str, filters: dict | None = None,
+               limit: int = 20, offset: int = 0) -> dict:
+        filters = filters or {}
+        if self.backend == "postgres":
+            results, total = self._search_pg(query, filters, limit, offset)
+        else:
+            results, total = self._search_memory(query, filters, limit, offset)
+        return {"query": query, "total": total, "results": results,
+                "backend": self.backend}
+
+    def _search_memory(self, query, filters, limit, offset):
+        ranked, total, terms = self.memory.search(query, filters, limit, offset)
+        if not ranked:
+            return [], total
+
+        ids = [doc_id for doc_id, _ in ranked]
+        docs = {
+            d.id: d for d in Document.query.options(load_only(
+                Document.id, Document.filename, Document.original_text,
+                Document.sentiment, Document.file_type, Document.created_at,
+            )).filter(Document.id.in_(ids))
+        }
+        results = []
+        for doc_id, score in ranked:
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
+            results.append({
+                **doc.to_dict(Document.LIST_FIELDS),
+                "rank":    round(score, 4),
+                "snippet": make_snippet(doc.original_text, terms),
+            })
+        return results, total
+
+    # ── PostgreSQL ───────────────────────────────────────────────
+
+    def _vector_sql(self) -> str:
+        body = (
+            f"left(coalesce(original_text, ''), {self.max_chars}) || ' ' "
+            "|| coalesce(summary, '') || ' ' || coalesce(keywords::text, '')"
+        )
+        return " || ".join(f"to_tsvector('{c}', {body})" for c in self.ts_configs)
+
+    def _query_sql(self) -> str:
+        return " || ".join(
+            f"websearch_to_tsquery('{c}', :q)" for c in self.ts_configs
+        )
+
+    def _create_pg_index(self) -> None:
+        # Nama indeks memuat batas karakter: ekspresi harus sama persis dengan
+        # query agar indeks terpakai. Indeks lama tanpa batas dibuang.
+        try:
+            db.session.execute(sql_text("DROP INDEX IF EXISTS ix_documents_fts"))
+            db.session.execute(sql_text(
+                f"CREATE INDEX IF NOT EXISTS ix_documents_fts_{self.max_chars} "
+                f"ON documents USING GIN (({self._vector_sql()}))"
+            ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _search_pg(self, query, filters, limit, offset):
+        conditions = [f"({self._vector_sql()}) @@ ({self._query_sql()})"]
+        params: dict = {"q": query, "limit": limit, "offset": offset}
+        for key, clause in (
+            ("sentiment", "sentiment = :sentiment"),
+            ("file_type", "file_type = :file_type"),
+            ("date_from", "created_at >= :date_from"),
+            ("date_to",   "created_at < :date_to"),
+        ):
+            if filters.get(key):
+                conditions.append(clause)
+                params[key] = filters[key]
+        where = " AND ".join(conditions)
+
+        total = db.session.execute(
+            sql_text(f"SELECT count(*) FROM documents WHERE {where}"), params
+        ).scalar()
+
+        # ts_headline mahal → hanya dihitung untuk baris hasil LIMIT
+        params["headline_options"] = HEADLINE_OPTIONS
+        rows = db.session.execute(sql_text(f"""
+            SELECT hit.id, hit.filename, hit.sentiment, hit.file_type, hit.created_at,
+                   hit.rank,
+                   ts_headline('{self.ts_configs[0]}', d.original_text,
+                               {self._query_sql()},
+                               :headline_options) AS snippet
+            FROM (
+                SELECT id, filename, sentiment, file_type, created_at,
+                       ts_rank(({self._vector_sql()}), ({self._query_sql()})) AS rank
+                FROM documents
+                WHERE {where}
+                ORDER BY rank DESC, id DESC
+                LIMIT :limit OFFSET :offset
+            ) AS hit
+            JOIN documents d ON d.id = hit.id
+            ORDER BY hit.rank DESC, hit.id DESC
+        """), params).mappings().all()
+
+        results = [{
+            "id":         r["id"],
+            "filename":   r["filename"],
+            "sentiment":  r["sentiment"],
+            "file_type":  r["file_type"],
+            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "rank":       round(float(r["rank"]), 4),
+            "snippet":    headline_html(r["snippet"]),
+        } for r in rows]
+        return results, total
+
+
+def parse_date(value: str | None, end: bool = False) -> datetime | None:
+    """
+    Tanggal/waktu ISO → datetime naive UTC (seperti created_at).
+    Dengan `end`, tanggal tanpa jam menjadi awal hari berikutnya agar
+    batas atas eksklusif tetap mencakup seluruh hari itu.
+    ValueError bila format tidak valid.
+    """
+    if not value:
+        return None
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    return datetime.combine(day + timedelta(days=1) if end else day, datetime.min.time())
+
+
+search_index = SearchIndex()
@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    LRU dibatasi jumlah entri, dengan counter hit/miss (thread-safe).
+    max_entries 0 = nonaktif: get() selalu None, put() diabaikan.
+    Nilai None tidak bisa disimpan (dipakai sebagai tanda miss).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        if not self.max_entries:
+            return None
+        with self._lock:
+            value = self._lru.get(key)
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._lru.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key, value) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            self._evict()
+
+    def resize(self, max_entries: int) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries":     len(self._lru),
+                "max_entries": self.max_entries,
+                "hit_rate":    round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def _evict(self) -> None:
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._stats["evictions"] += 1
+
+
+class SentenceCache:
+    """
+    Memo hasil NLP per kalimat, dipakai bersama oleh semua request di satu
+    proses (worker process pool punya cache sendiri).
+
+    Nota Dinas banyak berisi kalimat baku ("Demikian kami sampaikan...",
+    kop, blok tanda tangan) yang sama persis antar dokumen; POS tag dan
+    hasil ne_chunk kalimat itu cukup dihitung sekali.
+
+    - tags   : digest kalimat → POS tag (token, tag) per token
+    - chunks : digest kalimat → entitas (teks, label, posisi dalam kalimat)
+    - lemmas : kata → lemma (kata pendek, langsung jadi kunci)
+    """
+
+    def __init__(self, max_sentences: int = 20000, max_lemmas: int = 50000):
+        self.tags   = LRUCache(max_sentences)
+        self.chunks = LRUCache(max_sentences)
+        self.lemmas = LRUCache(max_lemmas)
+
+    def init_app(self, app) -> None:
+        self.configure(
+            app.config.get("SENTENCE_CACHE_SIZE", self.tags.max_entries),
+            app.config.get("LEMMA_CACHE_SIZE", self.lemmas.max_entries),
+        )
+        app.extensions["sentence_cache"] = self
+
+    def configure(self, max_sentences: int, max_lemmas: int) -> None:
+        self.tags.resize(max_sentences)
+        self.chunks.resize(max_sentences)
+        self.lemmas.resize(max_lemmas)
+
+    def settings(self) -> tuple[int, int]:
+        """Argumen configure() untuk initializer worker process."""
+        return self.tags.max_entries, self.lemmas.max_entries
+
+    @staticmethod
+    def key(sentence: str) -> bytes:
+        """Digest 128-bit kalimat: kunci berukuran tetap, bukan teks kalimat."""
+        return hashlib.blake2b(sentence.encode("utf-8"), digest_size=16).digest()
+
+    def clear(self) -> None:
+        for cache in (self.tags, self.chunks, self.lemmas):
+            cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            "tags":   self.tags.stats(),
+            "chunks": self.chunks.stats(),
+            "lemmas": self.lemmas.stats(),
+        }
+
+
+sentence_cache = SentenceCache()
@@ -0,0 +1,209 @@
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class _Staged:
+    size: int
+    expires_at: float
+    data: dict | None = None      # tier memori
+    path: str | None = None       # tier disk (file JSON)
+
+
+class StagingStore:
+    """
+    Hasil upload yang menunggu /api/save atau /api/regenerate, disimpan di
+    server dengan token berumur pendek agar klien tidak perlu mengirim
+    ulang full_text.
+
+    - Memori: dibatasi total byte (ukuran JSON); bila terlampaui, entri
+      tertua dipindah ke disk.
+    - Disk: file JSON di `folder`, dibatasi total byte; entri tertua dibuang.
+    - TTL: entri kedaluwarsa dibuang setiap kali store diakses.
+
+    Token hanya dikenal proses yang membuatnya (sama seperti job_queue).
+    """
+
+    FILE_PREFIX = "staged_"
+
+    def __init__(self, ttl_seconds: int = 3600,
+                 max_memory_bytes: int = 64 * 1024 * 1024,
+                 max_disk_bytes: int = 1024 * 1024 * 1024,
+                 folder: str | None = None):
+        self.ttl_seconds      = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes   = max_disk_bytes
+        self.folder           = folder
+        self._entries: OrderedDict[str, _Staged] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes   = 0
+        self._lock = threading.Lock()
+        self._stats = {"staged": 0, "spilled": 0, "expired": 0, "evicted": 0}
+
+    def init_app(self, app) -> None:
+        self.ttl_seconds      = app.config.get("STAGING_TTL_SECONDS", self.ttl_seconds)
+        self.max_memory_bytes = app.config.get("STAGING_MAX_MEMORY_BYTES", self.max_memory_bytes)
+        self.max_disk_bytes   = app.config.get("STAGING_MAX_DISK_BYTES", self.max_disk_bytes)
+        self.folder           = app.config.get("STAGING_FOLDER") or os.path.join(
+            app.config["UPLOAD_FOLDER"], "staging"
+        )
+        os.makedirs(self.folder, exist_ok=True)
+        self._remove_stale_files()
+        app.extensions["staging_store"] = self
+
+    # ── API ──────────────────────────────────────────────────────
+
+    def put(self, data: dict) -> tuple[str, float] | None:
+        """Simpan hasil; return (token, expires_at) atau None bila terlalu besar."""
+        token = secrets.token_urlsafe(24)
+        return self._store(token, data)
+
+    def get(self, token: str) -> dict | None:
+        self._expire()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry.data is not None:
+                return dict(entry.data)
+            path = entry.path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except OSError:
+            # Sudah dibuang oleh thread lain di antara lock & baca
+            return None
+
+    def update(self, token: str, data: dict) -> float | None:
+        """Ganti isi entri yang masih ada; return expires_at baru."""
+        self._expire()
+        with self._lock:
+            if token not in self._entries:
+                return None
+        staged = self._store(token, data)
+        return staged[1] if staged else None
+
+    def discard(self, token: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(token, None)
+            if entry is not None:
+                self._release(entry)
+        return entry is not None
+
+    def stats(self) -> dict:
+        self._expire()
+        with self._lock:
+            on_disk = sum(1 for e in self._entries.values() if e.path)
+            return {
+                **self._stats,
+                "entries":      len(self._entries),
+                "on_disk":      on_disk,
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes":   self._disk_bytes,
+                "ttl_seconds":  self.ttl_seconds,
+            }
+
+    # ── Internal ─────────────────────────────────────────────────
+
+    def _store(self, token: str, data: dict) -> tuple[str, float] | None:
+        self._expire()
+        raw = json.dumps(data, ensure_ascii=False)
+        size = len(raw.encode("utf-8"))
+        if size > self.max_memory_bytes and size > self.max_disk_bytes:
+            return None
+
+        expires_at = time.time() + self.ttl_seconds
+        entry = _Staged(size=size, expires_at=expires_at)
+        if size > self.max_memory_bytes:
+            entry.path = self._write(raw)
+        else:
+            entry.data = data
+
+        with self._lock:
+            old = self._entries.pop(token, None)
+            if old is not None:
+                self._release(old)
+            self._entries[token] = entry
+            if entry.path:
+                self._disk_bytes += size
+            else:
+                self._memory_bytes += size
+            self._stats["staged"] += 1
+            self._spill()
+            self._evict_disk()
+        return token, expires_at
+
+    def _spill(self) -> None:
+        """Pindahkan entri memori tertua ke disk sampai di bawah batas (lock dipegang)."""
+        for entry in self._entries.values():
+            if self._memory_bytes <= self.max_memory_bytes:
+                return
+            if entry.data is None:
+                continue
+            try:
+                entry.path = self._write(json.dumps(entry.data, ensure_ascii=False))
+            except OSError:
+                traceback.print_exc()
+                return
+            entry.data = None
+            self._memory_bytes -= entry.size
+            self._disk_bytes   += entry.size
+            self._stats["spilled"] += 1
+
+    def _evict_disk(self) -> None:
+        """Buang entri disk tertua sampai di bawah batas (lock dipegang)."""
+        while self._disk_bytes > self.max_disk_bytes:
+            token = next((t for t, e in self._entries.items() if e.path), None)
+            if token is None:
+                return
+            self._release(self._entries.pop(token))
+            self._stats["evicted"] += 1
+
+    def _expire(self) -> None:
+        now = time.time()
+        with self._lock:
+            expired = [t for t, e in self._entries.items() if e.expires_at < now]
+            for token in expired:
+                self._release(self._entries.pop(token))
+            self._stats["expired"] += len(expired)
+
+    def _release(self, entry: _Staged) -> None:
+        if entry.path:
+            self._disk_bytes -= entry.size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        else:
+            self._memory_bytes -= entry.size
+
+    def _write(self, raw: str) -> str:
+        os.makedirs(self.folder or tempfile.gettempdir(), exist_ok=True)
+        fd, path = tempfile.mkstemp(
+            prefix=self.FILE_PREFIX, suffix=".json",
+            dir=self.folder or tempfile.gettempdir(),
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(raw)
+        return path
+
+    def _remove_stale_files(self) -> None:
+        """File staging proses lama yang sudah melewati TTL (token-nya hilang)."""
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if name.startswith(self.FILE_PREFIX) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+staging_store = StagingStore()
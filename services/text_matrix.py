@@ -0,0 +1,155 @@
+import math
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import mul
+
+
+@dataclass
+class SentenceTermMatrix:
+    """
+    Matriks jumlah kemunculan kalimat × term dalam format CSR berbasis
+    `array` (tanpa NumPy/SciPy). Baris i = kalimat i; kolom = id term di
+    `terms`. Dibangun sekali per dokumen lalu dipakai untuk semua skema
+    skor ringkasan.
+    """
+    terms: list[str] = field(default_factory=list)
+    vocab: dict[str, int] = field(default_factory=dict)
+    indptr: array = field(default_factory=lambda: array("l", [0]))
+    indices: array = field(default_factory=lambda: array("l"))
+    data: array = field(default_factory=lambda: array("l"))
+
+    @classmethod
+    def build(cls, sentences: list[list[str]], stop_words: frozenset,
+              min_len: int = 3) -> "SentenceTermMatrix":
+        """
+        `sentences` berisi token lowercase per kalimat. Term valid:
+        alfabet, bukan stopword, panjang >= min_len.
+        """
+        matrix = cls()
+        # Urutan kemunculan pertama agar id term deterministik
+        for token in dict.fromkeys(chain.from_iterable(sentences)):
+            if token.isalpha() and len(token) >= min_len and token not in stop_words:
+                matrix.vocab[token] = len(matrix.terms)
+                matrix.terms.append(token)
+
+        lookup = matrix.vocab.get
+        for tokens in sentences:
+            row: dict[int, int] = {}
+            for j in map(lookup, tokens):
+                if j is not None:
+                    row[j] = row.get(j, 0) + 1
+            matrix.indices.extend(row.keys())
+            matrix.data.extend(row.values())
+            matrix.indptr.append(len(matrix.indices))
+        return matrix
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.terms)
+
+    def row(self, i: int) -> tuple[array, array]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def column_sums(self) -> list[int]:
+        """Frekuensi total tiap term di seluruh dokumen."""
+        sums = [0] * self.n_terms
+        for j, count in zip(self.indices, self.data):
+            sums[j] += count
+        return sums
+
+    def document_frequency(self) -> list[int]:
+        """Jumlah kalimat yang memuat tiap term."""
+        df = [0] * self.n_terms
+        for j in self.indices:
+            df[j] += 1
+        return df
+
+    def row_sums(self) -> list[int]:
+        return [sum(self.data[self.indptr[i]:self.indptr[i + 1]]) for i in range(self.n_rows)]
+
+    def matvec(self, weights) -> list:
+        """Skor kalimat = C · w (satu perkalian matriks–vektor)."""
+        getter = weights.__getitem__
+        indptr, indices, data = self.indptr, self.indices, self.data
+        return [
+            sum(map(mul, data[indptr[i]:indptr[i + 1]],
+                    map(getter, indices[indptr[i]:indptr[i + 1]])))
+            for i in range(self.n_rows)
+        ]
+
+    # ── Skema skor kalimat ──────────────────────────────────────
+
+    def frequency_scores(self) -> list[int]:
+        """
+        Skor frekuensi kata (metode default NLPAnalyzer.summarize) dalam
+        bilangan bulat: sum(count × freq); pembagian dengan max_freq
+        tidak mengubah urutan sehingga dilewati.
+        """
+        return self.matvec(self.column_sums())
+
+    def tfidf_scores(self) -> list[float]:
+        """Rata-rata TF-IDF term per kalimat (kalimat = dokumen untuk IDF)."""
+        n = self.n_rows
+        idf = [math.log((1 + n) / (1 + df)) + 1.0 for df in self.document_frequency()]
+        totals = self.row_sums()
+        return [
+            score / total if total else 0.0
+            for score, total in zip(self.matvec(idf), totals)
+        ]
+
+    def _term_totals(self, row_weights: list[float]) -> list[float]:
+        """Cᵀ·v pada matriks biner: jumlah bobot baris yang memuat tiap term."""
+        totals = [0.0] * self.n_terms
+        indptr, indices = self.indptr, self.indices
+        for i, w in enumerate(row_weights):
+            if w:
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    totals[j] += w
+        return totals
+
+    def textrank_scores(self, damping: float = 0.85, iterations: int = 30,
+                        tolerance: float = 1e-6) -> list[float]:
+        """
+        TextRank dengan bobot sisi cosine biner antar kalimat
+        (|Si ∩ Sj| / sqrt(|Si|·|Sj|)). Graf tidak pernah dibentuk:
+        W = R·B·Bᵀ·R − diag, sehingga tiap iterasi cukup dua perkalian
+        matriks jarang — O(nnz), bukan O(kalimat²).
+        """
+        n = self.n_rows
+        if n == 0:
+            return []
+
+        indptr, indices = self.indptr, self.indices
+        sizes = [indptr[i + 1] - indptr[i] for i in range(n)]
+        norm = [1.0 / math.sqrt(size) if size else 0.0 for size in sizes]
+
+        def neighbours(x: list[float]) -> list[float]:
+            # (W·x)_b = r_b·(Σ_{t∈b} U_t − l_b·x_b·r_b), U = Bᵀ(R·x)
+            totals = self._term_totals([xi * ri for xi, ri in zip(x, norm)])
+            getter = totals.__getitem__
+            return [
+                norm[b] * (sum(map(getter, indices[indptr[b]:indptr[b + 1]]))
+                           - sizes[b] * x[b] * norm[b])
+                for b in range(n)
+            ]
+
+        out_weight = neighbours([1.0] * n)
+        scores = [1.0 / n] * n
+        base = (1.0 - damping) / n
+        for _ in range(iterations):
+            share = [
+                damping * s / w if w > 1e-12 else 0.0
+                for s, w in zip(scores, out_weight)
+            ]
+            new = [base + v for v in neighbours(share)]
+            delta = sum(abs(x - y) for x, y in zip(new, scores))
+            scores = new
+            if delta < tolerance:
+                break
+        return scores
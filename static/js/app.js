@@ -209,7 +209,7 @@ $(function () {
 
     // Step 1: Upload & ekstrak teks
     $.ajax({
-      url: "/api/upload",
+      url: "/api/upload?full_text=1",
       method: "POST",
       data: fd,
       processData: false,
@@ -440,7 +440,7 @@ $(function () {
     $("#savedDocInfo").addClass("hidden");
 
     $.ajax({
-      url: "/api/upload",
+      url: "/api/upload?full_text=1",
       method: "POST",
       data: fd,
       processData: false,
@@ -525,26 +525,32 @@ $(function () {
   /* ════ SAVE ════ */
   function saveDocument(analysis, callback) {
     if (!analysis) return showToast("Tidak ada data.", "warning");
+    const payload = {
+      filename:      analysis.filename,
+      summary:       analysis.summary,
+      keywords:      analysis.keywords,
+      entities:      analysis.entities,
+      sentiment:     analysis.sentiment,
+      enriched_info: analysis.enriched_info,
+      file_type:     analysis.file_type,
+    };
+    // Teks penuh sudah di-staging di server: cukup kirim tokennya
+    if (analysis.staging_token) payload.staging_token = analysis.staging_token;
+    else payload.full_text = analysis.full_text;
+
     $.ajax({
       url: "/api/save",
       method: "POST",
       contentType: "application/json",
-      data: JSON.stringify({
-        filename:      analysis.filename,
-        full_text:     analysis.full_text,
-        summary:       analysis.summary,
-        keywords:      analysis.keywords,
-        entities:      analysis.entities,
-        sentiment:     analysis.sentiment,
-        enriched_info: analysis.enriched_info,
-        file_type:     analysis.file_type,
-      }),
+      data: JSON.stringify(payload),
       success: function (res) {
         savedDocId = res.document.id;
         currentAnalysis.doc_id = savedDocId;
+        currentAnalysis.staging_token = null;
         $("#savedDocId").text(savedDocId);
         $("#savedDocInfo").removeClass("hidden");
         showToast(`✅ Dokumen disimpan (ID: ${savedDocId})`, "success");
+        if (res.nota_dinas_error) showToast(res.nota_dinas_error, "error");
         if (callback) callback(res);
       },
       error: function (xhr) {
@@ -564,18 +570,24 @@ $(function () {
     const text = $("#rawTextArea").val().trim();
     if (!text) return showToast("Teks kosong.", "warning");
     showToast("🔄 Menganalisis ulang...", "info");
+    const payload = {
+      filename:      currentAnalysis?.filename || "unknown",
+      doc_id:        docId || null,
+      staging_token: currentAnalysis?.staging_token || null,
+    };
+    // Teks hanya dikirim ulang bila diedit (atau tidak ada di staging)
+    if (text !== currentAnalysis?.full_text || !payload.staging_token) {
+      payload.full_text = text;
+    }
+
     $.ajax({
       url: "/api/regenerate",
       method: "POST",
       contentType: "application/json",
-      data: JSON.stringify({
-        full_text: text,
-        filename:  currentAnalysis?.filename || "unknown",
-        doc_id:    docId || null,
-      }),
+      data: JSON.stringify(payload),
       timeout: 120000,
       success: function (res) {
-        currentAnalysis = { ...currentAnalysis, ...res };
+        currentAnalysis = { ...currentAnalysis, ...res, full_text: text };
         renderResult(currentAnalysis);
         showToast("✅ Generate ulang selesai!", "success");
       },
@@ -586,17 +598,8 @@ $(function () {
   }
 
   /* ════ HISTORY ════ */
-  function loadHistory() {
-    $("#historyLoading").removeClass("hidden");
-    $("#historyEmpty").addClass("hidden");
-    $("#historyList").empty().addClass("hidden");
-
-    $.get("/api/documents", function (res) {
-      const docs = res.documents || [];
-      $("#historyLoading").addClass("hidden");
-      if (!docs.length) { $("#historyEmpty").removeClass("hidden"); return; }
-
-      $("#historyList").html(docs.map(doc => `
+  function historyItem(doc) {
+    return `
         <div class="flex items-center gap-4 px-5 py-4 rounded-xl border border-slate-100
                     bg-white hover:border-sky-200 hover:shadow-sm transition-all">
           <div class="w-10 h-10 rounded-xl bg-sky-50 flex items-center justify-center shrink-0">
@@ -615,15 +618,43 @@ $(function () {
             <button class="btn-secondary text-xs py-1.5 px-3 btn-view-doc" data-id="${doc.id}">👁 Detail</button>
             <button class="btn-danger text-xs py-1.5 px-3 btn-delete-doc" data-id="${doc.id}">🗑</button>
           </div>
-        </div>`
-      ).join("")).removeClass("hidden");
+        </div>`;
+  }
+
+  /* cursor kosong = halaman pertama; selain itu tambahkan ke daftar */
+  function loadHistory(cursor) {
+    if (!cursor) {
+      $("#historyLoading").removeClass("hidden");
+      $("#historyEmpty").addClass("hidden");
+      $("#historyList").empty().addClass("hidden");
+    }
+
+    $.get("/api/documents", cursor ? { cursor } : {}, function (res) {
+      const docs = res.documents || [];
+      $("#historyLoading").addClass("hidden");
+      $("#btnHistoryMore").remove();
+      if (!cursor && !docs.length) { $("#historyEmpty").removeClass("hidden"); return; }
+
+      $("#historyList").append(docs.map(historyItem).join("")).removeClass("hidden");
+
+      if (res.next_cursor) {
+        $("#historyList").append(`
+          <button id="btnHistoryMore" class="btn-secondary text-xs py-2 w-full"
+                  data-cursor="${res.next_cursor}">
+            Muat lebih banyak (${$(".btn-view-doc").length} dari ${res.total})
+          </button>`);
+      }
     }).fail(() => {
       $("#historyLoading").addClass("hidden");
       showToast("Gagal memuat riwayat.", "error");
     });
   }
 
-  $("#btnRefreshHistory").on("click", loadHistory);
+  $(document).on("click", "#btnHistoryMore", function () {
+    loadHistory($(this).data("cursor"));
+  });
+
+  $("#btnRefreshHistory").on("click", () => loadHistory());
 
   $(document).on("click", ".btn-view-doc", function () {
     $.get(`/api/documents/${$(this).data("id")}`, function (doc) {
@@ -0,0 +1,91 @@
+import re
+
+import pytest
+from nltk import Tree
+
+from services.nlp_models import NLPModels
+from services.sentence_cache import sentence_cache
+
+
+class FakePunkt:
+    """Pemisah kalimat sederhana setelah . ! ? (pengganti data punkt)."""
+
+    def tokenize(self, text):
+        return [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s]
+
+
+class FakeTagger:
+    """Kata berhuruf kapital → NNP, lainnya NN (deterministik, tanpa data NLTK)."""
+
+    def tag_sents(self, sentences):
+        return [[(w, "NNP" if w[:1].isupper() else "NN") for w in s] for s in sentences]
+
+    def tag(self, tokens):
+        return self.tag_sents([tokens])[0]
+
+
+class FakeChunker:
+    """Setiap token NNP menjadi entitas GPE."""
+
+    def parse(self, tagged):
+        return [Tree("GPE", [(w, t)]) if t == "NNP" else (w, t) for w, t in tagged]
+
+
+class FakeLemmatizer:
+    def lemmatize(self, word, pos="n"):
+        return word
+
+
+@pytest.fixture
+def fake_models():
+    """Ganti model NLTK di registry dengan model palsu, pulihkan setelah test."""
+    models, errors = dict(NLPModels._models), dict(NLPModels._errors)
+    NLPModels._models.update(
+        punkt=FakePunkt(),
+        tagger=FakeTagger(),
+        ne_chunker=FakeChunker(),
+        lemmatizer=FakeLemmatizer(),
+        stopwords=frozenset({"di", "dan", "yang", "ke", "dari", "the", "of"}),
+    )
+    for name in ("punkt", "tagger", "ne_chunker", "lemmatizer", "stopwords"):
+        NLPModels._errors.pop(name, None)
+    sentence_cache.clear()
+    yield
+    NLPModels._models.clear()
+    NLPModels._models.update(models)
+    NLPModels._errors.clear()
+    NLPModels._errors.update(errors)
+    sentence_cache.clear()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, fake_models):
+    """Aplikasi dengan database SQLite sementara dan state service yang bersih."""
+    from config import Config
+    from models import db
+    from routes import document_routes
+    from services.analysis_cache import analysis_cache
+    from services.search_index import InvertedIndex, search_index
+
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    monkeypatch.setattr(Config, "STAGING_FOLDER", str(tmp_path / "staging"))
+    monkeypatch.setattr(Config, "NLP_PRELOAD_MODELS", False)
+    monkeypatch.setattr(Config, "ANALYSIS_BACKEND", "inline")
+    monkeypatch.setattr(Config, "ANALYSIS_CACHE_PERSIST", False)
+    monkeypatch.setattr(search_index, "memory", InvertedIndex())
+    monkeypatch.setitem(document_routes._document_count, "value", None)
+    analysis_cache.clear()
+
+    from app import create_app
+    application = create_app()
+    yield application
+    with application.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    analysis_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,32 @@
+from models import db
+from models.document import Document
+from services.analysis_cache import AnalysisCache
+
+
+def test_db_tier_does_not_touch_request_session(app):
+    cache = AnalysisCache()
+    cache.init_app(app)
+    cache.persist = True
+    with app.app_context():
+        pending = Document(filename="a.pdf", original_text="teks")
+        db.session.add(pending)
+
+        cache.put("k", {"summary": "s"})
+        db.session.rollback()
+
+        # Perubahan route yang belum di-commit ikut dibatalkan, entri cache tetap ada
+        assert db.session.query(Document).count() == 0
+        cache.clear()
+        assert cache.get("k") == {"summary": "s"}
+        assert cache.stats()["db_hits"] == 1
+
+
+def test_db_tier_overwrites_existing_key(app):
+    cache = AnalysisCache()
+    cache.init_app(app)
+    cache.persist = True
+    with app.app_context():
+        cache.put("k", {"summary": "lama"})
+        cache.put("k", {"summary": "baru"})
+        cache.clear()
+        assert cache.get("k") == {"summary": "baru"}
@@ -0,0 +1,69 @@
+import pytest
+
+from models import db
+from models.corpus_stats import CorpusTerm
+from models.document import Document
+from services.corpus_stats import CorpusStats, corpus_stats
+
+
+def _save(client, text: str) -> int:
+    response = client.post("/api/save", json={
+        "filename": "nota.pdf", "full_text": text, "summary": "", "keywords": [],
+        "entities": [], "sentiment": "Neutral",
+    })
+    assert response.status_code == 201
+    return response.get_json()["document"]["id"]
+
+
+def _df(term: str) -> int:
+    term_id = corpus_stats.vocab.get(term)
+    return corpus_stats.df[term_id] if term_id is not None else 0
+
+
+def _db_df(term: str) -> int:
+    return db.session.execute(
+        db.select(CorpusTerm.doc_count).where(CorpusTerm.term == term)
+    ).scalar() or 0
+
+
+class TestCorpusStats:
+
+    def test_save_and_delete_update_memory_and_db(self, app, client):
+        first = _save(client, "Laporan anggaran rapat koordinasi.")
+        _save(client, "Laporan pengadaan server jaringan.")
+
+        assert corpus_stats.n_docs == 2
+        assert (_df("laporan"), _df("anggaran"), _df("server")) == (2, 1, 1)
+
+        assert client.delete(f"/api/documents/{first}").status_code == 200
+
+        assert corpus_stats.n_docs == 1
+        assert (_df("laporan"), _df("anggaran")) == (1, 0)
+        with app.app_context():
+            assert (_db_df("laporan"), _db_df("anggaran")) == (1, 0)
+            # Statistik yang dimuat ulang dari database sama dengan di memori
+            reloaded = CorpusStats()
+            reloaded.load()
+            assert reloaded.n_docs == 1
+            assert reloaded.idf("laporan") == corpus_stats.idf("laporan")
+            assert "anggaran" not in reloaded.vocab
+
+    def test_rollback_leaves_statistics_unchanged(self, app):
+        stats = CorpusStats()
+        with app.app_context():
+            doc = Document(filename="nota.pdf", original_text="Laporan anggaran.")
+            db.session.add(doc)
+            terms = stats.stage_add(doc)
+            db.session.rollback()
+
+            assert sorted(terms) == ["anggaran", "laporan"]
+            assert _db_df("laporan") == 0
+            assert stats.n_docs == 0 and not stats.vocab
+
+    def test_idf_prefers_distinctive_terms(self):
+        stats = CorpusStats()
+        for terms in (["laporan", "anggaran"], ["laporan"], ["laporan", "server"]):
+            stats.apply(terms, 1)
+
+        assert stats.idf("laporan") < stats.idf("anggaran") < stats.idf("baru")
+        assert CorpusStats().idf("apa") == pytest.approx(1.0)
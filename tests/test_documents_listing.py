@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from models import db
+from models.document import Document
+
+
+@pytest.fixture
+def documents(app):
+    """7 dokumen; beberapa berbagi created_at agar id menjadi pemutus urutan."""
+    stamps = [datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 2),
+              datetime(2024, 1, 2), datetime(2024, 1, 3), datetime(2024, 1, 3),
+              datetime(2024, 1, 4)]
+    with app.app_context():
+        docs = [
+            Document(filename=f"nota{i}.pdf", original_text=f"teks {i}",
+                     keywords=["anggaran"] if i % 2 else ["rapat"], created_at=stamp)
+            for i, stamp in enumerate(stamps)
+        ]
+        db.session.add_all(docs)
+        db.session.commit()
+        return [(d.created_at, d.id) for d in docs]
+
+
+def _pages(client, query: str = "") -> list[list[int]]:
+    pages, cursor = [], None
+    while True:
+        url = f"/api/documents?limit=2{query}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        pages.append([d["id"] for d in body["documents"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+class TestKeysetCursor:
+
+    def test_pages_cover_all_documents_in_order(self, client, documents):
+        pages = _pages(client)
+
+        expected = [doc_id for _, doc_id in sorted(documents, reverse=True)]
+        assert [doc_id for page in pages for doc_id in page] == expected
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+    def test_cursor_with_filter(self, client, documents):
+        pages = _pages(client, "&keyword=anggaran")
+
+        ids = [doc_id for page in pages for doc_id in page]
+        assert len(ids) == 3
+        assert ids == sorted(ids, reverse=True)
+        assert client.get("/api/documents?keyword=anggaran").get_json()["total"] == 3
+
+    def test_invalid_cursor(self, client, documents):
+        response = client.get("/api/documents?cursor=bukan-cursor")
+
+        assert response.status_code == 400
@@ -0,0 +1,36 @@
+import pytest
+
+from services.nlp_analyzer import NER_MAX_ENTITIES, NLPAnalyzer
+
+
+class TestMergeEntities:
+
+    def test_dedupes_with_baseline_schema(self):
+        parts = [
+            [("Jakarta", "GPE", 0), ("Bandung", "GPE", 10)],
+            [("Jakarta", "GPE", 40), ("Jakarta", "PERSON", 50), (" ", "GPE", 60)],
+        ]
+
+        entities = NLPAnalyzer.merge_entities(parts)
+
+        assert [(e["text"], e["label"]) for e in entities] == [
+            ("Jakarta", "GPE"), ("Bandung", "GPE"), ("Jakarta", "PERSON"),
+        ]
+        assert set(entities[0]) == {"text", "label", "description"}
+
+    def test_cap_keeps_first_occurrences(self):
+        found = [(f"Kota{i}", "GPE", i) for i in range(NER_MAX_ENTITIES + 10)]
+
+        entities = NLPAnalyzer.merge_entities([found])
+
+        assert len(entities) == NER_MAX_ENTITIES
+        assert entities[-1]["text"] == f"Kota{NER_MAX_ENTITIES - 1}"
+
+
+@pytest.mark.usefixtures("fake_models")
+def test_full_document_entities():
+    text = " ".join(f"Rapat di Kota{i} selesai." for i in range(5))
+
+    entities = NLPAnalyzer.extract_entities(text)
+
+    assert [e["text"] for e in entities] == ["Rapat"] + [f"Kota{i}" for i in range(5)]
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from services.file_processor import FileProcessor
+
+
+@pytest.fixture
+def slow_extract(monkeypatch):
+    """extract_text palsu yang mencatat jumlah ekstraksi berjalan sekaligus."""
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def extract_text(source, ext):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        threading.Event().wait(0.002)
+        with lock:
+            state["running"] -= 1
+        return "" if source == b"kosong" else source.decode()
+
+    monkeypatch.setattr(FileProcessor, "extract_text", staticmethod(extract_text))
+    return state
+
+
+class TestExtractMany:
+
+    def test_bounded_window_over_generator(self, slow_extract):
+        pulled = []
+
+        def items():
+            for i in range(100):
+                pulled.append(i)
+                yield f"f{i}.pdf", f"teks {i}".encode(), "pdf"
+
+        results = FileProcessor.extract_many(items(), max_workers=2)
+        first = next(results)
+
+        # Hanya jendela 2 × max_workers yang sudah diambil dari generator
+        assert len(pulled) <= 2 * 2 + 1
+        rest = list(results)
+        assert sorted(r["index"] for r in [first, *rest]) == list(range(100))
+        assert slow_extract["peak"] <= 2
+
+    def test_ordered_results_and_errors(self, slow_extract):
+        items = [("a.pdf", b"satu", "pdf"), ("b.pdf", b"kosong", "pdf"), ("c.docx", b"tiga", "docx")]
+
+        results = list(FileProcessor.extract_many(items, max_workers=3, ordered=True))
+
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[0]["text"] == "satu"
+        assert "error" in results[1]
+        assert results[2]["file_type"] == "docx"
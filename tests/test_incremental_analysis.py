@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from services.nlp_analyzer import NLPAnalyzer
+
+PARAGRAPHS = [
+    "Sehubungan dengan Rapat Koordinasi di Jakarta, kami sampaikan laporan anggaran. "
+    "Laporan disusun oleh Biro Keuangan.",
+    "Kegiatan di Bandung berjalan dengan baik dan berhasil. "
+    "Realisasi anggaran meningkat dibanding tahun lalu.",
+    "Terdapat masalah pada pengadaan di Surabaya yang perlu ditindaklanjuti.",
+    "Demikian kami sampaikan, atas perhatian Bapak kami ucapkan terima kasih.",
+]
+
+
+def _text(paragraphs: list[str]) -> str:
+    return "\n\n".join(paragraphs)
+
+
+def _stored(paragraphs: list[dict]) -> list[dict]:
+    """Paragraf seperti dibaca kembali dari document_paragraphs (JSON)."""
+    return json.loads(json.dumps(paragraphs))
+
+
+@pytest.mark.usefixtures("fake_models")
+class TestIncrementalAnalysis:
+
+    def test_first_run_matches_full_analysis(self):
+        text = _text(PARAGRAPHS)
+
+        analysis, paragraphs, reused = NLPAnalyzer.incremental_analysis(text)
+
+        assert analysis == NLPAnalyzer.full_analysis(text)
+        assert reused == 0
+        assert len(paragraphs) == len(PARAGRAPHS)
+
+    def test_edit_reuses_unchanged_paragraphs(self):
+        _, paragraphs, _ = NLPAnalyzer.incremental_analysis(_text(PARAGRAPHS))
+
+        edited = list(PARAGRAPHS)
+        edited[2] = "Pengadaan di Medan selesai tepat waktu dan efektif."
+        text = _text(edited)
+
+        analysis, updated, reused = NLPAnalyzer.incremental_analysis(text, _stored(paragraphs))
+
+        assert analysis == NLPAnalyzer.full_analysis(text)
+        assert reused == len(PARAGRAPHS) - 1
+        assert [p["fingerprint"] for p in updated] == [
+            NLPAnalyzer.paragraph_fingerprint(p) for p in edited
+        ]
+
+    def test_inserted_and_reordered_paragraphs(self):
+        _, paragraphs, _ = NLPAnalyzer.incremental_analysis(_text(PARAGRAPHS))
+
+        edited = [PARAGRAPHS[1], "Tembusan kepada Sekretaris Jenderal di Jakarta.", PARAGRAPHS[0]]
+        text = _text(edited)
+
+        analysis, _, reused = NLPAnalyzer.incremental_analysis(text, _stored(paragraphs))
+
+        # Posisi entitas mengikuti letak baru paragraf yang dipakai ulang
+        assert analysis == NLPAnalyzer.full_analysis(text)
+        assert reused == 2
+
+    def test_unchanged_text_reuses_everything(self):
+        text = _text(PARAGRAPHS)
+        _, paragraphs, _ = NLPAnalyzer.incremental_analysis(text)
+
+        analysis, _, reused = NLPAnalyzer.incremental_analysis(text, _stored(paragraphs))
+
+        assert analysis == NLPAnalyzer.full_analysis(text)
+        assert reused == len(PARAGRAPHS)
+
+    def test_paragraph_without_entities_is_redone(self):
+        text = _text(PARAGRAPHS)
+        _, paragraphs, _ = NLPAnalyzer.incremental_analysis(text)
+        previous = _stored(paragraphs)
+        # NER paragraf ini tidak selesai pada analisis sebelumnya
+        previous[1]["entities"] = None
+
+        analysis, updated, reused = NLPAnalyzer.incremental_analysis(text, previous)
+
+        assert analysis == NLPAnalyzer.full_analysis(text)
+        assert reused == len(PARAGRAPHS) - 1
+        assert updated[1]["entities"] is not None
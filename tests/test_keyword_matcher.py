@@ -0,0 +1,38 @@
+from services.keyword_matcher import DEFAULT_RULES, AhoCorasick, KeywordRules, Match
+
+
+class TestAhoCorasick:
+
+    def test_reports_all_matches_with_positions(self):
+        matcher = AhoCorasick(DEFAULT_RULES["action_types_hal"])
+
+        matches = matcher.find_all("Profil Risiko unit")
+
+        assert Match(0, 13, "profil risiko", "profil_risiko") in matches
+        assert Match(7, 13, "risiko", "profil_risiko") in matches
+
+    def test_whole_word_rules(self):
+        matcher = AhoCorasick(DEFAULT_RULES["action_types_hal"], DEFAULT_RULES["whole_words"])
+
+        assert matcher.best_label(["Praktik baik di markas komando"]) is None
+        assert matcher.best_label(["Pengembangan TIK daerah"]) == "infrastruktur_tik"
+        assert matcher.best_label(["Penyusunan RKA-K/L 2025"]) == "rka_anggaran"
+        assert [m.start for m in matcher.find_all("rka, markas, (rka)")] == [0, 14]
+
+    def test_best_label_follows_rule_priority(self):
+        matcher = AhoCorasick(DEFAULT_RULES["action_types_hal"], DEFAULT_RULES["whole_words"])
+
+        # "anggaran" (prioritas 2) muncul lebih dulu dari "risiko" (prioritas 1)
+        assert matcher.best_label(["Anggaran mitigasi risiko"]) == "profil_risiko"
+        assert matcher.best_label(["Server dan anggaran", "tidak ada"]) == "rka_anggaran"
+
+
+class TestKeywordRules:
+
+    def test_overrides_replace_rule_lists(self):
+        rules = KeywordRules()
+        rules.configure({"action_words": ["tindaklanjuti"], "whole_words": []})
+
+        assert [m.keyword for m in rules.action_words.find_all("Mohon tindaklanjuti")] == ["tindaklanjuti"]
+        # Kunci yang tidak diganti tetap default; tanpa aturan kata utuh "tik" cocok di "praktik"
+        assert rules.action_types_hal.best_label(["praktik"]) == "infrastruktur_tik"
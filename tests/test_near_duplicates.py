@@ -0,0 +1,79 @@
+import pytest
+
+from services.minhash import MinHasher
+from services.near_duplicates import near_duplicates
+
+WORDS = (
+    "sehubungan dengan rapat koordinasi penyusunan rencana kerja dan anggaran "
+    "tahun berikutnya kami mohon seluruh unit kerja menyampaikan usulan kegiatan "
+    "beserta rincian kebutuhan biaya paling lambat akhir bulan ini agar dapat "
+    "dibahas bersama biro perencanaan dan biro keuangan sebelum diajukan kepada "
+    "pimpinan untuk mendapatkan persetujuan demikian kami sampaikan atas perhatian "
+    "dan kerja sama yang baik kami ucapkan terima kasih"
+).split()
+
+BASE = " ".join(WORDS)
+# Satu kata diganti: sebagian kecil shingle berubah
+EDITED = " ".join(WORDS[:30] + ["segera"] + WORDS[31:])
+# Separuh akhir berbeda
+HALF = " ".join(WORDS[:28] + [f"kata{i}" for i in range(28)])
+OTHER = "laporan pemeliharaan server dan jaringan kantor wilayah timur selesai tepat waktu"
+
+
+def _jaccard(a: str, b: str) -> float:
+    sa, sb = MinHasher.shingles(a), MinHasher.shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def _save(client, text: str) -> int:
+    response = client.post("/api/save", json={
+        "filename": "nota.pdf", "full_text": text, "summary": "", "keywords": [],
+        "entities": [], "sentiment": "Neutral",
+    })
+    assert response.status_code == 201
+    return response.get_json()["document"]["id"]
+
+
+class TestMinHasher:
+
+    def test_signature_is_stable_and_packable(self):
+        signature = MinHasher.signature(BASE)
+
+        assert signature == MinHasher.signature(BASE)
+        assert len(signature) == MinHasher.NUM_PERM
+        assert MinHasher.unpack(MinHasher.pack(signature)) == signature
+        assert MinHasher.signature("  ... ") is None
+
+    @pytest.mark.parametrize("other", [EDITED, HALF, OTHER])
+    def test_similarity_estimates_jaccard(self, other):
+        estimate = MinHasher.similarity(MinHasher.signature(BASE), MinHasher.signature(other))
+
+        assert estimate == pytest.approx(_jaccard(BASE, other), abs=0.15)
+
+
+class TestNearDuplicateIndex:
+
+    def test_find_respects_threshold(self, app, client):
+        doc_id = _save(client, BASE)
+        _save(client, OTHER)
+        edited = MinHasher.signature(EDITED)
+        similarity = MinHasher.similarity(MinHasher.signature(BASE), edited)
+        assert near_duplicates.threshold <= similarity < 1.0
+
+        with app.app_context():
+            assert [d["id"] for d in near_duplicates.find(edited)] == [doc_id]
+            assert near_duplicates.find(edited, threshold=1.0) == []
+            assert near_duplicates.find(MinHasher.signature(HALF)) == []
+            assert near_duplicates.find(edited, exclude_id=doc_id) == []
+
+    def test_similar_endpoint(self, client):
+        doc_id = _save(client, BASE)
+        copy_id = _save(client, EDITED)
+        _save(client, OTHER)
+
+        body = client.get(f"/api/documents/{doc_id}/similar").get_json()
+        strict = client.get(f"/api/documents/{doc_id}/similar?threshold=1.0").get_json()
+
+        assert [d["id"] for d in body["results"]] == [copy_id]
+        assert 0.8 <= body["results"][0]["similarity"] < 1.0
+        assert strict["results"] == []
@@ -0,0 +1,32 @@
+from services.nota_dinas_extractor import NotaDinasExtractor
+
+MEMO = """NOTA DINAS
+Nomor: ND-12/KU/2024
+Kepada: Kepala Biro Umum
+Dari: Kepala Bagian Keuangan
+Hal: Tindak lanjut Peraturan Menteri Keuangan Nomor 12/PMK.01/2023 Tahun 2023
+Tanggal: 5 Januari 2024
+
+1. Sehubungan dengan pelaksanaan kegiatan, mohon laporan disampaikan paling lambat 20 Januari 2024.
+2. Pedoman mengacu pada Keputusan Menteri Nomor 5 Tahun 2022
+3. Sehubungan dengan pelaksanaan kegiatan tahun berjalan, mohon dikoordinasikan.
+
+Demikian kami sampaikan.
+"""
+
+
+def test_regulation_reference_stops_at_end_of_line():
+    nd = NotaDinasExtractor.extract(MEMO)
+
+    assert nd.referensi_regulasi == [
+        "Peraturan Menteri Keuangan Nomor 12/PMK.01/2023 Tahun 2023",
+        "Keputusan Menteri Nomor 5 Tahun 2022",
+    ]
+
+
+def test_regulation_reference_in_body_paragraph():
+    refs = NotaDinasExtractor._extract_regulasi(
+        "Sesuai Undang-Undang Republik Indonesia Nomor 17 Tahun 2003\n1. Sehubungan dengan pelaksanaan kegiatan"
+    )
+
+    assert refs == ["Undang-Undang Republik Indonesia Nomor 17 Tahun 2003"]
@@ -0,0 +1,56 @@
+from models import db
+from models.nota_dinas import NotaDinasRecord
+from services.nota_dinas_store import NotaDinasStore
+
+MEMO = """NOTA DINAS
+NOMOR ND-12/KU/2024
+
+Yth. : Kepala Biro Umum
+Dari : Kepala Bagian Keuangan
+Sifat : Segera
+Hal : Laporan realisasi anggaran
+Tanggal : 5 Januari 2024
+
+1. Mohon laporan disampaikan paling lambat 20 Januari 2024.
+
+Demikian kami sampaikan.
+"""
+
+
+def _save(client, **extra) -> dict:
+    response = client.post("/api/save", json={
+        "filename": "nota.pdf", "full_text": MEMO, "summary": "", "keywords": [],
+        "entities": [], "sentiment": "Neutral", **extra,
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def test_save_extracts_from_text_not_client_payload(app, client):
+    body = _save(client, nota_dinas={"nomor": "PALSU-1", "dari": "Orang Lain"})
+
+    with app.app_context():
+        record = db.session.execute(
+            db.select(NotaDinasRecord).where(NotaDinasRecord.document_id == body["document"]["id"])
+        ).scalar_one()
+        assert record.nomor == "ND-12/KU/2024"
+        assert "Keuangan" in record.dari
+    assert "nota_dinas_error" not in body
+
+
+def test_save_reports_extraction_failure(client, monkeypatch):
+    def fail(text, nd_dict=None):
+        raise ValueError("format rusak")
+    monkeypatch.setattr(NotaDinasStore, "build", staticmethod(fail))
+
+    body = _save(client)
+
+    assert body["nota_dinas_error"] == "Ekstraksi Nota Dinas gagal: format rusak"
+
+
+def test_text_filters_treat_wildcards_literally(app, client):
+    _save(client)
+    with app.app_context():
+        assert NotaDinasStore.query({"dari": "Keuangan"})["total"] == 1
+        assert NotaDinasStore.query({"dari": "Bagian_Keuangan"})["total"] == 0
+        assert NotaDinasStore.query({"dari": "%"})["total"] == 0
@@ -0,0 +1,38 @@
+PARAGRAPHS = [
+    "Sehubungan dengan Rapat Koordinasi di Jakarta, kami sampaikan laporan anggaran.",
+    "Kegiatan di Bandung berjalan dengan baik dan berhasil.",
+    "Demikian kami sampaikan, atas perhatian Bapak kami ucapkan terima kasih.",
+]
+
+
+def _save(client, text: str) -> dict:
+    response = client.post("/api/save", json={
+        "filename": "nota.pdf", "full_text": text, "summary": "", "keywords": [],
+        "entities": [], "sentiment": "Neutral",
+    })
+    assert response.status_code == 201
+    return response.get_json()["document"]
+
+
+def test_first_regenerate_reuses_saved_paragraphs(client):
+    text = "\n\n".join(PARAGRAPHS)
+    # Upload → save: teks yang sama sudah ada di cache analisis
+    client.post("/api/regenerate", json={"full_text": text})
+    doc = _save(client, text)
+
+    response = client.post("/api/regenerate", json={"doc_id": doc["id"]})
+
+    assert response.status_code == 200
+    assert response.get_json()["incremental"] == {"paragraphs": 3, "reused": 3}
+
+
+def test_regenerate_after_edit_reanalyzes_changed_paragraph(client):
+    doc = _save(client, "\n\n".join(PARAGRAPHS))
+    edited = "\n\n".join([PARAGRAPHS[0], "Kegiatan di Medan ditunda.", PARAGRAPHS[2]])
+
+    first = client.post("/api/regenerate", json={"doc_id": doc["id"], "full_text": edited})
+    again = client.post("/api/regenerate", json={"doc_id": doc["id"], "full_text": edited})
+
+    assert first.get_json()["incremental"] == {"paragraphs": 3, "reused": 2}
+    assert again.get_json()["incremental"] == {"paragraphs": 3, "reused": 3}
+    assert "Medan" in {e["text"] for e in again.get_json()["entities"]}
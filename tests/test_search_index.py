@@ -0,0 +1,30 @@
+from services.search_index import HEADLINE_START, HEADLINE_STOP, headline_html, make_snippet
+
+
+class TestSnippet:
+
+    def test_document_text_is_escaped(self):
+        text = "Laporan <script>alert(1)</script> anggaran & realisasi"
+
+        snippet = make_snippet(text, ["anggar"])
+
+        assert "<script>" not in snippet
+        assert "&lt;script&gt;" in snippet
+        assert "&amp; realisasi" in snippet
+
+    def test_stem_highlights_whole_word(self):
+        snippet = make_snippet("Realisasi Anggaran tahun ini.", ["anggar"])
+
+        assert snippet == "Realisasi <b>Anggaran</b> tahun ini."
+
+    def test_earliest_word_wins(self):
+        snippet = make_snippet("Kegiatan pengadaan dan anggaran.", ["anggar", "ada"])
+
+        assert "<b>pengadaan</b>" in snippet
+        assert "<b>anggaran</b>" not in snippet
+
+    def test_headline_markers_become_tags(self):
+        headline = f"<i>x</i> {HEADLINE_START}anggaran{HEADLINE_STOP} ok"
+
+        assert headline_html(headline) == "&lt;i&gt;x&lt;/i&gt; <b>anggaran</b> ok"
+        assert headline_html(None) == ""
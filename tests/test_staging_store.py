@@ -0,0 +1,70 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from services import staging_store as staging_module
+from services.staging_store import StagingStore, staging_store
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Waktu palsu untuk services.staging_store (detik, bisa dimajukan)."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(staging_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StagingStore(ttl_seconds=60, max_memory_bytes=10_000, folder=str(tmp_path))
+
+
+class TestStagingExpiry:
+
+    def test_token_expires_after_ttl(self, store, clock):
+        token, expires_at = store.put({"full_text": "teks"})
+        assert expires_at == clock[0] + 60
+
+        clock[0] += 59
+        assert store.get(token) == {"full_text": "teks"}
+
+        clock[0] += 2
+        assert store.get(token) is None
+        assert store.stats()["expired"] == 1
+        assert store.stats()["memory_bytes"] == 0
+
+    def test_expired_disk_entry_removes_file(self, store, clock, tmp_path):
+        token, _ = store.put({"full_text": "x" * 20_000})
+        assert store.stats()["on_disk"] == 1
+        assert len(os.listdir(tmp_path)) == 1
+
+        clock[0] += 61
+        assert store.get(token) is None
+        assert os.listdir(tmp_path) == []
+        assert store.stats()["disk_bytes"] == 0
+
+    def test_update_extends_expiry(self, store, clock):
+        token, _ = store.put({"full_text": "teks"})
+
+        clock[0] += 50
+        assert store.update(token, {"full_text": "teks baru"}) == clock[0] + 60
+        clock[0] += 50
+        assert store.get(token) == {"full_text": "teks baru"}
+
+        clock[0] += 11
+        assert store.update(token, {"full_text": "lagi"}) is None
+
+
+def test_save_with_expired_token(client, clock):
+    token, _ = staging_store.put({
+        "filename": "nota.pdf", "full_text": "Laporan anggaran.", "summary": "",
+        "keywords": [], "entities": [], "sentiment": "Neutral",
+    })
+    clock[0] += staging_store.ttl_seconds + 1
+
+    save = client.post("/api/save", json={"staging_token": token})
+    regenerate = client.post("/api/regenerate", json={"staging_token": token})
+
+    assert save.status_code == 404
+    assert regenerate.status_code == 404
@@ -0,0 +1,48 @@
+import pytest
+
+from services.nlp_analyzer import NER_MAX_ENTITIES, NLPAnalyzer, StreamingAnalysis
+
+
+@pytest.mark.usefixtures("fake_models")
+class TestStreamingAnalysis:
+
+    def test_carry_is_bounded_without_sentence_end(self):
+        stream = StreamingAnalysis(max_carry_chars=200)
+        chunk = "kata lanjutan tanpa tanda akhir kalimat " * 10
+
+        for _ in range(50):
+            stream.feed(chunk)
+            assert len(stream._carry) <= 200
+
+        assert stream.sentence_count >= 49
+        assert stream.result()["stats"]["words"] == 50 * len(chunk.split())
+
+    def test_carry_flushed_past_line_limit(self):
+        stream = StreamingAnalysis(max_carry_lines=2)
+
+        stream.feed("baris satu\nbaris dua")
+        assert stream._carry == "baris satu\nbaris dua"
+
+        stream.feed("baris tiga\nbaris empat")
+        assert stream._carry == ""
+        assert stream.sentence_count == 1
+
+    def test_short_unfinished_sentence_is_carried(self):
+        stream = StreamingAnalysis()
+
+        stream.feed("Laporan disusun oleh")
+        stream.feed("Biro Keuangan. Sisa")
+
+        assert stream._carry == "Sisa"
+        assert stream.sentence_count == 1
+
+    def test_entities_merged_incrementally_and_bounded(self):
+        chunks = [f"Rapat di Kota{i} selesai." for i in range(NER_MAX_ENTITIES * 2)]
+        stream = StreamingAnalysis()
+
+        for chunk in chunks:
+            stream.feed(chunk)
+            assert len(stream.entities) <= NER_MAX_ENTITIES
+
+        expected = NLPAnalyzer.extract_entities(" ".join(chunks))
+        assert stream.result()["entities"] == expected
@@ -0,0 +1,83 @@
+import pytest
+from nltk.tokenize import word_tokenize
+
+from services.nlp_analyzer import AnalysisContext, NLPAnalyzer
+from services.nlp_models import NLPModels
+
+# Header tanpa tanda baca di atas baris kosong, paragraf bernomor, penutup
+MEMO = """NOTA DINAS
+
+Kepada Yth. Kepala Biro Umum
+Dari Kepala Bagian Keuangan
+
+Hal Laporan Realisasi Anggaran
+
+1. Sehubungan dengan evaluasi anggaran triwulan, kami sampaikan laporan realisasi anggaran.
+Realisasi anggaran belanja pegawai mencapai target.
+
+2. Realisasi anggaran belanja barang masih rendah karena pengadaan tertunda.
+Pengadaan barang akan dipercepat pada triwulan berikutnya.
+
+3. Laporan rinci realisasi anggaran terlampir untuk menjadi bahan rapat evaluasi.
+
+Demikian kami sampaikan, atas perhatian Bapak kami ucapkan terima kasih.
+
+Kepala Bagian Keuangan"""
+
+
+def baseline_summarize(text: str, stop_words, max_sentences: int = 5) -> str:
+    """
+    NLPAnalyzer.summarize sebelum AnalysisContext/SentenceTermMatrix, dengan
+    sent_tokenize/word_tokenize NLTK diganti tokenizer registry yang sama.
+    """
+    punkt = NLPModels.punkt()
+
+    def tokenize(s):
+        return [t for sent in punkt.tokenize(s) for t in word_tokenize(sent, preserve_line=True)]
+
+    sentences = punkt.tokenize(text)
+    if not sentences:
+        return text[:500]
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+
+    word_freq: dict[str, int] = {}
+    for w in tokenize(text.lower()):
+        if w.isalpha() and w not in stop_words and len(w) > 2:
+            word_freq[w] = word_freq.get(w, 0) + 1
+    if not word_freq:
+        return " ".join(sentences[:max_sentences])
+
+    max_freq = max(word_freq.values())
+    word_freq = {w: f / max_freq for w, f in word_freq.items()}
+
+    sentence_scores: dict[int, float] = {}
+    for i, sentence in enumerate(sentences):
+        sent_words = tokenize(sentence.lower())
+        sentence_scores[i] = sum(word_freq.get(w, 0) for w in sent_words if w.isalpha())
+
+    top_indices = sorted(
+        sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:max_sentences]
+    )
+    return " ".join(sentences[i] for i in top_indices)
+
+
+@pytest.mark.usefixtures("fake_models")
+class TestFrequencySummary:
+
+    def test_matches_baseline_on_multi_paragraph_memo(self):
+        expected = baseline_summarize(MEMO, NLPModels.stopwords())
+
+        assert NLPAnalyzer.summarize(MEMO) == expected
+        assert NLPAnalyzer.summarize(MEMO, ctx=AnalysisContext.build(MEMO)) == expected
+
+    def test_header_lines_keep_baseline_sentence_boundaries(self):
+        # Per paragraf, "NOTA DINAS" akan menjadi kalimat tersendiri
+        ctx = AnalysisContext.build(MEMO)
+        assert ctx.sentences[0] == "NOTA DINAS"
+        assert AnalysisContext.document_sentences(MEMO)[0].startswith("NOTA DINAS\n\nKepada Yth.")
+
+    def test_full_analysis_summary_matches_baseline(self):
+        expected = baseline_summarize(MEMO, NLPModels.stopwords())
+
+        assert NLPAnalyzer.full_analysis(MEMO)["summary"] == expected
@@ -0,0 +1,61 @@
+import io
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+TEXT = (
+    "Sehubungan dengan Rapat Koordinasi di Jakarta, kami sampaikan laporan "
+    "realisasi anggaran triwulan ketiga yang disusun oleh Biro Keuangan. "
+    "Kegiatan pengadaan di Bandung berjalan dengan baik dan tepat waktu."
+)
+
+
+def _docx(text: str) -> io.BytesIO:
+    """DOCX minimal: hanya word/document.xml (cukup untuk jalur iterparse)."""
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xml = (
+        f'<w:document xmlns:w="{ns}"><w:body>'
+        f"<w:p><w:r><w:t>{escape(text)}</w:t></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as zf:
+        zf.writestr("word/document.xml", xml)
+    data.seek(0)
+    return data
+
+
+def _upload(client, query: str = "") -> dict:
+    response = client.post(
+        f"/api/upload{query}", data={"file": (_docx(TEXT), "nota.docx")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code in (200, 202)
+    return response.get_json()
+
+
+def _job_result(client, job: dict) -> dict:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        status = client.get(job["status_url"]).get_json()
+        if status["status"] in ("done", "failed"):
+            break
+        time.sleep(0.05)
+    response = client.get(job["result_url"])
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_async_upload_reuses_near_duplicate(client):
+    first = _upload(client)
+    assert first["reused_analysis_from"] is None
+    saved = client.post("/api/save", json={
+        "staging_token": first["staging_token"], "filename": "nota.docx",
+    })
+    doc_id = saved.get_json()["document"]["id"]
+
+    result = _job_result(client, _upload(client, "?async=1"))
+
+    assert result["reused_analysis_from"] == doc_id
+    assert result["near_duplicates"][0]["id"] == doc_id
+    assert result["summary"] == first["summary"]